@@ -0,0 +1,333 @@
+import heapq
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+"""
+非阻塞语音播放
+
+AudioPlayer 在独立线程中按优先级播放提示语音，调用方只负责入队，立即返回：
+- 优先级：数值越小越优先，安全提示（quick）会打断正在播放的普通提示（guide）
+- 去重：同一提示正在播放/已在队列中，或刚播完不久时，不再重复入队
+- 取消：可取消队列中的提示并中断当前播放
+
+具体的声音输出由 sink 完成，sink.play(name, cancel_event) 阻塞到播放结束，
+cancel_event 被置位时应尽快返回。
+
+AudioClipCache 在启动时把 manifest.json 中列出的mp3一次性解码成PCM，
+PcmStreamSink 通过一个常驻的输出进程（pacat/aplay）播放，
+避免每次提示都重新启动 mpg123 并重新解码。
+"""
+
+# 提示语音优先级（数值越小越优先）
+PROMPT_PRIORITIES = {
+    "quick": 0,           # 请加快脚步（安全提示）
+    "start": 1,
+    "return": 1,
+    "next": 1,
+    "hudongtiyanqu1": 1,
+    "hudongtiyanqu2": 1,
+    "guide": 2,           # 请跟我来（周期性提示）
+}
+DEFAULT_PRIORITY = 1
+
+
+class Mpg123Sink:
+    """使用 mpg123 播放mp3文件"""
+
+    def __init__(self, file_map, gain=1.0):
+        self.file_map = file_map  # 提示名 -> mp3文件路径
+        self.gain = gain
+
+    def play(self, name, cancel_event):
+        file_path = self.file_map.get(name)
+        if file_path is None:
+            print(f"未知的语音类型: {name}")
+            return
+
+        try:
+            process = subprocess.Popen(["mpg123", "-q", "-g", str(self.gain), file_path])
+        except OSError as e:
+            print(f"播放音频时出错: {e}")
+            return
+
+        while process.poll() is None:
+            if cancel_event.wait(0.02):
+                process.terminate()
+                try:
+                    process.wait(timeout=1.0)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                return
+
+        if process.returncode != 0:
+            print(f"播放音频时出错: mpg123 返回 {process.returncode}")
+
+
+def load_manifest(manifest_path):
+    """
+    读取语音清单
+
+    返回:
+    (manifest, file_map)，file_map为 提示名 -> mp3绝对路径
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    audio_dir = os.path.dirname(os.path.abspath(manifest_path))
+    file_map = {name: os.path.join(audio_dir, file_name)
+                for name, file_name in manifest["prompts"].items()}
+    return manifest, file_map
+
+
+class AudioClipCache:
+    """启动时将全部提示语音解码为PCM（s16le）保存在内存中"""
+
+    def __init__(self, file_map, sample_rate=24000, channels=1):
+        self.file_map = file_map
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.bytes_per_second = sample_rate * channels * 2
+        self.clips = {}  # 提示名 -> PCM bytes
+
+    @classmethod
+    def from_manifest(cls, manifest_path):
+        manifest, file_map = load_manifest(manifest_path)
+        return cls(file_map, manifest.get("sample_rate", 24000), manifest.get("channels", 1))
+
+    def load(self):
+        """解码全部语音，返回成功解码的数量"""
+        for name, file_path in self.file_map.items():
+            try:
+                self.clips[name] = self._decode(file_path)
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"语音解码失败: {name} ({file_path}): {e}")
+        return len(self.clips)
+
+    def _decode(self, file_path):
+        # 使用 mpg123 解码为指定采样率/声道的原始PCM，输出到stdout
+        command = ["mpg123", "-q", "-s", "-e", "s16", "-r", str(self.sample_rate)]
+        if self.channels == 1:
+            command.append("-m")
+        command.append(file_path)
+        return subprocess.run(command, check=True, stdout=subprocess.PIPE).stdout
+
+    def get(self, name):
+        return self.clips.get(name)
+
+    def duration(self, name):
+        clip = self.clips.get(name)
+        return len(clip) / self.bytes_per_second if clip else 0.0
+
+
+class PcmStreamSink:
+    """向常驻的音频输出进程写入预解码PCM，提示开始播放只需写入第一块数据"""
+
+    def __init__(self, cache, chunk_ms=20, latency_ms=60, command=None):
+        self.cache = cache
+        self.chunk_bytes = cache.bytes_per_second * chunk_ms // 1000
+        self.chunk_bytes -= self.chunk_bytes % (2 * cache.channels)
+        self.latency_ms = latency_ms
+        self.command = command or self.default_command(cache, latency_ms)
+        self._process = None
+
+    @staticmethod
+    def default_command(cache, latency_ms):
+        """优先使用 PulseAudio 的 pacat（与 set.sh 设置的默认 sink 一致），否则使用 aplay"""
+        if shutil.which("pacat"):
+            return ["pacat", "--playback", "--raw", "--format=s16le",
+                    f"--rate={cache.sample_rate}", f"--channels={cache.channels}",
+                    f"--latency-msec={latency_ms}"]
+        return ["aplay", "-q", "-t", "raw", "-f", "S16_LE",
+                "-r", str(cache.sample_rate), "-c", str(cache.channels), "-"]
+
+    def open(self):
+        """启动输出进程（只在第一次播放或进程退出后启动）"""
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE)
+        return self._process
+
+    def play(self, name, cancel_event):
+        clip = self.cache.get(name)
+        if clip is None:
+            print(f"未知的语音类型: {name}")
+            return
+
+        try:
+            stream = self.open().stdin
+            view = memoryview(clip)
+            lead = self.latency_ms / 1000.0
+            start_time = time.monotonic()
+            # 按播放进度分块写入，最多领先 latency_ms，保证取消时能很快停下
+            for offset in range(0, len(view), self.chunk_bytes):
+                write_at = start_time + offset / self.cache.bytes_per_second - lead
+                delay = write_at - time.monotonic()
+                if cancel_event.wait(delay) if delay > 0 else cancel_event.is_set():
+                    return
+                stream.write(view[offset:offset + self.chunk_bytes])
+                stream.flush()
+        except (OSError, ValueError) as e:
+            print(f"播放音频时出错: {e}")
+            self.close()
+            return
+
+        # 等待最后写入的数据播放完
+        remaining = start_time + len(clip) / self.cache.bytes_per_second - time.monotonic()
+        if remaining > 0:
+            cancel_event.wait(remaining)
+
+    def close(self):
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+            self._process.terminate()
+            self._process = None
+
+
+class RecordingSink:
+    """假输出：不发声，只记录每段提示的播放时间，用于测试和模拟"""
+
+    def __init__(self, durations=None, default_duration=0.0, clock=time.monotonic):
+        self.durations = durations or {}  # 提示名 -> 播放时长（秒）
+        self.default_duration = default_duration
+        self.clock = clock
+        self.records = []  # [{"name", "start", "end", "interrupted"}]
+        self._lock = threading.Lock()
+
+    def play(self, name, cancel_event):
+        start = self.clock()
+        duration = self.durations.get(name, self.default_duration)
+        interrupted = cancel_event.wait(duration) if duration > 0 else cancel_event.is_set()
+        with self._lock:
+            self.records.append({
+                "name": name,
+                "start": start,
+                "end": self.clock(),
+                "interrupted": interrupted,
+            })
+
+    def counts(self):
+        """各提示的播放次数"""
+        result = {}
+        with self._lock:
+            for record in self.records:
+                result[record["name"]] = result.get(record["name"], 0) + 1
+        return result
+
+
+class AudioPlayer:
+    """带优先级队列的后台语音播放器"""
+
+    def __init__(self, sink, priorities=None, dedupe_window=1.0, clock=time.monotonic):
+        self.sink = sink
+        self.priorities = PROMPT_PRIORITIES if priorities is None else priorities
+        self.dedupe_window = dedupe_window  # 同一提示播完后多久内不重复播放（秒）
+        self.clock = clock
+
+        self._queue = []  # 堆: (priority, seq, name)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._current = None  # (priority, name, cancel_event)
+        self._last_finished = {}  # 提示名 -> 上次播放结束时间
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._worker, daemon=True, name="audio_player")
+        self._thread.start()
+
+    def play(self, name, priority=None):
+        """
+        提示入队，立即返回
+
+        返回:
+        是否入队（被去重时返回False）
+        """
+        if priority is None:
+            priority = self.priorities.get(name, DEFAULT_PRIORITY)
+
+        self.start()
+        with self._cond:
+            if self._is_duplicate(name):
+                return False
+
+            # 更高优先级的提示到来：打断当前播放，队列中的提示按优先级顺序播放
+            if self._current is not None and priority < self._current[0]:
+                self._current[2].set()
+
+            heapq.heappush(self._queue, (priority, next(self._seq), name))
+            self._cond.notify()
+            return True
+
+    def cancel(self, name=None):
+        """取消队列中的提示并中断当前播放；name为None时取消全部"""
+        with self._cond:
+            if name is None:
+                self._queue = []
+            else:
+                self._queue = [item for item in self._queue if item[2] != name]
+                heapq.heapify(self._queue)
+            if self._current is not None and (name is None or self._current[1] == name):
+                self._current[2].set()
+            self._cond.notify_all()
+
+    def is_busy(self):
+        with self._cond:
+            return self._current is not None or bool(self._queue)
+
+    def wait_idle(self, timeout=None):
+        """等待队列播放完毕，返回是否已空闲"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._current is not None or self._queue:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def shutdown(self):
+        self.cancel()
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+    def _is_duplicate(self, name):
+        if self._current is not None and self._current[1] == name:
+            return True
+        if any(item[2] == name for item in self._queue):
+            return True
+        finished = self._last_finished.get(name)
+        return finished is not None and self.clock() - finished < self.dedupe_window
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                priority, _, name = heapq.heappop(self._queue)
+                cancel_event = threading.Event()
+                self._current = (priority, name, cancel_event)
+
+            try:
+                self.sink.play(name, cancel_event)
+            except Exception as e:
+                print(f"播放音频时出错: {e}")
+
+            with self._cond:
+                self._current = None
+                self._last_finished[name] = self.clock()
+                self._cond.notify_all()
@@ -1,6 +1,10 @@
-import requests
+import os
+import shutil
+import threading
 import time
-import subprocess
+from audio_player import AudioPlayer, AudioClipCache, Mpg123Sink, PcmStreamSink
+from http_client import get_client, ROBOT_SDK_BASE_URL, NAVIGATION_BASE_URL
+from robot_sdk import get_robot_client
 
 """
 status:
@@ -18,18 +22,58 @@ NavigationStatus = {
 
 _navigation_count = 0
 
+# 提示语音清单（提示名 -> mp3文件）
+AUDIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_file")
+AUDIO_MANIFEST = os.path.join(AUDIO_DIR, "manifest.json")
+
+
+def create_audio_player():
+    """启动时预解码全部提示语音，通过常驻输出流播放；解码失败时回退到 mpg123 逐次播放"""
+    cache = AudioClipCache.from_manifest(AUDIO_MANIFEST)
+    has_output = shutil.which("pacat") or shutil.which("aplay")
+    if has_output and shutil.which("mpg123") and cache.load() == len(cache.file_map):
+        print(f"已预解码 {len(cache.clips)} 段提示语音")
+        return AudioPlayer(PcmStreamSink(cache))
+    print("提示语音预解码失败，使用 mpg123 播放")
+    return AudioPlayer(Mpg123Sink(cache.file_map, gain=1.0))
+
+
+# 后台语音播放器（状态机不再等待语音播放完成），第一次使用时创建：
+# 预解码要为每段提示语音启动一次 mpg123，并可能打开输出进程，导入本模块时不做这些事
+_audio_player = None
+_audio_player_lock = threading.Lock()
+
+
+def get_audio_player():
+    """获取进程内共享的语音播放器（首次调用时创建）"""
+    global _audio_player
+    if _audio_player is None:
+        with _audio_player_lock:
+            if _audio_player is None:
+                _audio_player = create_audio_player()
+    return _audio_player
+
+
+def set_audio_player(player):
+    """替换共享的语音播放器（如模拟测试换成 RecordingSink），返回之前的播放器"""
+    global _audio_player
+    with _audio_player_lock:
+        previous, _audio_player = _audio_player, player
+    return previous
+
+# 共享连接池客户端
+sdk_client = get_client(ROBOT_SDK_BASE_URL)
+navigation_client = get_client(NAVIGATION_BASE_URL)
+
 
 def get_uwb_data():
-    url = "http://localhost:18080/signalservice/uwb"
-    response = requests.get(url)
+    response = sdk_client.get("/signalservice/uwb")
     print(response.json())
     return response.json()
 
 def navigation_start(target_position):
-    url = "http://localhost:8001/api/start"
-
     print(f"导航开始，目标位置: {target_position}")
-    target_position["frame_id"] = "map"
+    target_position = dict(target_position, frame_id="map")  # 不修改调用方的字典
 
     # global NavigationStatus
     # NavigationStatus["status"] = "running"
@@ -38,7 +82,7 @@ def navigation_start(target_position):
     #     "status": "running",
     #     "health": True,
     # }
-    response = requests.post(url, json=target_position)
+    response = navigation_client.post("/api/start", json=target_position)
     if response.status_code == 200:
         res = response.json()
         print(res)
@@ -52,9 +96,7 @@ def navigation_start(target_position):
 
 
 def navigation_stop():
-    url = "http://localhost:8001/api/stop"
-
-    response = requests.post(url)
+    response = navigation_client.post("/api/stop")
     if response.status_code == 200:
         res = response.json()
         print(res)
@@ -75,9 +117,7 @@ def navigation_stop():
 
     
 def navigation_status():
-    url = "http://localhost:8001/api/status"
-
-    response = requests.get(url)
+    response = navigation_client.get("/api/status")
     if response.status_code == 200:
         res = response.json()
         print(res)
@@ -105,32 +145,19 @@ def navigation_status():
     #     return NavigationStatus
     # return NavigationStatus
 
-    
-def audio_output(type_name):
-    if type_name == "start":
-        file_path = "/home/myb/Exhibition_Hall/guide_dog/audio_file/start_xingguangdating_xy.mp3"
-    if type_name == "guide":
-        file_path = "/home/myb/Exhibition_Hall/guide_dog/audio_file/qinggengwolai_xy.mp3"
-    if type_name == "quick":
-        file_path = "/home/myb/Exhibition_Hall/guide_dog/audio_file/qingjiakuaijiaobu_xy.mp3"
-    if type_name == "return":
-        file_path = "/home/myb/Exhibition_Hall/guide_dog/audio_file/retirn_xingguangdating_xy.mp3"
-
-    if type_name == "next":
-        file_path = "/home/myb/Exhibition_Hall/guide_dog/audio_file/xinguangdating1.mp3"
-
-    if type_name == "hudongtiyanqu1":
-        file_path = "/home/myb/Exhibition_Hall/guide_dog/audio_file/hudongtiyanqu1.mp3"
-    if type_name == "hudongtiyanqu2":
-        file_path = "/home/myb/Exhibition_Hall/guide_dog/audio_file/hudongtiyanqu2.mp3"
-    
-    try:
-        command = ["mpg123", "-g", str(1.0), file_path]
-        subprocess.run(command, check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"播放音频时出错: {e}")
 
-    print(f"语音播放: {type_name}")
+async def navigation_status_async():
+    """navigation_status 的协程版本"""
+    res = await get_robot_client().aio.navigation_status()
+    if res.get("success") == True:
+        return res['data']['status']
+    return None
+
+
+def audio_output(type_name):
+    """播放提示语音（非阻塞：放入播放队列后立即返回）"""
+    if get_audio_player().play(type_name):
+        print(f"语音播放: {type_name}")
     return
 
 
@@ -0,0 +1,226 @@
+import math
+import threading
+import time
+import traceback
+
+import numpy as np
+
+from http_client import get_client
+from move import call_robot_move_api
+from uwb_filter import SlidingMedian, UwbFilter
+from uwb_geometry import calculate_target_positions, pose_to_array
+from uwb_sampler import get_uwb_sampler
+
+"""
+UWB人员跟随控制
+
+按固定频率闭环控制，不再每秒重新规划一次：
+- 近距离：直接用 call_robot_move_api 下发速度（距离误差→vx，方位角→vyaw）
+- 远距离：把UWB样本投影到地图坐标系并做中位数滤波，目标点移动超过阈值才重新发送导航目标
+"""
+
+FOLLOW_NAV_BASE_URL = "http://localhost:8008"
+
+
+class PersonFollowController:
+    """基于UWB的跟随控制器"""
+
+    def __init__(self, sampler=None, nav_base_url=FOLLOW_NAV_BASE_URL, loop_rate=10.0):
+        self.sampler = sampler
+        self.nav_client = get_client(nav_base_url)
+        self.loop_rate = loop_rate  # 控制频率（Hz）
+
+        # 跟随参数
+        self.follow_distance = 1.0  # 期望跟随距离（米）
+        self.standoff = 1.0  # 远距离导航时，目标点取在跟随者前方的距离（米）
+        self.near_range = 3.0  # 小于该距离进入速度控制
+        self.far_range = 3.5  # 大于该距离切换为导航（与near_range形成滞回）
+        self.goal_threshold = 0.5  # 目标点移动超过该距离才重新发送导航目标（米）
+        self.sample_timeout = 1.0  # 超过该时间没有UWB数据则停止（秒）
+
+        # 速度控制参数
+        self.distance_gain = 0.6  # vx = gain * 距离误差
+        self.yaw_gain = 1.2  # vyaw = gain * 方位角（弧度）
+        self.max_vx = 0.6
+        self.max_vyaw = 0.8
+        self.distance_deadband = 0.15  # 距离误差小于该值不前进（米）
+        self.yaw_deadband = math.radians(8)  # 方位角小于该值不转向
+
+        self.uwb_filter = UwbFilter(median_window=9)
+        self.target_x_median = SlidingMedian(25)
+        self.target_y_median = SlidingMedian(25)
+
+        self.mode = "idle"  # idle, velocity, navigation
+        self.last_goal = None  # 最近一次发送的导航目标 (x, y)
+        self.goal_count = 0
+        self.last_command = (0.0, 0.0, 0.0)
+        self.status_message = "跟随未启动"
+
+        self._cursor = 0
+        self._last_sample_time = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return "跟随已在运行中"
+        if self.sampler is None:
+            self.sampler = get_uwb_sampler()
+        self._cursor = self.sampler.count
+        self.uwb_filter.reset()
+        self._running = True
+        self._thread = threading.Thread(target=self.run, daemon=True, name="person_follow")
+        self._thread.start()
+        return "跟随已启动"
+
+    def stop(self):
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        self._enter_mode("idle")  # 导航模式下先让规划器停在原地，否则会继续开向最后的目标
+        self._send_velocity(0.0, 0.0, 0.0, force=True)
+        self.status_message = "跟随已停止"
+        return "跟随已停止"
+
+    def run(self):
+        """控制循环（阻塞），stop() 后退出"""
+        self._running = True
+        if self.sampler is None:
+            self.sampler = get_uwb_sampler()
+        next_time = time.monotonic()
+        while self._running:
+            try:
+                self.step(time.monotonic())
+            except Exception as e:
+                print(traceback.format_exc())
+                self.status_message = f"错误: {str(e)}"
+
+            next_time += 1.0 / self.loop_rate
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_time = time.monotonic()
+
+    def step(self, now):
+        """执行一个控制周期"""
+        self._cursor, samples = self.sampler.read_since(self._cursor)
+        for timestamp, distance, azimuth in samples:
+            self.uwb_filter.update(distance, azimuth, timestamp)
+        if len(samples):
+            self._last_sample_time = now
+
+        distance, azimuth = self.uwb_filter.distance, self.uwb_filter.azimuth
+        if distance is None or self._last_sample_time is None or now - self._last_sample_time > self.sample_timeout:
+            self._enter_mode("idle")
+            self._send_velocity(0.0, 0.0, 0.0)
+            self.status_message = "UWB数据超时，停止跟随"
+            return
+
+        # 模式切换：跟随中按 near_range/far_range 滞回切换；
+        # 从空闲开始时按两者的中点选择，否则距离落在滞回区间内时两种模式都不会进入
+        if self.mode == "idle":
+            switch_range = (self.near_range + self.far_range) / 2
+            self._enter_mode("velocity" if distance < switch_range else "navigation")
+        elif self.mode == "navigation" and distance < self.near_range:
+            self._enter_mode("velocity")
+        elif self.mode == "velocity" and distance > self.far_range:
+            self._enter_mode("navigation")
+
+        if self.mode == "velocity":
+            self._velocity_step(distance, azimuth)
+        elif self.mode == "navigation":
+            self._navigation_step(samples)
+
+    def _enter_mode(self, mode):
+        if mode == self.mode:
+            return
+        print(f"跟随模式切换: {self.mode} -> {mode}")
+        if self.mode == "navigation" and mode != "navigation":
+            # 离开导航模式：把目标设为机器狗当前位置，让规划器停下，改由速度控制
+            self._hold_navigation()
+        if mode == "navigation":
+            self.target_x_median.reset()
+            self.target_y_median.reset()
+            self.last_goal = None
+        self.mode = mode
+
+    def _velocity_step(self, distance, azimuth):
+        distance_error = distance - self.follow_distance
+        yaw_error = math.radians(azimuth)
+
+        vx = 0.0 if abs(distance_error) < self.distance_deadband else self.distance_gain * distance_error
+        vyaw = 0.0 if abs(yaw_error) < self.yaw_deadband else self.yaw_gain * yaw_error
+        # 目标在侧后方时先转向再前进
+        if abs(yaw_error) > math.radians(60):
+            vx = 0.0
+
+        vx = max(-self.max_vx, min(self.max_vx, vx))
+        vyaw = max(-self.max_vyaw, min(self.max_vyaw, vyaw))
+        self._send_velocity(vx, 0.0, vyaw)
+        self.status_message = f"速度跟随: 距离{distance:.2f}m, 方位{azimuth:.1f}°"
+
+    def _navigation_step(self, samples):
+        if len(samples) == 0:
+            return
+        robot_pose = self.nav_client.get("/pose").json()
+
+        # 原始样本逐个投影到地图坐标系，在地图坐标系中做中位数滤波
+        distances = samples[:, 1]
+        distances = np.where(distances > self.standoff, distances - self.standoff, distances)
+        targets = calculate_target_positions(pose_to_array(robot_pose), distances, samples[:, 2])
+        for x, y, _ in targets:
+            target_x = self.target_x_median.update(x)
+            target_y = self.target_y_median.update(y)
+
+        if self.last_goal is not None:
+            moved = math.hypot(target_x - self.last_goal[0], target_y - self.last_goal[1])
+            if moved < self.goal_threshold:
+                self.status_message = f"导航跟随中，目标移动{moved:.2f}m，不重新规划"
+                return
+
+        target_pose = {
+            "x": float(target_x),
+            "y": float(target_y),
+            "z": robot_pose["z"],
+            "frame_id": "map"
+        }
+        if self._post_goal(target_pose):
+            self.last_goal = (target_x, target_y)
+            self.status_message = f"导航跟随: 目标({target_x:.2f}, {target_y:.2f})"
+
+    def _hold_navigation(self):
+        try:
+            robot_pose = self.nav_client.get("/pose").json()
+            self._post_goal({"x": robot_pose["x"], "y": robot_pose["y"], "z": robot_pose["z"],
+                             "frame_id": "map"})
+        except Exception as e:
+            print(f"停止导航跟随失败: {e}")
+        self.last_goal = None
+
+    def _post_goal(self, target_pose):
+        response = self.nav_client.post("/goal", json=target_pose)
+        if response.status_code != 200:
+            print(f"发送导航目标失败: {response.status_code}")
+            return False
+        self.goal_count += 1
+        print(f"发送导航目标: {target_pose}")
+        return True
+
+    def _send_velocity(self, vx, vy, vyaw, force=False):
+        # 连续的零速度指令只发一次，避免空闲时持续请求sdk
+        command = (vx, vy, vyaw)
+        if not force and command == (0.0, 0.0, 0.0) and self.last_command == command:
+            return
+        call_robot_move_api(vx, vy, vyaw)
+        self.last_command = command
+
+    def get_status(self):
+        return {
+            "跟随模式": self.mode,
+            "距离": f"{self.uwb_filter.distance:.2f}m" if self.uwb_filter.distance is not None else "无",
+            "方位角": f"{self.uwb_filter.azimuth:.1f}°" if self.uwb_filter.azimuth is not None else "无",
+            "导航目标次数": self.goal_count,
+            "状态信息": self.status_message,
+        }
@@ -1,17 +1,23 @@
 import gradio as gr
+import asyncio
 import threading
 import time
-from dog_service import get_uwb_data, navigation_start, navigation_stop, navigation_status, audio_output
+from dog_service import audio_output, get_audio_player, navigation_status_async
 import traceback
-from move import call_robot_move_api
+from navigation_session import NavigationSession
+from uwb_filter import UwbFilter
+from uwb_sampler import get_uwb_sampler
 
 
 class GuideDogController:
     def __init__(self):
         self.is_running = False
-        self.navigation_active = False
+        self.navigation = NavigationSession()  # 导航会话（去重start/stop，支持暂停/继续）
         self.current_distance = 0
         self.current_azimuth = 0
+        self.uwb_filter = UwbFilter(median_window=9)  # UWB流式滤波（中位数去野值 + 卡尔曼）
+        self.uwb_sampler = None  # 后台UWB采集（与跟随、界面共享）
+        self._uwb_cursor = 0  # 已送入滤波器的UWB样本位置
         self.status_message = "系统就绪"
         self.thread = None
         self.audio_output_enabled = True
@@ -112,107 +118,226 @@ class GuideDogController:
         self.current_route_type = None  # 当前路由类型（"vip"或"zhanting"）
         self.current_point_index = 0  # 当前点位索引
 
-    def update_navigation_status(self):
-        try:
-            self.navigation_status = navigation_status()
-            # self.navigation_service_health = navigation_status()["health"]
-        except Exception as e:
-            print(traceback.format_exc())
-            self.navigation_status = None
-            self.navigation_service_health = None
+        # 事件驱动调度参数
+        self.uwb_poll_interval = 0.1  # UWB距离检查周期（秒），10Hz
+        self.navigation_poll_interval = 0.5  # 导航状态检查周期（秒）
+        self.workflow_heartbeat = 3.0  # 无状态变化时状态机的最长执行间隔（秒），用于周期性语音提示
+        self.distance_zone = None  # 当前距离区间: near(<2m), middle(2~4m), far(>4m), lost(UWB数据超时)
+        self.uwb_timeout = 1.0  # 超过该时间没有新的UWB样本视为跟随者丢失（秒）
+        self._uwb_watch_start = 0.0  # 本次启动时刻，启动后一直没有样本时从这里开始计超时
+        self._loop = None  # 引路线程的事件循环
+        self._workflow_event = None  # 状态变化事件，触发状态机执行
+        self._workflow_lock = threading.RLock()  # 状态机与界面操作互斥
 
+    @property
+    def navigation_active(self):
+        return self.navigation.is_active
 
-    
     def start_guide_system(self):
         """开始引路系统"""
         if self.is_running:
             return "系统已在运行中"
+        if self.thread and self.thread.is_alive():
+            # 上一次停止后引路线程还没退出（最多一个检查周期），等它清理完再启动，避免它清掉新线程的事件循环
+            self.thread.join(timeout=5.0)
         
         self.is_running = True
+        get_audio_player()  # 启动时预解码提示语音，第一次播放不用等解码
+        self.uwb_filter.reset()
+        self.uwb_sampler = get_uwb_sampler()
+        self._uwb_cursor = self.uwb_sampler.count
+        self._uwb_watch_start = time.monotonic()
+        self.distance_zone = None
         self.thread = threading.Thread(target=self._guide_loop, daemon=True)
         self.thread.start()
         return "引路系统已启动"
     
     def start_guiding(self, type_name="guide"):
         """开始引导流程（统一处理guide、vip、zhanting）"""
-        if self.workflow_state != "waiting":
-            return f"当前状态不允许开始引导: {self.workflow_state}"
+        with self._workflow_lock:
+            if self.workflow_state != "waiting":
+                return f"当前状态不允许开始引导: {self.workflow_state}"
 
         
         
-        if type_name == "guide":
-            # 单点引导模式
-            audio_output(type_name="start")
-            self.current_target_position = self.guide_position.copy()
-            self.next_target_position = self.start_position.copy()
-            self.workflow_state = "guiding"
-            self.uwb_check_enabled = True
-            self.current_route_type = None
-        elif type_name in ["vip", "zhanting"]:
-            # 多点引导模式（vip和zhanting使用相同逻辑）
-            audio_output(type_name="start")
+            if type_name == "guide":
+                # 单点引导模式
+                audio_output(type_name="start")
+                self.current_target_position = self.guide_position.copy()
+                self.next_target_position = self.start_position.copy()
+                self.workflow_state = "guiding"
+                self.uwb_check_enabled = True
+                self.current_route_type = None
+            elif type_name in ["vip", "zhanting"]:
+                # 多点引导模式（vip和zhanting使用相同逻辑）
+                audio_output(type_name="start")
 
-            self.current_route_type = type_name
-            self.current_point_index = 0
+                self.current_route_type = type_name
+                self.current_point_index = 0
             
-            # 获取第一个目标位置
-            route = self.routes[type_name]
-            first_point = route[0]
-            self.current_target_position = self.multi_point_positions[type_name][first_point].copy()
-            self.workflow_state = "multi_point_guiding"
-            self.uwb_check_enabled = True
-        else:
-            return f"未知的引导类型: {type_name}"
-        
-        # 开始导航
-        if navigation_start(self.current_target_position):
-            self.navigation_active = True
-            self.status_message = f"开始{type_name}引导到目标位置"
-        else:
-            self.status_message = f"开始引导失败，请检查导航服务"
-            return f"导航服务启动失败"
+                # 获取第一个目标位置
+                route = self.routes[type_name]
+                first_point = route[0]
+                self.current_target_position = self.multi_point_positions[type_name][first_point].copy()
+                self.workflow_state = "multi_point_guiding"
+                self.uwb_check_enabled = True
+            else:
+                return f"未知的引导类型: {type_name}"
         
-        return f"{type_name}引导流程已开始"
-    
+            # 开始导航
+            if self.navigation.start(self.current_target_position):
+                self.status_message = f"开始{type_name}引导到目标位置"
+            else:
+                self.status_message = f"开始引导失败，请检查导航服务"
+                return f"导航服务启动失败"
+
+            self.trigger_workflow()
+            return f"{type_name}引导流程已开始"
+
     def stop_guide_system(self):
         """停止引路系统"""
-        self.is_running = False
-        if self.navigation_active:
-            if navigation_stop():
-                self.navigation_active = False
-            else:
+        with self._workflow_lock:
+            self.is_running = False
+            if not self.navigation.stop():
                 self.status_message = f"停止引导失败，请检查导航服务"
                 return
             
         
-        # 重置状态
-        self.workflow_state = "waiting"
-        self.current_target_position = None
-        self.next_target_position = None
-        self.uwb_check_enabled = False
-        self.status_message = "系统已停止"
+            # 重置状态
+            self.workflow_state = "waiting"
+            self.current_target_position = None
+            self.next_target_position = None
+            self.uwb_check_enabled = False
+            self.status_message = "系统已停止"
+        self.trigger_workflow()  # 唤醒引路线程尽快退出
         return "引路系统已停止"
-    
+
     def _guide_loop(self):
-        """主要的引路控制循环"""
+        """主要的引路控制循环：UWB与导航状态各自按频率检查，状态变化时立即触发状态机"""
+        try:
+            asyncio.run(self._guide_main())
+        except Exception as e:
+            print(traceback.format_exc())
+            self.status_message = f"错误: {str(e)}"
+
+    async def _guide_main(self):
+        loop = self._loop = asyncio.get_running_loop()
+        self._workflow_event = asyncio.Event()
+        try:
+            await asyncio.gather(
+                self._uwb_watch(),
+                self._navigation_watch(),
+                self._workflow_worker(),
+            )
+        finally:
+            if self._loop is loop:
+                # 只清理本次运行的事件循环和事件
+                self._loop = None
+                self._workflow_event = None
+
+    async def _run_periodic(self, interval_attr, step):
+        """按固定频率执行step，interval_attr为周期属性名（允许运行时调整）"""
+        next_time = time.monotonic()
         while self.is_running:
             try:
-                # 获取UWB数据
-                self.update_navigation_status()
-                uwb_data = get_uwb_data()
-                if uwb_data and 'data' in uwb_data:
-                    data = uwb_data['data']
-                    self.current_distance = data.get('distance', 0)
-                    self.current_azimuth = data.get('azimuth', 0)
-                
-                # 执行工作流状态机
-                self._execute_workflow()
-                
+                await step()
             except Exception as e:
                 print(traceback.format_exc())
                 self.status_message = f"错误: {str(e)}"
-            
-            time.sleep(3.0)  # 每0.5秒检查一次
+
+            next_time += getattr(self, interval_attr)
+            delay = next_time - time.monotonic()
+            if delay < 0:
+                # 处理落后时不补跑，从当前时刻重新计时
+                next_time = time.monotonic()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def _uwb_watch(self):
+        """高频检查UWB距离（读取后台采集的数据），距离区间变化时触发状态机"""
+        async def step():
+            # 把上次检查之后采集到的全部样本送入滤波器
+            self._uwb_cursor, samples = self.uwb_sampler.read_since(self._uwb_cursor)
+            distance = None
+            for timestamp, raw_distance, raw_azimuth in samples:
+                distance, azimuth = self.uwb_filter.update(raw_distance, raw_azimuth, timestamp)
+            if distance is None:
+                # 采集线程没有新数据：超时后视为跟随者丢失，不能继续按旧距离引导
+                latest = self.uwb_sampler.latest()
+                last_time = max(latest[0], self._uwb_watch_start) if latest else self._uwb_watch_start
+                if time.monotonic() - last_time > self.uwb_timeout and self.distance_zone != "lost":
+                    self.distance_zone = "lost"
+                    self.trigger_workflow()
+                return
+            self.current_distance = distance
+            self.current_azimuth = azimuth
+
+            zone = self._distance_zone_of(self.current_distance)
+            if zone != self.distance_zone:
+                self.distance_zone = zone
+                self.trigger_workflow()
+
+        await self._run_periodic("uwb_poll_interval", step)
+
+    async def _navigation_watch(self):
+        """检查导航状态，状态变化（如到达succeeded）时触发状态机"""
+        async def step():
+            polled_at = time.monotonic()
+            try:
+                status = await navigation_status_async()
+            except Exception:
+                print(traceback.format_exc())
+                status = None
+            # 状态没变（如两段都是 succeeded）但会话确认本段已结束时也要触发状态机
+            finished = self.navigation.update_status(status, polled_at)
+            if status != self.navigation_status or finished:
+                self.navigation_status = status
+                self.trigger_workflow()
+
+        await self._run_periodic("navigation_poll_interval", step)
+
+    async def _workflow_worker(self):
+        """等待状态变化事件执行状态机；长时间无变化时按心跳周期执行一次"""
+        loop = asyncio.get_running_loop()
+        while self.is_running:
+            try:
+                await asyncio.wait_for(self._workflow_event.wait(), timeout=self.workflow_heartbeat)
+            except asyncio.TimeoutError:
+                pass
+            self._workflow_event.clear()
+            if not self.is_running:
+                break
+
+            try:
+                # 状态机内部有阻塞的HTTP调用，放到线程池执行，不影响传感器检查
+                await loop.run_in_executor(None, self._run_workflow)
+            except Exception as e:
+                print(traceback.format_exc())
+                self.status_message = f"错误: {str(e)}"
+
+    def _run_workflow(self):
+        with self._workflow_lock:
+            self._execute_workflow()
+
+    def trigger_workflow(self):
+        """请求尽快执行一次状态机（可从任意线程调用）"""
+        loop = self._loop
+        event = self._workflow_event
+        if loop is None or event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
+
+    @staticmethod
+    def _distance_zone_of(distance):
+        if distance > 4:
+            return "far"
+        if distance < 2:
+            return "near"
+        return "middle"
     
     def _execute_workflow(self):
         """执行工作流状态机（简化版）"""
@@ -247,9 +372,7 @@ class GuideDogController:
             self.next_target_position = None
             self.uwb_check_enabled = False  # 返回过程不需要UWB检查
             
-            if navigation_start(self.current_target_position):
-                self.navigation_active = True
-            else:
+            if not self.navigation.start(self.current_target_position):
                 self.status_message = f"返回引导失败，请检查导航服务"
                 return
             self.status_message = "引导完成，正在返回起始点"
@@ -257,23 +380,24 @@ class GuideDogController:
         
         # UWB距离检查逻辑（仅在引导过程中启用）
         if self.uwb_check_enabled:
-            if distance > 4:
-                # 距离超过5m，停止导航等待
-                if self.navigation_active:
-                    if navigation_stop():
-                        self.navigation_active = False
-                    else:
-                        self.status_message = f"停止引导失败，请检查导航服务"
-                        return
+            if self.distance_zone == "lost":
+                # UWB数据超时，暂停导航等待数据恢复（保留目标）
+                if not self.navigation.pause():
+                    self.status_message = f"停止引导失败，请检查导航服务"
+                    return
+                self.status_message = "UWB数据超时，暂停引导"
+            elif distance > 4:
+                # 距离超过5m，暂停导航等待（保留目标）
+                if not self.navigation.pause():
+                    self.status_message = f"停止引导失败，请检查导航服务"
+                    return
                     
                 audio_output(type_name="quick")
                 self.status_message = f"距离过远({distance:.2f}m)，等待跟随者靠近"
                 
             elif distance < 2 and not self.navigation_active:
                 # 距离小于2m，继续导航
-                if navigation_start(self.current_target_position):
-
-                    self.navigation_active = True
+                if self.navigation.resume(self.current_target_position):
                     self.status_message = f"距离合适({distance:.2f}m)，继续引导"
                 else:
                     self.status_message = f"继续引导失败，请检查导航服务"
@@ -291,7 +415,7 @@ class GuideDogController:
         if self._reached_target():
             # 返回完成
             # navigation_stop()
-            self.navigation_active = False
+            self.navigation.finish()
             self.workflow_state = "waiting"
             self.current_target_position = None
             self.next_target_position = None
@@ -315,14 +439,17 @@ class GuideDogController:
         if self.uwb_check_enabled:
             current_point = route[self.current_point_index]
             
-            if distance > 4:
-                # 距离超过4m，停止导航等待
-                if self.navigation_active:
-                    if navigation_stop():
-                        self.navigation_active = False
-                    else:
-                        self.status_message = f"停止{route_type}引导失败，请检查导航服务"
-                        return
+            if self.distance_zone == "lost":
+                # UWB数据超时，暂停导航等待数据恢复（保留目标）
+                if not self.navigation.pause():
+                    self.status_message = f"停止{route_type}引导失败，请检查导航服务"
+                    return
+                self.status_message = f"{route_type}引导: UWB数据超时，暂停引导，目标: {current_point}"
+            elif distance > 4:
+                # 距离超过4m，暂停导航等待（保留目标）
+                if not self.navigation.pause():
+                    self.status_message = f"停止{route_type}引导失败，请检查导航服务"
+                    return
                 if self.audio_output_enabled:
                     audio_output(type_name="quick")
                 
@@ -330,8 +457,7 @@ class GuideDogController:
                 
             elif distance < 2 and not self.navigation_active:
                 # 距离小于2m，继续导航
-                if navigation_start(self.current_target_position):
-                    self.navigation_active = True
+                if self.navigation.resume(self.current_target_position):
                     self.status_message = f"{route_type}引导: 距离合适({distance:.2f}m)，继续引导到{current_point}"
                 else:
                     self.status_message = f"继续{route_type}引导失败，请检查导航服务"
@@ -357,7 +483,7 @@ class GuideDogController:
         if self._reached_target():
             # 引导完全结束
             route_type = self.current_route_type
-            self.navigation_active = False
+            self.navigation.finish()
             self.workflow_state = "waiting"
             self.current_target_position = None
             self.next_target_position = None
@@ -380,6 +506,7 @@ class GuideDogController:
             # 引导路径完成
             if route_type == "zhanting":
                 audio_output(type_name="hudongtiyanqu2")
+            self.navigation.finish()
             self.workflow_state = "waiting"
             self.current_target_position = None
             self.next_target_position = None
@@ -400,15 +527,16 @@ class GuideDogController:
             self.audio_output_enabled = False
         
         # 开始导航到下一个点
-        if navigation_start(self.current_target_position):
-            self.navigation_active = True
+        if self.navigation.start(self.current_target_position):
             self.status_message = f"{route_type}引导: 已到达，前往下一个目标: {next_point}"
         else:
             self.status_message = f"{route_type}引导失败，无法导航到{next_point}，请检查导航服务"
     
     def _reached_target(self):
         print(f"导航状态: {self.navigation_status}")
-        return self.navigation_status == "succeeded"
+        # 缓存的状态每 navigation_poll_interval 才刷新，发出新目标后仍可能是上一段的 succeeded，
+        # 需要导航会话确认这是本次目标的结果再到达
+        return self.navigation_status == "succeeded" and self.navigation.goal_reached
     
     def get_status(self):
         """获取当前状态信息"""
@@ -417,11 +545,13 @@ class GuideDogController:
             "系统状态": "运行中" if self.is_running else "已停止",
             "工作流状态": self.workflow_state,
             "导航状态": "激活" if self.navigation_active else "停止",
+            "导航会话": self.navigation.get_status(),
             "当前距离": f"{self.current_distance:.2f}m",
             "方位角": f"{self.current_azimuth:.1f}°",
             "当前目标": str(self.current_target_position) if self.current_target_position else "无",
             "下个目标": str(self.next_target_position) if self.next_target_position else "无",
             "UWB检查": "启用" if self.uwb_check_enabled else "禁用",
+            "UWB采样率": f"{self.uwb_sampler.sample_rate():.1f}Hz" if self.uwb_sampler else "未启动",
             "状态信息": self.status_message
         }
         
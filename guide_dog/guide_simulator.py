@@ -0,0 +1,337 @@
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+"""
+引路犬模拟环境
+
+不连机器狗时代替 localhost:8001 的导航服务和 localhost:18080 的 UWB 接口：
+- NavigationSimulator: /api/start、/api/stop、/api/status，机器狗从当前位置沿直线匀速走向目标，
+  状态 pending → running → succeeded，stop 后停在原地（canceled），再次 start 从当前位置继续；
+  status_delay 模拟导航服务状态更新滞后：start/stop 之后这段时间内 /api/status 仍返回之前的状态
+- VisitorScript: 脚本化的访客距离曲线（关键帧线性插值，按周期重复），叠加噪声和少量野值，
+  由 /signalservice/uwb 按 {"data": {"distance", "azimuth"}} 返回
+- SimClock: 加速时钟，模拟时间 = 真实时间 × speed，行走时间和访客脚本都按模拟时间计算
+
+所有请求都记录在 events 里（模拟时间），用于统计启停次数和控制环路的反应延迟。
+
+单独运行:
+python guide_simulator.py --speed 1 --nav-port 8001 --sdk-port 18080
+"""
+
+# 默认访客脚本: (模拟时间秒, 距离米)，60秒一个周期：跟随 → 落后到5m以上 → 追上
+DEFAULT_VISITOR_SCRIPT = [(0.0, 1.5), (18.0, 1.5), (22.0, 5.0), (30.0, 5.0), (34.0, 1.5), (60.0, 1.5)]
+
+
+class SimClock:
+    """加速时钟，now() 返回 start() 之后经过的模拟秒数"""
+
+    def __init__(self, speed=1.0):
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def start(self):
+        self._origin = time.monotonic()
+
+    def now(self):
+        return (time.monotonic() - self._origin) * self.speed
+
+    def wall(self, sim_seconds):
+        """模拟时长对应的真实时长"""
+        return sim_seconds / self.speed
+
+
+class NavigationSimulator:
+    """
+    导航服务模拟
+
+    参数:
+    start_pose: 初始位姿（与 GuideDogController 中位置的格式相同）
+    speed: 行走速度（米/模拟秒）
+    pending_time: start 之后保持 pending 的时间（模拟秒）
+    min_travel_time: 每段导航的最短行走时间（模拟秒）；为0时原地目标 pending 之后直接 succeeded，
+        目标很近时状态查询可能一次 running 也看不到
+    status_delay: start/stop 之后 /api/status 仍返回之前状态的时间（模拟秒）
+    """
+
+    def __init__(self, clock, start_pose, speed=0.6, pending_time=0.3, min_travel_time=1.0, status_delay=0.0):
+        self.clock = clock
+        self.speed = speed
+        self.pending_time = pending_time
+        self.min_travel_time = min_travel_time
+        self.status_delay = status_delay
+
+        self.status = "idle"
+        self.goal = None
+        self._position = _xy(start_pose)
+        self._leg_start = self._position
+        self._leg_start_time = 0.0
+        self._leg_duration = 0.0
+        self._stale_status = None  # 状态更新滞后期间对外返回的旧状态
+        self._stale_until = float("-inf")
+        self.events = []  # [(模拟时间, "start"/"stop"/"arrive", 目标坐标)]
+        self._lock = threading.Lock()
+
+    def reset(self, start_pose):
+        with self._lock:
+            self.status = "idle"
+            self.goal = None
+            self._position = _xy(start_pose)
+            self._stale_until = float("-inf")
+            self.events = []
+
+    def start(self, target):
+        now = self.clock.now()
+        with self._lock:
+            self._advance(now)
+            self._hold_status(now)
+            goal = _xy(target)
+            self._leg_start = self._position
+            self._leg_start_time = now
+            travel = math.dist(self._position, goal) / self.speed
+            self._leg_duration = self.pending_time + max(travel, self.min_travel_time)
+            self.goal = goal
+            self.status = "pending"
+            self.events.append((now, "start", goal))
+
+    def stop(self):
+        now = self.clock.now()
+        with self._lock:
+            self._advance(now)
+            self._hold_status(now)
+            if self.status in ("pending", "running"):
+                self.status = "canceled"
+            self.events.append((now, "stop", self.goal))
+
+    def get_status(self):
+        now = self.clock.now()
+        with self._lock:
+            self._advance(now)
+            if now < self._stale_until:
+                return self._stale_status
+            return self.status
+
+    def position(self):
+        now = self.clock.now()
+        with self._lock:
+            self._advance(now)
+            return self._position
+
+    def _hold_status(self, now):
+        """start/stop 之后 status_delay 内对外仍返回当前状态（调用方持有锁）"""
+        if self.status_delay > 0 and now >= self._stale_until:
+            self._stale_status = self.status
+        self._stale_until = now + self.status_delay
+
+    def _advance(self, now):
+        """按模拟时间更新位置和状态（调用方持有锁）"""
+        if self.status not in ("pending", "running"):
+            return
+        elapsed = now - self._leg_start_time
+        if elapsed >= self._leg_duration:
+            self._position = self.goal
+            self.status = "succeeded"
+            self.events.append((self._leg_start_time + self._leg_duration, "arrive", self.goal))
+            return
+        if elapsed < self.pending_time:
+            return
+        self.status = "running"
+        ratio = (elapsed - self.pending_time) / (self._leg_duration - self.pending_time)
+        self._position = tuple(a + (b - a) * ratio for a, b in zip(self._leg_start, self.goal))
+
+
+class VisitorScript:
+    """
+    访客距离脚本
+
+    参数:
+    keyframes: [(模拟时间, 距离)]，最后一帧的时间为周期长度，之后循环
+    noise: 距离高斯噪声标准差（米）
+    outlier_rate: 野值比例，野值距离在 0~10m 之间随机
+    """
+
+    def __init__(self, clock, keyframes=None, noise=0.05, azimuth_noise=3.0, outlier_rate=0.01, seed=0):
+        self.clock = clock
+        keyframes = keyframes or DEFAULT_VISITOR_SCRIPT
+        self.times = np.array([t for t, _ in keyframes], dtype=np.float64)
+        self.distances = np.array([d for _, d in keyframes], dtype=np.float64)
+        self.period = float(self.times[-1])
+        self.noise = noise
+        self.azimuth_noise = azimuth_noise
+        self.outlier_rate = outlier_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def true_distance(self, sim_time):
+        """无噪声的脚本距离"""
+        return float(np.interp(sim_time % self.period, self.times, self.distances))
+
+    def sample(self):
+        """一次UWB读数 (距离, 方位角)"""
+        distance = self.true_distance(self.clock.now())
+        with self._lock:
+            if self._rng.random() < self.outlier_rate:
+                return round(self._rng.uniform(0.0, 10.0), 3), round(self._rng.uniform(-180.0, 180.0), 1)
+            distance += self._rng.gauss(0.0, self.noise)
+            azimuth = 180.0 + self._rng.gauss(0.0, self.azimuth_noise)  # 访客在机器狗正后方
+        return round(max(distance, 0.01), 3), round(azimuth, 1)
+
+    def zone_changes(self, duration, step=0.01, far=4.0, near=2.0):
+        """
+        脚本距离在 [0, duration) 内越过阈值的时刻
+
+        返回:
+        [(模拟时间, "far"/"near")]，越过 far 向外记为 far，越过 near 向内记为 near
+        """
+        times = np.arange(0.0, duration, step)
+        distances = np.interp(times % self.period, self.times, self.distances)
+        changes = []
+        outside = distances[:-1] <= far
+        for index in np.flatnonzero(outside & (distances[1:] > far)):
+            changes.append((float(times[index + 1]), "far"))
+        inside = distances[:-1] >= near
+        for index in np.flatnonzero(inside & (distances[1:] < near)):
+            changes.append((float(times[index + 1]), "near"))
+        return sorted(changes)
+
+
+def _xy(pose):
+    position = pose["position"] if "position" in pose else pose
+    return float(position["x"]), float(position["y"])
+
+
+class _SimHandler(BaseHTTPRequestHandler):
+    simulator = None
+
+    def _reply(self, payload, code=200):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method):
+        path = self.path.split("?", 1)[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        simulator = self.simulator
+        simulator.requests[f"{method} {path}"] += 1
+        if simulator.latency:
+            time.sleep(simulator.latency)
+
+        navigation = simulator.navigation
+        if path == "/api/start" and method == "POST":
+            try:
+                navigation.start(json.loads(body))
+            except (ValueError, KeyError, TypeError) as e:
+                self._reply({"success": False, "message": f"目标格式错误: {e}"})
+                return
+            self._reply({"success": True})
+        elif path == "/api/stop" and method == "POST":
+            navigation.stop()
+            self._reply({"success": True})
+        elif path == "/api/status":
+            self._reply({"success": True, "data": {"status": navigation.get_status()}})
+        elif path == "/pose":
+            x, y = navigation.position()
+            self._reply({"position": {"x": x, "y": y, "z": 0.0}})
+        elif path == "/signalservice/uwb":
+            distance, azimuth = simulator.visitor.sample()
+            self._reply({"code": "0", "message": "success", "data": {"distance": distance, "azimuth": azimuth}})
+        elif path.startswith("/signalservice/"):
+            self._reply({"code": "0", "message": "success", "data": {}})
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class GuideSimulator:
+    """
+    导航服务 + UWB 接口模拟，在一个或两个端口上提供服务
+
+    参数:
+    ports: 监听端口，导航和 sdk 可以共用一个端口（路径不重叠）
+    latency: 每个请求的固定处理延迟（真实秒）
+    """
+
+    def __init__(self, start_pose, speed=1.0, host="127.0.0.1", ports=(8001, 18080), nav_speed=0.6,
+                 visitor_script=None, seed=0, latency=0.0, status_delay=0.0, min_travel_time=1.0):
+        self.clock = SimClock(speed)
+        self.navigation = NavigationSimulator(self.clock, start_pose, speed=nav_speed, status_delay=status_delay,
+                                              min_travel_time=min_travel_time)
+        self.visitor = VisitorScript(self.clock, visitor_script, seed=seed)
+        self.host = host
+        self.ports = tuple(dict.fromkeys(ports))
+        self.latency = latency
+        self.requests = Counter()  # "GET /api/status" -> 次数
+        self._servers = []
+
+    def reset(self, start_pose):
+        """开始一次新的模拟：时钟归零，机器狗回到 start_pose"""
+        self.navigation.reset(start_pose)
+        self.requests.clear()
+        self.clock.start()
+
+    def start(self):
+        handler = type("SimHandler", (_SimHandler,), {"simulator": self})
+        for port in self.ports:
+            server = ThreadingHTTPServer((self.host, port), handler)
+            server.daemon_threads = True
+            thread = threading.Thread(target=server.serve_forever, daemon=True, name=f"guide_simulator_{port}")
+            thread.start()
+            self._servers.append(server)
+            print(f"模拟服务已启动: http://{self.host}:{port}")
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="引路犬导航/UWB模拟服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--nav-port", type=int, default=8001)
+    parser.add_argument("--sdk-port", type=int, default=18080)
+    parser.add_argument("--speed", type=float, default=1.0, help="时间加速倍数")
+    parser.add_argument("--nav-speed", type=float, default=0.6, help="机器狗行走速度（米/秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--status-delay", type=float, default=0.0, help="导航状态更新滞后（秒）")
+    parser.add_argument("--min-travel-time", type=float, default=1.0, help="每段导航的最短行走时间（秒）")
+    args = parser.parse_args()
+
+    start_pose = {"position": {"x": 22.3228, "y": -7.15802, "z": 0}}
+    simulator = GuideSimulator(start_pose, speed=args.speed, host=args.host, ports=(args.nav_port, args.sdk_port),
+                               nav_speed=args.nav_speed, seed=args.seed, status_delay=args.status_delay,
+                               min_travel_time=args.min_travel_time).start()
+    simulator.reset(start_pose)
+    try:
+        while True:
+            time.sleep(5)
+            print(simulator.navigation.get_status(), simulator.navigation.position(), dict(simulator.requests))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
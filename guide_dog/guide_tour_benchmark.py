@@ -0,0 +1,232 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+import dog_service
+from audio_player import AudioPlayer, RecordingSink
+from guide_dog_app import GuideDogController
+from guide_simulator import GuideSimulator, DEFAULT_VISITOR_SCRIPT
+from http_client import NAVIGATION_BASE_URL, ROBOT_SDK_BASE_URL
+from uwb_sampler import get_uwb_sampler
+
+"""
+引路流程模拟基准测试
+
+在 guide_simulator 提供的导航/UWB 模拟服务上（监听 NAVIGATION_BASE_URL 和 ROBOT_SDK_BASE_URL 的端口，
+默认 localhost:8001 / localhost:18080），按加速时间完整运行 guide / zhanting / vip 引导流程，
+语音换成 RecordingSink（不发声，只记录），结果写入JSON文件：
+- 流程耗时、到达点位数
+- 导航 start/stop 次数、暂停→继续的次数
+- 各提示语音的播放次数
+- 控制环路反应延迟：访客距离越过 4m（应暂停）/ 2m（应继续）到 stop/start 请求到达导航服务的时间，
+  以及到达点位到下一段导航 start 的时间
+
+控制器的检查周期、UWB采集周期、语音时长都按 --speed 缩短，报告中的时间均为模拟时间（秒/毫秒），
+除以 speed 即真实时间。UWB卡尔曼滤波使用真实时间戳，加速时滤波响应与实机略有差别，调阈值时以 --speed 1 为准。
+
+用法:
+python guide_tour_benchmark.py --tours guide zhanting vip --speed 5
+python guide_tour_benchmark.py --tours vip --speed 1 --nav-speed 0.8 --output vip.json
+python guide_tour_benchmark.py --tours vip zhanting --status-delay 2  # 导航状态滞后时是否跳过点位
+python guide_tour_benchmark.py --tours vip zhanting --min-travel-time 0  # 短距离导航看不到 running 时是否卡住
+"""
+
+EXPECTED_ARRIVALS = {"guide": 2}  # guide: 引导点 + 返回起点；多点引导为路径点数
+
+
+def summarize(values):
+    if not values:
+        return None
+    values = np.asarray(values, dtype=np.float64) * 1000.0
+    p50, p95 = np.percentile(values, (50, 95))
+    return {"count": len(values), "p50": round(float(p50), 1), "p95": round(float(p95), 1),
+            "max": round(float(values.max()), 1)}
+
+
+def reaction_latencies(events, zone_changes, uwb_checks):
+    """
+    按模拟事件计算反应延迟（秒）
+
+    far: 导航中访客越过 4m → 下一个 stop；near: 暂停中访客越过 2m → 下一个 start；
+    在下一次越过阈值之前没有反应的记为 missed。uwb_checks 为 [(模拟时间, 是否启用UWB检查)]，
+    未启用UWB检查（如返回起点途中）的阈值变化不计入
+    """
+    result = {"far_to_stop": [], "near_to_start": [], "missed_far": 0, "missed_near": 0}
+    for index, (change_time, zone) in enumerate(zone_changes):
+        checks = [enabled for check_time, enabled in uwb_checks if check_time <= change_time]
+        if not checks or not checks[-1]:
+            continue
+        before = [event for event in events if event[0] <= change_time]
+        last = before[-1][1] if before else None
+        if zone == "far" and last != "start":
+            continue  # 没在导航（已暂停或已到达），不需要反应
+        if zone == "near" and last != "stop":
+            continue  # 没有暂停，不需要继续
+        deadline = zone_changes[index + 1][0] if index + 1 < len(zone_changes) else float("inf")
+        wanted = "stop" if zone == "far" else "start"
+        reaction = next((event[0] for event in events if change_time <= event[0] < deadline
+                         and event[1] == wanted), None)
+        key = "far_to_stop" if zone == "far" else "near_to_start"
+        if reaction is None:
+            result["missed_" + zone] += 1
+        else:
+            result[key].append(reaction - change_time)
+    return result
+
+
+def arrival_latencies(events):
+    """到达点位 → 下一段导航 start 的时间（秒）"""
+    latencies = []
+    for index, (event_time, kind, _) in enumerate(events):
+        if kind != "arrive":
+            continue
+        following = events[index + 1:index + 2]
+        if following and following[0][1] == "start":
+            latencies.append(following[0][0] - event_time)
+    return latencies
+
+
+def run_tour(tour, simulator, args):
+    clock = simulator.clock
+    controller = GuideDogController()
+    controller.uwb_poll_interval /= args.speed
+    controller.navigation_poll_interval /= args.speed
+    controller.workflow_heartbeat /= args.speed
+    controller.navigation.status_settle_time /= args.speed
+
+    sink = RecordingSink(default_duration=clock.wall(args.prompt_seconds), clock=clock.now)
+    player = AudioPlayer(sink, clock=clock.now)
+    dog_service.set_audio_player(player)  # 在 start_guide_system 之前替换，不会创建真实播放器
+
+    simulator.reset(controller.start_position)
+    sampler = get_uwb_sampler()
+    sampler.poll_interval = 0.02 / args.speed
+    controller.start_guide_system()
+    while controller._loop is None and controller.thread.is_alive():
+        time.sleep(0.005)  # 等待引路线程的事件循环就绪，start_guiding 才能触发状态机
+
+    start_time = clock.now()
+    message = controller.start_guiding(tour)
+    finished = False
+    uwb_checks = [(start_time, controller.uwb_check_enabled)]  # UWB检查开关的变化
+    while clock.now() - start_time < args.max_tour_seconds:
+        time.sleep(0.01)
+        if controller.uwb_check_enabled != uwb_checks[-1][1]:
+            uwb_checks.append((clock.now(), controller.uwb_check_enabled))
+        if controller.workflow_state == "waiting":
+            finished = True
+            break
+    duration = clock.now() - start_time
+    events = list(simulator.navigation.events)
+    requests = dict(simulator.requests)
+    uwb_rate = sampler.sample_rate() / args.speed
+
+    controller.stop_guide_system()
+    controller.thread.join(timeout=5.0)
+    player.shutdown()
+
+    # 事件时间改为相对流程开始
+    events = [(event_time - start_time, kind, goal) for event_time, kind, goal in events]
+    zone_changes = [(change_time - start_time, zone)
+                    for change_time, zone in simulator.visitor.zone_changes(start_time + duration)
+                    if change_time >= start_time]
+    uwb_checks = [(check_time - start_time, enabled) for check_time, enabled in uwb_checks]
+    reactions = reaction_latencies(events, zone_changes, uwb_checks)
+    kinds = [kind for _, kind, _ in events]
+    stop_start_cycles = sum(1 for first, second in zip(kinds, kinds[1:]) if first == "stop" and second == "start")
+    expected = EXPECTED_ARRIVALS.get(tour) or len(controller.routes[tour])
+
+    return {
+        "start_message": message,
+        "finished": finished,
+        "duration_seconds": round(duration, 2),
+        "arrivals": kinds.count("arrive"),
+        "expected_arrivals": expected,
+        "navigation_starts": kinds.count("start"),
+        "navigation_stops": kinds.count("stop"),
+        "stop_start_cycles": stop_start_cycles,
+        "visitor_zone_changes": len(zone_changes),
+        "prompts": sink.counts(),
+        "prompts_interrupted": sum(1 for record in sink.records if record["interrupted"]),
+        "reaction_ms": {
+            "far_to_stop": summarize(reactions["far_to_stop"]),
+            "near_to_start": summarize(reactions["near_to_start"]),
+            "arrival_to_next_start": summarize(arrival_latencies(events)),
+            "missed_far": reactions["missed_far"],
+            "missed_near": reactions["missed_near"],
+        },
+        "uwb_sample_rate_hz": round(uwb_rate, 1),
+        "requests": requests,
+        "events": [(round(event_time, 3), kind) for event_time, kind, _ in events],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="引路流程模拟基准测试")
+    parser.add_argument("--tours", nargs="+", choices=["guide", "zhanting", "vip"],
+                        default=["guide", "zhanting", "vip"])
+    parser.add_argument("--speed", type=float, default=5.0, help="时间加速倍数")
+    parser.add_argument("--nav-speed", type=float, default=0.6, help="机器狗行走速度（米/模拟秒）")
+    parser.add_argument("--prompt-seconds", type=float, default=2.5, help="每段提示语音的时长（模拟秒）")
+    parser.add_argument("--visitor-script", help="访客脚本JSON文件: [[模拟时间, 距离], ...]，默认60秒周期落后一次")
+    parser.add_argument("--seed", type=int, default=0, help="UWB噪声随机种子")
+    parser.add_argument("--status-delay", type=float, default=0.0,
+                        help="导航状态更新滞后（模拟秒）：发出新目标后导航服务仍返回旧状态的时间")
+    parser.add_argument("--min-travel-time", type=float, default=1.0,
+                        help="每段导航的最短行走时间（模拟秒），0 表示原地目标 pending 之后直接 succeeded")
+    parser.add_argument("--max-tour-seconds", type=float, default=900.0, help="单次流程的最长模拟时间")
+    parser.add_argument("--output", default="guide_tour_benchmark.json",
+                        help="结果JSON文件（控制器的日志打印在标准输出，结果不混在里面）")
+    args = parser.parse_args()
+
+    script = DEFAULT_VISITOR_SCRIPT
+    if args.visitor_script:
+        with open(args.visitor_script, encoding="utf-8") as f:
+            script = [tuple(item) for item in json.load(f)]
+
+    navigation_url, sdk_url = urlparse(NAVIGATION_BASE_URL), urlparse(ROBOT_SDK_BASE_URL)
+    simulator = GuideSimulator(
+        GuideDogController().start_position,
+        speed=args.speed,
+        host=navigation_url.hostname,
+        ports=(navigation_url.port, sdk_url.port),
+        nav_speed=args.nav_speed,
+        visitor_script=script,
+        seed=args.seed,
+        status_delay=args.status_delay,
+        min_travel_time=args.min_travel_time,
+    ).start()
+
+    runs = []
+    try:
+        for tour in args.tours:
+            print(f"运行: {tour}", file=sys.stderr)
+            result = dict(tour=tour, **run_tour(tour, simulator, args))
+            runs.append(result)
+            print(f"  {result['duration_seconds']:.1f}s, 到达 {result['arrivals']}/{result['expected_arrivals']}, "
+                  f"暂停→继续 {result['stop_start_cycles']}次, 语音 {result['prompts']}", file=sys.stderr)
+    finally:
+        get_uwb_sampler().stop()
+        simulator.stop()
+
+    report = {
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "speed": args.speed,
+        "nav_speed": args.nav_speed,
+        "status_delay": args.status_delay,
+        "min_travel_time": args.min_travel_time,
+        "visitor_script": script,
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,28 @@
-import requests
 import json
+from http_client import get_client, ROBOT_SDK_BASE_URL
 
 # 机器狗API接口地址
-ROBOT_API_BASE_URL = "http://localhost:18080"  # 替换为真实的API地址
+ROBOT_API_BASE_URL = ROBOT_SDK_BASE_URL  # 替换为真实的API地址
 ROBOT_MOVE_ENDPOINT = "/signalservice/robot/move"
 
+# 速度指令发送频繁，读取超时设短一些，避免单条指令卡住控制线程
+MOVE_READ_TIMEOUT = 1.0
+
+def send_move_command(vx, vy, vyaw):
+    """
+    下发一次速度指令，不打印；请求失败或返回非200时抛出异常
+
+    供高频发送的速度指令线程使用，由调用方决定失败后是否重发
+    """
+    client = get_client(ROBOT_API_BASE_URL)
+    payload = {"vx": vx, "vy": vy, "vyaw": vyaw}
+    response = client.post(ROBOT_MOVE_ENDPOINT, data=json.dumps(payload),
+                           headers={"Content-Type": "application/json"},
+                           timeout=(client.timeout[0], MOVE_READ_TIMEOUT))
+    if response.status_code != 200:
+        raise RuntimeError(f"move 接口返回 {response.status_code}: {response.text}")
+    return response
+
 # 调用机器狗移动API的函数
 def call_robot_move_api(vx, vy, vyaw):
     """
@@ -19,7 +37,7 @@ def call_robot_move_api(vx, vy, vyaw):
     API调用结果
     """
     try:
-        url = ROBOT_API_BASE_URL + ROBOT_MOVE_ENDPOINT
+        client = get_client(ROBOT_API_BASE_URL)
         payload = {
             "vx": vx,
             "vy": vy,
@@ -29,7 +47,8 @@ def call_robot_move_api(vx, vy, vyaw):
             "Content-Type": "application/json"
         }
         
-        response = requests.post(url, data=json.dumps(payload), headers=headers)
+        response = client.post(ROBOT_MOVE_ENDPOINT, data=json.dumps(payload), headers=headers,
+                               timeout=(client.timeout[0], MOVE_READ_TIMEOUT))
         
         if response.status_code == 200:
             print(f"机器狗移动指令发送成功: vx={vx}, vy={vy}, vyaw={vyaw}")
@@ -0,0 +1,194 @@
+import copy
+import math
+import threading
+import time
+
+from dog_service import navigation_start, navigation_stop
+
+"""
+导航会话
+
+在 navigation_start / navigation_stop 之上记录当前导航目标和状态：
+- 目标与正在执行的目标相同时不重复发送 start，已停止时不重复发送 stop
+- pause() 停止导航但保留目标，resume() 按保留的目标继续，不需要调用方再传一次目标
+- 目标在内部复制后再补 frame_id，不修改调用方的字典
+
+状态: idle（无目标）、active（导航中）、paused（已暂停，保留目标）
+"""
+
+TERMINAL_STATUSES = ("succeeded", "canceled", "failed")
+
+
+class NavigationSession:
+    """跟踪当前导航目标，去掉重复的 start/stop 请求"""
+
+    def __init__(self, start_fn=navigation_start, stop_fn=navigation_stop, goal_tolerance=0.05,
+                 status_settle_time=3.0, clock=time.monotonic):
+        self.start_fn = start_fn
+        self.stop_fn = stop_fn
+        self.goal_tolerance = goal_tolerance  # 目标点相差小于该距离（米）且朝向相同视为同一目标
+        self.status_settle_time = status_settle_time  # start 之后导航服务更新状态所需的最长时间（秒）
+        self.clock = clock
+
+        self.state = "idle"
+        self.goal = None  # 当前（或暂停中的）目标，已补 frame_id
+        self.start_count = 0  # 实际发出的 start 请求数
+        self.stop_count = 0  # 实际发出的 stop 请求数
+        self.suppressed_count = 0  # 被去重的请求数
+
+        self._last_status = None  # 最近一次上报的导航状态
+        self._start_time = float("-inf")  # 本次 start 发出的时刻
+        self._status_at_start = None  # 发出本次 start 时的导航状态
+        self._status_changed = False  # 本次 start 之后上报的状态是否与发出时不同
+        self._succeeded = False  # 本次 start 的目标是否已到达
+        self._lock = threading.RLock()
+
+    @property
+    def is_active(self):
+        return self.state == "active"
+
+    @property
+    def is_paused(self):
+        return self.state == "paused"
+
+    @property
+    def goal_reached(self):
+        """
+        当前目标是否已到达
+
+        只认本次 start 之后查询到的 succeeded（规则见 update_status），
+        新目标发出后缓存或导航服务仍是上一个目标的 succeeded 时不算到达
+        """
+        return self._succeeded
+
+    def start(self, target_position):
+        """导航到目标；与正在执行的目标相同时直接返回True"""
+        goal = self._normalize(target_position)
+        with self._lock:
+            if self.state == "active" and self._same_goal(goal, self.goal):
+                self.suppressed_count += 1
+                return True
+            return self._send_start(goal)
+
+    def pause(self):
+        """暂停导航，保留目标供 resume 使用；未在导航时不发请求"""
+        with self._lock:
+            if self.state != "active":
+                self.suppressed_count += 1
+                return True
+            if not self._send_stop():
+                return False
+            self.state = "paused"
+            return True
+
+    def resume(self, target_position=None):
+        """
+        继续导航
+
+        参数:
+        target_position: 可选，传入时若与暂停的目标不同则改为导航到新目标
+        """
+        with self._lock:
+            goal = self.goal if target_position is None else self._normalize(target_position)
+            if goal is None:
+                return False
+            if self.state == "active" and self._same_goal(goal, self.goal):
+                self.suppressed_count += 1
+                return True
+            return self._send_start(goal)
+
+    def stop(self):
+        """结束导航并清除目标；暂停中只清除目标（规划器已停止）"""
+        with self._lock:
+            if self.state == "active" and not self._send_stop():
+                return False
+            if self.state != "active":
+                self.suppressed_count += 1
+            self.state = "idle"
+            self.goal = None
+            self._succeeded = False
+            return True
+
+    def finish(self):
+        """导航已到达目标（由调用方根据导航状态判断），清除目标，不发请求"""
+        with self._lock:
+            self.state = "idle"
+            self.goal = None
+            self._succeeded = False
+
+    def update_status(self, status, polled_at=None):
+        """
+        同步导航服务上报的状态
+
+        参数:
+        status: 导航服务返回的状态
+        polled_at: 发出这次状态查询的时刻（clock 时间，默认为现在），早于本次 start 的查询结果忽略
+
+        本次 start 之后查询到结束状态（succeeded/canceled/failed），且满足以下之一时，会话回到 idle：
+        - 之后上报过与发出 start 时不同的状态（包括这次的结束状态本身）
+        - 与发出 start 时相同，但查询距 start 已超过 status_settle_time：
+          目标很近时导航可能在两次查询之间就完成了，看不到 pending/running
+        之后相同目标的 start 会重新发送。
+
+        返回:
+        这次上报是否结束了当前目标
+        """
+        polled_at = self.clock() if polled_at is None else polled_at
+        with self._lock:
+            if self.state != "active":
+                self._last_status = status
+                return False
+            if polled_at < self._start_time:
+                return False
+            self._last_status = status
+            if status != self._status_at_start:
+                self._status_changed = True
+            if status not in TERMINAL_STATUSES:
+                return False
+            if not self._status_changed and polled_at - self._start_time < self.status_settle_time:
+                return False
+            self.state = "idle"
+            self._succeeded = status == "succeeded"
+            return True
+
+    def get_status(self):
+        return f"{self.state}（start {self.start_count}次，stop {self.stop_count}次，去重 {self.suppressed_count}次）"
+
+    def _send_start(self, goal):
+        start_time = self.clock()  # 请求发出之前记时，与之并发的查询按旧状态处理
+        if not self.start_fn(goal):
+            return False
+        self.start_count += 1
+        self.state = "active"
+        self.goal = goal
+        self._start_time = start_time
+        self._status_at_start = self._last_status
+        self._status_changed = False
+        self._succeeded = False
+        return True
+
+    def _send_stop(self):
+        if not self.stop_fn():
+            return False
+        self.stop_count += 1
+        return True
+
+    @staticmethod
+    def _normalize(target_position):
+        goal = copy.deepcopy(target_position)
+        goal["frame_id"] = "map"
+        return goal
+
+    def _same_goal(self, a, b):
+        if a is None or b is None:
+            return a is b
+        if a.keys() != b.keys():
+            return False
+        for key in a:
+            if key == "position":
+                pa, pb = a[key], b[key]
+                if math.hypot(pa["x"] - pb["x"], pa["y"] - pb["y"]) > self.goal_tolerance:
+                    return False
+            elif a[key] != b[key]:
+                return False
+        return True
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# guide_dog 下的模块按脚本方式互相导入（from http_client import ...），测试时把该目录加入搜索路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
@@ -0,0 +1,91 @@
+import threading
+
+from audio_player import AudioPlayer, RecordingSink
+
+
+class FakeClock:
+    """手动推进的时钟，代替 time.monotonic"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class BlockingSink:
+    """播放时阻塞到被打断或被放行，用于检查优先级打断"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.records = []
+
+    def play(self, name, cancel_event):
+        self.started.set()
+        while not cancel_event.is_set() and not self.release.is_set():
+            cancel_event.wait(0.01)
+        self.records.append((name, cancel_event.is_set()))
+
+
+def test_recording_sink_counts_played_prompts():
+    sink = RecordingSink()
+    player = AudioPlayer(sink, dedupe_window=0.0)
+    try:
+        for name in ("start", "guide", "quick"):
+            assert player.play(name)
+            assert player.wait_idle(timeout=2.0)
+        assert sink.counts() == {"start": 1, "guide": 1, "quick": 1}
+    finally:
+        player.shutdown()
+
+
+def test_queued_duplicate_is_dropped():
+    sink = BlockingSink()
+    player = AudioPlayer(sink, dedupe_window=0.0)
+    try:
+        assert player.play("start")
+        assert sink.started.wait(2.0)
+        assert not player.play("start")  # 正在播放
+        assert player.play("guide")
+        assert not player.play("guide")  # 已在队列中
+        sink.release.set()
+        assert player.wait_idle(timeout=2.0)
+        assert [name for name, _ in sink.records] == ["start", "guide"]
+    finally:
+        player.shutdown()
+
+
+def test_higher_priority_interrupts_current_prompt():
+    sink = BlockingSink()
+    player = AudioPlayer(sink, dedupe_window=0.0)
+    try:
+        player.play("guide")
+        assert sink.started.wait(2.0)
+        player.play("quick")  # 安全提示优先级更高
+        sink.release.set()
+        assert player.wait_idle(timeout=2.0)
+        assert sink.records[0] == ("guide", True)
+        assert sink.records[1][0] == "quick"
+    finally:
+        player.shutdown()
+
+
+def test_dedupe_window_uses_player_clock():
+    clock = FakeClock()
+    sink = RecordingSink(clock=clock)
+    player = AudioPlayer(sink, dedupe_window=1.0, clock=clock)
+    try:
+        assert player.play("guide")
+        assert player.wait_idle(timeout=2.0)
+        clock.advance(0.5)
+        assert not player.play("guide")
+        clock.advance(1.0)
+        assert player.play("guide")
+        assert player.wait_idle(timeout=2.0)
+        assert sink.counts() == {"guide": 2}
+    finally:
+        player.shutdown()
@@ -0,0 +1,94 @@
+import pytest
+
+import follow_controller
+from follow_controller import PersonFollowController
+from uwb_sampler import UwbSampler
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload=None):
+        self.payload = payload or {}
+
+    def json(self):
+        return self.payload
+
+
+class FakeNavClient:
+    def __init__(self):
+        self.goals = []
+
+    def get(self, path, **kwargs):
+        return FakeResponse({"x": 1.0, "y": 2.0, "z": 0.0})
+
+    def post(self, path, json=None, **kwargs):
+        self.goals.append(json)
+        return FakeResponse()
+
+
+@pytest.fixture
+def moves(monkeypatch):
+    sent = []
+    monkeypatch.setattr(follow_controller, "call_robot_move_api", lambda vx, vy, vyaw: sent.append((vx, vy, vyaw)))
+    return sent
+
+
+def make_controller():
+    controller = PersonFollowController(sampler=UwbSampler())
+    controller.nav_client = FakeNavClient()
+    controller.uwb_filter.kalman = None  # 只用中位数，距离立即跟随样本
+    return controller
+
+
+def feed(controller, now, distance, azimuth=0.0, count=9):
+    for index in range(count):
+        controller.sampler.push(now - 0.01 * (count - index), distance, azimuth)
+    controller.step(now)
+
+
+def test_mode_hysteresis(moves):
+    controller = make_controller()
+    controller._navigation_step = lambda samples: None
+    feed(controller, 1.0, 2.0)
+    assert controller.mode == "velocity"
+    feed(controller, 1.1, 3.2)  # 在 near_range 与 far_range 之间保持速度控制
+    assert controller.mode == "velocity"
+    feed(controller, 1.2, 4.0)
+    assert controller.mode == "navigation"
+    feed(controller, 1.3, 3.2)  # 保持导航
+    assert controller.mode == "navigation"
+
+
+def test_start_inside_hysteresis_band(moves):
+    controller = make_controller()
+    controller._navigation_step = lambda samples: None
+    feed(controller, 1.0, 3.2)  # 从空闲开始，距离在 near_range 与 far_range 之间也要进入一种模式
+    assert controller.mode == "velocity"
+    assert moves[-1] != (0.0, 0.0, 0.0)
+
+    controller = make_controller()
+    controller._navigation_step = lambda samples: None
+    feed(controller, 1.0, 3.4)
+    assert controller.mode == "navigation"
+
+
+def test_sample_timeout_stops(moves):
+    controller = make_controller()
+    feed(controller, 1.0, 2.0)
+    assert moves[-1] != (0.0, 0.0, 0.0)
+    controller.step(1.0 + controller.sample_timeout + 0.1)
+    assert controller.mode == "idle"
+    assert moves[-1] == (0.0, 0.0, 0.0)
+
+
+def test_stop_in_navigation_mode_holds_planner(moves):
+    controller = make_controller()
+    controller._navigation_step = lambda samples: None
+    feed(controller, 1.0, 5.0)
+    assert controller.mode == "navigation"
+    controller.stop()
+    assert controller.mode == "idle"
+    # 离开导航模式时把目标设为当前位置
+    assert controller.nav_client.goals == [{"x": 1.0, "y": 2.0, "z": 0.0, "frame_id": "map"}]
+    assert moves[-1] == (0.0, 0.0, 0.0)
@@ -0,0 +1,114 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import http_client
+from http_client import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, HttpClient, close_all, get_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """/drop: 每个方法第一次请求直接断开连接，之后正常返回；/slow: 延迟后返回"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self, method):
+        server = self.server
+        server.counts[(method, self.path)] = server.counts.get((method, self.path), 0) + 1
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.path == "/drop" and server.counts[(method, self.path)] == 1:
+            self.close_connection = True
+            return
+        if self.path == "/slow":
+            time.sleep(0.5)
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.counts = {}
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture(autouse=True)
+def clear_clients():
+    yield
+    close_all()
+
+
+def test_get_is_retried_after_dropped_connection(server, base_url):
+    client = HttpClient(base_url)
+    try:
+        assert client.get("/drop").status_code == 200
+        assert server.counts[("GET", "/drop")] == 2
+    finally:
+        client.close()
+
+
+def test_post_is_not_retried_after_dropped_connection(server, base_url):
+    client = HttpClient(base_url)
+    try:
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.post("/drop", json={"x": 0.1})
+        assert server.counts[("POST", "/drop")] == 1  # 运动指令不会重复下发
+    finally:
+        client.close()
+
+
+def test_default_and_per_request_timeouts(base_url, monkeypatch):
+    client = HttpClient(base_url)
+    captured = []
+    monkeypatch.setattr(client.session, "request", lambda method, url, timeout=None, **kwargs: captured.append(timeout))
+    client.get("/status")
+    client.post("/move", timeout=0.2)
+    assert captured == [(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT), 0.2]
+
+
+def test_read_timeout(base_url):
+    client = HttpClient(base_url, read_timeout=0.1)
+    try:
+        start = time.monotonic()
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.post("/slow")
+        assert time.monotonic() - start < 0.4
+    finally:
+        client.close()
+
+
+def test_get_client_is_cached_per_base_url(base_url):
+    client = get_client(base_url, read_timeout=1.0)
+    assert get_client(base_url + "/") is client
+    assert client.timeout == (DEFAULT_CONNECT_TIMEOUT, 1.0)
+    assert get_client(base_url.replace("127.0.0.1", "localhost")) is not client
+    close_all()
+    assert not http_client._clients
+    assert get_client(base_url) is not client
@@ -0,0 +1,145 @@
+from navigation_session import NavigationSession
+
+GOAL_A = {"position": {"x": 1.0, "y": 2.0, "z": 0}, "orientation": {"x": 0, "y": 0, "z": 0, "w": 1}}
+GOAL_B = {"position": {"x": 5.0, "y": 2.0, "z": 0}, "orientation": {"x": 0, "y": 0, "z": 0, "w": 1}}
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeNavigation:
+    def __init__(self):
+        self.calls = []
+
+    def start(self, goal):
+        self.calls.append(("start", goal["position"]["x"]))
+        return True
+
+    def stop(self):
+        self.calls.append(("stop",))
+        return True
+
+
+def make_session(clock=None):
+    navigation = FakeNavigation()
+    session = NavigationSession(start_fn=navigation.start, stop_fn=navigation.stop, status_settle_time=3.0,
+                                clock=clock or FakeClock())
+    return session, navigation
+
+
+def finish_leg(session, clock):
+    """按 pending → running → succeeded 走完当前目标"""
+    for status in ("pending", "running", "succeeded"):
+        clock.now += 0.5
+        session.update_status(status)
+
+
+def test_same_goal_is_sent_once():
+    session, navigation = make_session()
+    assert session.start(GOAL_A)
+    assert session.start(GOAL_A)
+    assert navigation.calls == [("start", 1.0)]
+    assert session.suppressed_count == 1
+    assert "frame_id" not in GOAL_A  # 不修改调用方的字典
+
+
+def test_pause_and_resume_keep_goal():
+    session, navigation = make_session()
+    session.start(GOAL_A)
+    assert session.pause()
+    assert session.is_paused
+    assert session.pause()  # 已暂停，不再发 stop
+    assert session.resume()
+    assert navigation.calls == [("start", 1.0), ("stop",), ("start", 1.0)]
+    assert session.is_active
+
+
+def test_stop_while_paused_sends_nothing():
+    session, navigation = make_session()
+    session.start(GOAL_A)
+    session.pause()
+    assert session.stop()
+    assert navigation.calls == [("start", 1.0), ("stop",)]
+    assert session.goal is None
+
+
+
+def test_stale_succeeded_from_previous_leg_is_not_reached():
+    clock = FakeClock(10.0)
+    session, _ = make_session(clock)
+    session.start(GOAL_A)
+    finish_leg(session, clock)
+    assert session.goal_reached
+
+    clock.now = 20.0
+    session.start(GOAL_B)
+    assert not session.goal_reached
+    assert not session.update_status("succeeded", polled_at=19.8)  # start 之前发出的查询
+    clock.now = 20.5
+    assert not session.update_status("succeeded")  # 导航服务还没更新状态
+    assert session.is_active
+    clock.now = 21.0
+    session.update_status("running")
+    clock.now = 21.5
+    assert session.update_status("succeeded")
+    assert session.goal_reached
+    assert session.state == "idle"
+
+
+def test_succeeded_on_first_poll_after_start():
+    clock = FakeClock()
+    session, _ = make_session(clock)
+    session.update_status("idle")
+    session.start(GOAL_A)
+    clock.now = 0.5
+    assert session.update_status("succeeded")  # 目标很近，两次查询之间就已完成
+    assert session.goal_reached
+
+
+def test_unchanged_succeeded_is_reached_after_settle_time():
+    clock = FakeClock()
+    session, navigation = make_session(clock)
+    session.start(GOAL_A)
+    finish_leg(session, clock)
+
+    start_time = clock.now
+    session.start(GOAL_A)  # 原地目标：状态一直是 succeeded
+    for step in range(1, 6):
+        clock.now = start_time + step * 0.5
+        assert not session.update_status("succeeded")
+    clock.now = start_time + 3.0
+    assert session.update_status("succeeded")
+    assert session.goal_reached
+    assert session.start(GOAL_A)  # 已结束，相同目标会重新发送
+    assert navigation.calls == [("start", 1.0), ("start", 1.0), ("start", 1.0)]
+
+
+def test_resume_near_goal_reached_without_running():
+    clock = FakeClock()
+    session, _ = make_session(clock)
+    session.start(GOAL_A)
+    clock.now = 0.5
+    session.update_status("running")
+    session.pause()
+    clock.now = 1.0
+    session.update_status("canceled")
+    session.resume()
+    clock.now = 1.5
+    assert session.update_status("succeeded")
+    assert session.goal_reached
+
+
+def test_canceled_is_not_reached():
+    clock = FakeClock()
+    session, _ = make_session(clock)
+    session.start(GOAL_A)
+    clock.now = 0.5
+    session.update_status("running")
+    assert session.update_status("canceled")
+    assert not session.goal_reached
+    assert session.state == "idle"
@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+
+from uwb_filter import SlidingMedian, UwbFilter, UwbKalmanFilter, _ConstantVelocityKalman, wrap_angle
+
+
+def test_sliding_median_matches_numpy_median():
+    rng = random.Random(0)
+    median = SlidingMedian(7)
+    values = [rng.choice([rng.uniform(0, 10), 5.0]) for _ in range(300)]  # 含大量重复值
+    for index, value in enumerate(values):
+        result = median.update(value)
+        window = values[max(0, index - 6):index + 1]
+        assert result == np.median(window)
+        assert len(median) == len(window)
+
+
+def test_sliding_median_reset():
+    median = SlidingMedian(3)
+    for value in (1.0, 2.0, 3.0):
+        median.update(value)
+    median.reset()
+    assert len(median) == 0
+    assert median.update(10.0) == 10.0
+
+
+def test_wrap_angle():
+    assert wrap_angle(190.0) == -170.0
+    assert wrap_angle(-190.0) == 170.0
+    assert wrap_angle(180.0) == -180.0
+
+
+def test_uwb_filter_rejects_single_outlier():
+    uwb_filter = UwbFilter(median_window=5)
+    timestamp = 0.0
+    for index in range(40):
+        timestamp += 0.02
+        distance = 9.0 if index == 30 else 2.0
+        result_distance, _ = uwb_filter.update(distance, 10.0, timestamp)
+    assert abs(result_distance - 2.0) < 0.1
+
+
+def test_uwb_filter_azimuth_across_wraparound():
+    uwb_filter = UwbFilter(median_window=5, kalman=False)
+    for index, azimuth in enumerate([178.0, -179.0, 179.0, -178.0, 180.0]):
+        _, result = uwb_filter.update(2.0, azimuth, index * 0.02)
+    # 中位数在 ±180° 附近，不会落到 0° 附近
+    assert abs(wrap_angle(result - 180.0)) < 3.0
+
+
+def test_uwb_filter_ignores_invalid_samples():
+    uwb_filter = UwbFilter(median_window=3, kalman=False)
+    uwb_filter.update(2.0, 0.0, 0.0)
+    assert uwb_filter.update(0.0, 0.0, 0.02) == (2.0, 0.0)
+    assert uwb_filter.update(None, 5.0, 0.04) == (2.0, 0.0)
+
+
+def test_kalman_azimuth_tracks_across_wraparound():
+    kalman = UwbKalmanFilter()
+    azimuth, previous = 160.0, None
+    for index in range(40):
+        azimuth = wrap_angle(azimuth + 1.0)  # 匀速转过 ±180°
+        _, result = kalman.update(2.0, azimuth, index * 0.05)
+        assert -180.0 <= result < 180.0
+        if previous is not None:
+            assert abs(wrap_angle(result - previous)) < 3.0  # 不会在回绕处跳到 0° 附近
+        previous = result
+    assert abs(wrap_angle(result - azimuth)) < 1.0
+
+
+def test_kalman_gate_rejects_outlier():
+    kalman = _ConstantVelocityKalman(process_noise=1.0, measurement_noise=0.05)
+    for _ in range(20):
+        kalman.predict(0.05)
+        estimate = kalman.update(2.0)
+    kalman.predict(0.05)
+    assert kalman.update(8.0) == estimate  # 野值不进入估计
+    assert kalman.rejects == 1
+    kalman.predict(0.05)
+    kalman.update(2.0)
+    assert kalman.rejects == 0
+
+
+def test_kalman_gate_reinitializes_after_persistent_jump():
+    kalman = _ConstantVelocityKalman(process_noise=1.0, measurement_noise=0.05, max_rejects=3)
+    for _ in range(20):
+        kalman.predict(0.05)
+        kalman.update(2.0)
+    results = []
+    for _ in range(4):
+        kalman.predict(0.05)
+        results.append(kalman.update(6.0))  # 换人或遮挡恢复，距离真的跳变
+    assert all(abs(value - 2.0) < 0.1 for value in results[:3])
+    assert results[3] == 6.0
+    assert kalman.rejects == 0
+
+
+def test_kalman_angle_gate_uses_wrapped_innovation():
+    kalman = _ConstantVelocityKalman(process_noise=400.0, measurement_noise=25.0, angle=True)
+    for _ in range(10):
+        kalman.predict(0.05)
+        kalman.update(179.0)
+    kalman.predict(0.05)
+    result = kalman.update(-179.0)  # 实际只差 2°，不能当成 358° 的野值
+    assert kalman.rejects == 0
+    assert abs(wrap_angle(result - 180.0)) < 2.0
+
+
+def test_kalman_ignores_non_positive_dt():
+    kalman = UwbKalmanFilter()
+    kalman.update(2.0, 10.0, 1.0)
+    assert kalman.update(2.0, 10.0, 1.0) == (2.0, 10.0)
+    assert kalman.update(2.0, 10.0, 0.5) == (2.0, 10.0)  # 时间戳回退不外推
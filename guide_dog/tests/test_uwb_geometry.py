@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from uwb_geometry import calculate_target_pose, calculate_target_positions, rotation_matrices
+
+Rotation = pytest.importorskip("scipy.spatial.transform").Rotation
+
+
+def scipy_target_position(pose, distance, azimuth):
+    """原 test_uwb_follow / test_uwb_degree 中逐个样本的 scipy 计算"""
+    x, y, z, roll, pitch, yaw = pose
+    azimuth = np.radians(azimuth)
+    point = np.array([distance * np.cos(azimuth), distance * np.sin(azimuth), 0.0])
+    rotation = Rotation.from_euler("xyz", [roll, pitch, yaw]).as_matrix()
+    return np.dot(rotation, point) + np.array([x, y, z])
+
+
+def random_poses(rng, count):
+    poses = np.empty((count, 6))
+    poses[:, :3] = rng.uniform(-20.0, 20.0, (count, 3))
+    poses[:, 3:5] = rng.uniform(-0.3, 0.3, (count, 2))
+    poses[:, 5] = rng.uniform(-np.pi, np.pi, count)
+    return poses
+
+
+def test_rotation_matrices_match_scipy():
+    rng = np.random.default_rng(0)
+    angles = rng.uniform(-np.pi, np.pi, (50, 3))
+    expected = Rotation.from_euler("xyz", angles).as_matrix()
+    np.testing.assert_allclose(rotation_matrices(angles[:, 0], angles[:, 1], angles[:, 2]), expected, atol=1e-12)
+
+
+def test_batched_positions_match_per_sample_scipy():
+    rng = np.random.default_rng(1)
+    poses = random_poses(rng, 40)
+    distances = rng.uniform(0.2, 8.0, 40)
+    azimuths = rng.uniform(-180.0, 180.0, 40)
+    expected = [scipy_target_position(pose, d, a) for pose, d, a in zip(poses, distances, azimuths)]
+    np.testing.assert_allclose(calculate_target_positions(poses, distances, azimuths), expected, atol=1e-9)
+
+
+def test_single_pose_is_broadcast():
+    rng = np.random.default_rng(2)
+    pose = random_poses(rng, 1)[0]
+    distances = rng.uniform(0.2, 8.0, 10)
+    azimuths = rng.uniform(-180.0, 180.0, 10)
+    expected = [scipy_target_position(pose, d, a) for d, a in zip(distances, azimuths)]
+    np.testing.assert_allclose(calculate_target_positions(pose, distances, azimuths), expected, atol=1e-9)
+
+
+@pytest.mark.parametrize("roll, pitch", [(0.0, 0.0), (0.2, -0.1)])
+def test_calculate_target_pose_matches_scipy(roll, pitch):
+    robot_pose = {"x": 3.0, "y": -2.0, "z": 0.4, "roll": roll, "pitch": pitch, "yaw": 2.5}
+    uwb_data = {"distance": 2.5, "azimuth": -135.0}
+    result = calculate_target_pose(robot_pose, uwb_data)  # roll/pitch 为0时走二维快速路径
+    expected = scipy_target_position([3.0, -2.0, 0.4, roll, pitch, 2.5], 2.5, -135.0)
+    np.testing.assert_allclose([result["x"], result["y"], result["z"]], expected, atol=1e-9)
+    assert result["frame_id"] == "map"
@@ -0,0 +1,59 @@
+import numpy as np
+
+from uwb_sampler import UwbSampler
+
+
+def push_range(sampler, start, end):
+    for index in range(start, end):
+        sampler.push(float(index), 1.0 + index * 0.01, float(index))
+
+
+def test_latest_and_empty():
+    sampler = UwbSampler(capacity=4)
+    assert sampler.latest() is None
+    assert sampler.read_since(0)[1].shape == (0, 3)
+    push_range(sampler, 0, 6)
+    assert sampler.latest() == (5.0, 1.05, 5.0)
+
+
+def test_read_since_across_wraparound():
+    sampler = UwbSampler(capacity=8)
+    push_range(sampler, 0, 6)
+    cursor, rows = sampler.read_since(0)
+    assert cursor == 6
+    push_range(sampler, 6, 11)  # 写入位置从缓冲区末尾回到开头
+    cursor, rows = sampler.read_since(cursor)
+    assert cursor == 11
+    assert rows[:, 0].tolist() == [6.0, 7.0, 8.0, 9.0, 10.0]
+
+
+def test_read_since_lagging_cursor_keeps_newest_capacity():
+    sampler = UwbSampler(capacity=8)
+    push_range(sampler, 0, 20)
+    cursor, rows = sampler.read_since(3)  # 游标之后的数据已有一部分被覆盖
+    assert cursor == 20
+    assert rows[:, 0].tolist() == [float(index) for index in range(12, 20)]
+
+
+def test_read_since_drops_rows_overwritten_during_copy():
+    sampler = UwbSampler(capacity=8)
+    push_range(sampler, 0, 8)
+    copy_range = sampler._copy_range
+
+    def copy_while_writing(start, end):
+        rows = copy_range(start, end)
+        push_range(sampler, 8, 11)  # 复制过程中采集线程又写了3个样本，覆盖了最旧的3行
+        return rows
+
+    sampler._copy_range = copy_while_writing
+    cursor, rows = sampler.read_since(0)
+    assert cursor == 8
+    assert rows[:, 0].tolist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+
+
+def test_window_by_size_and_seconds():
+    sampler = UwbSampler(capacity=8)
+    push_range(sampler, 0, 12)
+    assert sampler.window(size=3)[:, 0].tolist() == [9.0, 10.0, 11.0]
+    assert sampler.window(seconds=2.0)[:, 0].tolist() == [9.0, 10.0, 11.0]
+    assert np.isclose(sampler.sample_rate(seconds=4.0), 1.0)
@@ -0,0 +1,278 @@
+import heapq
+from collections import deque
+
+"""
+UWB数据流式滤波
+
+每来一个样本更新一次，不再攒一批数据后整体排序：
+- SlidingMedian: 滑动窗口中位数，双堆+延迟删除，每个样本 O(log n)
+- EmaFilter: 指数滑动平均，可按角度处理回绕
+- UwbKalmanFilter: 距离/方位角恒速卡尔曼滤波，方位角新息做 ±180° 回绕
+- UwbFilter: 组合滤波（中位数去野值 → 卡尔曼平滑），供引路和跟随使用
+
+角度单位均为度。
+"""
+
+
+def wrap_angle(angle):
+    """把角度归一化到 [-180, 180)"""
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+class SlidingMedian:
+    """
+    滑动窗口中位数
+
+    原 process_data 去掉最高、最低各10%后再取中位数，对称截尾不会改变中位数，
+    所以这里直接维护窗口中位数即可，结果与原批处理一致。
+    """
+
+    def __init__(self, window_size):
+        self.window_size = window_size
+        self._window = deque()  # 窗口内的 (value, seq)
+        self._low = []  # 较小的一半，最大堆: (-value, -seq)
+        self._high = []  # 较大的一半，最小堆: (value, seq)
+        self._low_count = 0  # 有效元素个数（不含待删除）
+        self._high_count = 0
+        self._deleted = set()  # 待删除元素的seq
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._window)
+
+    def reset(self):
+        self.__init__(self.window_size)
+
+    def update(self, value):
+        """加入一个样本，返回当前窗口中位数"""
+        key = (value, self._seq)
+        self._seq += 1
+
+        if self._low_count == 0 or key <= self._low_top():
+            heapq.heappush(self._low, (-key[0], -key[1]))
+            self._low_count += 1
+        else:
+            heapq.heappush(self._high, key)
+            self._high_count += 1
+
+        self._window.append(key)
+        if len(self._window) > self.window_size:
+            self._remove(self._window.popleft())
+
+        self._rebalance()
+        if len(self._low) + len(self._high) > 4 * self.window_size + 16:
+            self._compact()
+        return self.median()
+
+    def median(self):
+        if self._low_count == 0:
+            return None
+        if self._low_count > self._high_count:
+            return self._low_top()[0]
+        return (self._low_top()[0] + self._high_top()[0]) / 2
+
+    def _low_top(self):
+        value, seq = self._low[0]
+        return -value, -seq
+
+    def _high_top(self):
+        return self._high[0]
+
+    def _remove(self, key):
+        # 先根据 low 的有效堆顶判断元素所在的一半，再标记删除
+        self._prune(self._low, negate=True)
+        in_low = self._low_count > 0 and key <= self._low_top()
+        self._deleted.add(key[1])
+        if in_low:
+            self._low_count -= 1
+            self._prune(self._low, negate=True)
+        else:
+            self._high_count -= 1
+            self._prune(self._high, negate=False)
+
+    def _prune(self, heap, negate):
+        while heap:
+            seq = -heap[0][1] if negate else heap[0][1]
+            if seq not in self._deleted:
+                break
+            self._deleted.discard(seq)
+            heapq.heappop(heap)
+
+    def _compact(self):
+        # 堆里积累的已删除元素过多时按当前窗口重建，均摊后仍为 O(log n)
+        ordered = sorted(self._window)
+        split = (len(ordered) + 1) // 2
+        self._low = [(-value, -seq) for value, seq in ordered[:split]]
+        self._high = list(ordered[split:])
+        heapq.heapify(self._low)
+        heapq.heapify(self._high)
+        self._low_count = split
+        self._high_count = len(ordered) - split
+        self._deleted.clear()
+
+    def _rebalance(self):
+        # 保持 low 比 high 多0或1个有效元素
+        if self._low_count > self._high_count + 1:
+            value, seq = heapq.heappop(self._low)
+            heapq.heappush(self._high, (-value, -seq))
+            self._low_count -= 1
+            self._high_count += 1
+            self._prune(self._low, negate=True)
+        elif self._low_count < self._high_count:
+            value, seq = heapq.heappop(self._high)
+            heapq.heappush(self._low, (-value, -seq))
+            self._high_count -= 1
+            self._low_count += 1
+            self._prune(self._high, negate=False)
+
+
+class EmaFilter:
+    """指数滑动平均，angle=True 时按角度回绕处理"""
+
+    def __init__(self, alpha, angle=False):
+        self.alpha = alpha
+        self.angle = angle
+        self.value = None
+
+    def reset(self):
+        self.value = None
+
+    def update(self, x):
+        if self.value is None:
+            self.value = wrap_angle(x) if self.angle else x
+        elif self.angle:
+            self.value = wrap_angle(self.value + self.alpha * wrap_angle(x - self.value))
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class _ConstantVelocityKalman:
+    """一维恒速模型卡尔曼滤波，状态为 [值, 变化率]"""
+
+    def __init__(self, process_noise, measurement_noise, angle=False, gate_sigma=4.0, max_rejects=5):
+        self.q = process_noise  # 加速度噪声谱密度
+        self.r = measurement_noise  # 测量方差
+        self.angle = angle
+        self.gate_sigma = gate_sigma  # 新息超过 gate_sigma 倍标准差视为野值
+        self.max_rejects = max_rejects  # 连续拒绝次数超过此值后重新初始化
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.v = 0.0
+        self.p00, self.p01, self.p11 = 0.0, 0.0, 0.0
+        self.rejects = 0
+
+    def predict(self, dt):
+        if self.x is None or dt <= 0:
+            return
+        self.x += self.v * dt
+        if self.angle:
+            self.x = wrap_angle(self.x)
+        dt2 = dt * dt
+        p00 = self.p00 + 2 * dt * self.p01 + dt2 * self.p11 + self.q * dt2 * dt2 / 4
+        p01 = self.p01 + dt * self.p11 + self.q * dt2 * dt / 2
+        p11 = self.p11 + self.q * dt2
+        self.p00, self.p01, self.p11 = p00, p01, p11
+
+    def update(self, z):
+        if self.x is None:
+            self.x = wrap_angle(z) if self.angle else z
+            self.v = 0.0
+            self.p00, self.p01, self.p11 = self.r, 0.0, self.r
+            return self.x
+
+        y = z - self.x
+        if self.angle:
+            y = wrap_angle(y)
+        s = self.p00 + self.r
+
+        if self.gate_sigma and y * y > self.gate_sigma * self.gate_sigma * s:
+            self.rejects += 1
+            if self.rejects > self.max_rejects:
+                # 目标真的跳变了（如换人、遮挡恢复），重新初始化
+                self.reset()
+                return self.update(z)
+            return self.x
+        self.rejects = 0
+
+        k0 = self.p00 / s
+        k1 = self.p01 / s
+        self.x += k0 * y
+        if self.angle:
+            self.x = wrap_angle(self.x)
+        self.v += k1 * y
+        p00 = (1 - k0) * self.p00
+        p01 = (1 - k0) * self.p01
+        p11 = self.p11 - k1 * self.p01
+        self.p00, self.p01, self.p11 = p00, p01, p11
+        return self.x
+
+
+class UwbKalmanFilter:
+    """距离 + 方位角卡尔曼滤波"""
+
+    def __init__(self, distance_process_noise=1.0, distance_measurement_noise=0.05,
+                 azimuth_process_noise=400.0, azimuth_measurement_noise=25.0, gate_sigma=4.0):
+        self.distance = _ConstantVelocityKalman(distance_process_noise, distance_measurement_noise,
+                                                gate_sigma=gate_sigma)
+        self.azimuth = _ConstantVelocityKalman(azimuth_process_noise, azimuth_measurement_noise,
+                                               angle=True, gate_sigma=gate_sigma)
+        self.last_timestamp = None
+
+    def reset(self):
+        self.distance.reset()
+        self.azimuth.reset()
+        self.last_timestamp = None
+
+    def update(self, distance, azimuth, timestamp):
+        """返回滤波后的 (距离, 方位角)"""
+        if self.last_timestamp is not None:
+            dt = timestamp - self.last_timestamp
+            self.distance.predict(dt)
+            self.azimuth.predict(dt)
+        self.last_timestamp = timestamp
+        return self.distance.update(distance), self.azimuth.update(azimuth)
+
+
+class UwbFilter:
+    """UWB组合滤波：滑动中位数去野值，再经卡尔曼平滑"""
+
+    def __init__(self, median_window=5, kalman=True):
+        self.distance_median = SlidingMedian(median_window)
+        self.azimuth_median = SlidingMedian(median_window)
+        self.kalman = UwbKalmanFilter() if kalman else None
+        self.distance = None
+        self.azimuth = None
+
+    def reset(self):
+        self.distance_median.reset()
+        self.azimuth_median.reset()
+        if self.kalman:
+            self.kalman.reset()
+        self.distance = None
+        self.azimuth = None
+
+    def update(self, distance, azimuth, timestamp):
+        """
+        加入一个UWB样本
+
+        返回:
+        (距离, 方位角)，样本无效时返回上一次的估计
+        """
+        if distance is None or azimuth is None or distance <= 0:
+            return self.distance, self.azimuth
+
+        # 方位角先展开到上一次估计附近，避免在 ±180° 处取中位数出错
+        reference = self.azimuth if self.azimuth is not None else azimuth
+        azimuth = reference + wrap_angle(azimuth - reference)
+
+        distance = self.distance_median.update(distance)
+        azimuth = wrap_angle(self.azimuth_median.update(azimuth))
+
+        if self.kalman:
+            distance, azimuth = self.kalman.update(distance, azimuth, timestamp)
+
+        self.distance, self.azimuth = distance, azimuth
+        return distance, azimuth
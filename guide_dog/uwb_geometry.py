@@ -0,0 +1,116 @@
+import math
+
+import numpy as np
+
+"""
+UWB目标点坐标变换
+
+把UWB测量（距离、方位角）从机器狗坐标系变换到地图坐标系：
+- calculate_target_positions: 批量向量化计算，一次处理多组位姿和UWB样本
+- calculate_target_position_2d: 标量二维快速计算（roll/pitch 近似为0时使用）
+- calculate_target_pose: 单个样本的字典接口，自动选择二维快速路径
+
+旋转与 scipy 的 Rotation.from_euler('xyz', [roll, pitch, yaw]) 一致（外旋，R = Rz·Ry·Rx），
+但直接用NumPy构造，不再依赖 scipy。方位角单位为度，其余为弧度/米。
+"""
+
+FLAT_TOLERANCE = 1e-3  # roll/pitch 小于该值（弧度）时按平面处理
+
+
+def rotation_matrices(roll, pitch, yaw):
+    """
+    批量构造旋转矩阵
+
+    参数:
+    roll, pitch, yaw: 形状相同的数组（弧度）
+
+    返回:
+    numpy.ndarray: shape=(..., 3, 3)
+    """
+    roll, pitch, yaw = np.broadcast_arrays(
+        np.asarray(roll, dtype=np.float64),
+        np.asarray(pitch, dtype=np.float64),
+        np.asarray(yaw, dtype=np.float64),
+    )
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+
+    matrices = np.empty(roll.shape + (3, 3), dtype=np.float64)
+    matrices[..., 0, 0] = cy * cp
+    matrices[..., 0, 1] = cy * sp * sr - sy * cr
+    matrices[..., 0, 2] = cy * sp * cr + sy * sr
+    matrices[..., 1, 0] = sy * cp
+    matrices[..., 1, 1] = sy * sp * sr + cy * cr
+    matrices[..., 1, 2] = sy * sp * cr - cy * sr
+    matrices[..., 2, 0] = -sp
+    matrices[..., 2, 1] = cp * sr
+    matrices[..., 2, 2] = cp * cr
+    return matrices
+
+
+def calculate_target_positions(robot_poses, distances, azimuths):
+    """
+    批量计算目标点在世界坐标系中的坐标
+
+    参数:
+    robot_poses: shape=(N, 6) 或 (6,)，每行为 [x, y, z, roll, pitch, yaw]，单个位姿会广播到全部样本
+    distances: shape=(N,) UWB距离（米）
+    azimuths: shape=(N,) UWB方位角（度）
+
+    返回:
+    numpy.ndarray: shape=(N, 3) 目标点坐标 [x, y, z]
+    """
+    robot_poses = np.asarray(robot_poses, dtype=np.float64)
+    distances = np.asarray(distances, dtype=np.float64)
+    azimuths = np.radians(np.asarray(azimuths, dtype=np.float64))
+    robot_poses = np.broadcast_to(robot_poses, distances.shape + (6,))
+
+    # UWB坐标系中的点（假设目标点与UWB在同一水平面）
+    points = np.stack((distances * np.cos(azimuths),
+                       distances * np.sin(azimuths),
+                       np.zeros_like(distances)), axis=-1)
+
+    rotations = rotation_matrices(robot_poses[..., 3], robot_poses[..., 4], robot_poses[..., 5])
+    return np.einsum("...ij,...j->...i", rotations, points) + robot_poses[..., :3]
+
+
+def calculate_target_position_2d(robot_x, robot_y, robot_yaw, distance, azimuth):
+    """平面情况下的标量快速计算，返回 (x, y)"""
+    angle = robot_yaw + math.radians(azimuth)
+    return robot_x + distance * math.cos(angle), robot_y + distance * math.sin(angle)
+
+
+def pose_to_array(robot_pose):
+    """位姿字典 -> [x, y, z, roll, pitch, yaw]"""
+    return [robot_pose["x"], robot_pose["y"], robot_pose["z"],
+            robot_pose["roll"], robot_pose["pitch"], robot_pose["yaw"]]
+
+
+def calculate_target_pose(robot_pose, uwb_data, flat_tolerance=FLAT_TOLERANCE):
+    """
+    计算目标点在世界坐标系中的位姿。
+
+    Args:
+        robot_pose (dict): 机器狗的位姿，包含 x, y, z, roll, pitch, yaw。
+        uwb_data (dict): UWB 测量数据，包含 distance (距离), azimuth (方位角)。
+
+    Returns:
+        dict: 目标点在世界坐标系中的坐标 {"x", "y", "z", "frame_id"}。
+    """
+    distance = uwb_data["distance"]
+    azimuth = uwb_data["azimuth"]
+
+    if abs(robot_pose["roll"]) < flat_tolerance and abs(robot_pose["pitch"]) < flat_tolerance:
+        x, y = calculate_target_position_2d(robot_pose["x"], robot_pose["y"], robot_pose["yaw"],
+                                            distance, azimuth)
+        z = robot_pose["z"]
+    else:
+        x, y, z = calculate_target_positions(pose_to_array(robot_pose), distance, azimuth)
+
+    return {
+        "x": float(x),
+        "y": float(y),
+        "z": float(z),
+        "frame_id": "map"
+    }
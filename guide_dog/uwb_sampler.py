@@ -0,0 +1,147 @@
+import threading
+import time
+
+import numpy as np
+
+from http_client import get_client, ROBOT_SDK_BASE_URL
+
+"""
+UWB后台采集
+
+UwbSampler 在独立线程中按UWB的原生频率轮询 /signalservice/uwb，
+写入固定大小的NumPy环形缓冲区（每行: 时间戳、距离、方位角）。
+引路控制、跟随控制、Gradio状态页等多个使用方共享同一数据流，
+只读取最新值或一段窗口，不自己发HTTP请求，也不会被采集阻塞。
+
+只有采集线程写缓冲区：先写入一行，再递增计数发布；读取方不加锁，
+读取后再次检查计数，丢弃在读取过程中被覆盖的旧数据。
+"""
+
+UWB_ENDPOINT = "/signalservice/uwb"
+
+
+class UwbSampler:
+    """UWB采集线程 + 最新值环形缓冲区"""
+
+    def __init__(self, poll_interval=0.02, capacity=1024, base_url=ROBOT_SDK_BASE_URL):
+        self.poll_interval = poll_interval  # 采集周期（秒），默认50Hz
+        self.capacity = capacity
+        self.client = get_client(base_url)
+
+        self.buffer = np.zeros((capacity, 3), dtype=np.float64)  # [时间戳, 距离, 方位角]
+        self._count = 0  # 累计写入的样本数
+        self.error_count = 0
+        self.last_error = None
+
+        self._running = False
+        self._thread = None
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def is_running(self):
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="uwb_sampler")
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _run(self):
+        next_time = time.monotonic()
+        while self._running:
+            try:
+                response = self.client.get(UWB_ENDPOINT)
+                data = response.json().get("data") or {}
+                distance = data.get("distance")
+                azimuth = data.get("azimuth")
+                if distance is not None and azimuth is not None and distance > 0:
+                    self.push(time.monotonic(), distance, azimuth)
+            except Exception as e:
+                self.error_count += 1
+                if str(e) != self.last_error:
+                    print(f"UWB采集失败: {e}")
+                self.last_error = str(e)
+
+            next_time += self.poll_interval
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_time = time.monotonic()
+
+    def push(self, timestamp, distance, azimuth):
+        """写入一个样本（仅采集线程调用，也可用于回放/模拟）"""
+        self.buffer[self._count % self.capacity] = (timestamp, distance, azimuth)
+        self._count += 1
+
+    def latest(self):
+        """最新样本 (时间戳, 距离, 方位角)，没有数据时返回None"""
+        count = self._count
+        if count == 0:
+            return None
+        row = self.buffer[(count - 1) % self.capacity]
+        timestamp, distance, azimuth = float(row[0]), float(row[1]), float(row[2])
+        return timestamp, distance, azimuth
+
+    def read_since(self, cursor):
+        """
+        读取游标之后的新样本
+
+        返回:
+        (新游标, 样本数组 shape=(n, 3))，读取方保存新游标供下次使用
+        """
+        count = self._count
+        start = max(cursor, count - self.capacity)
+        rows = self._copy_range(start, count)
+
+        # 复制期间被覆盖的行丢弃
+        overwritten = self._count - self.capacity - start
+        if overwritten > 0:
+            rows = rows[overwritten:]
+        return count, rows
+
+    def window(self, size=None, seconds=None):
+        """最近 size 个样本，或最近 seconds 秒内的样本（按时间顺序）"""
+        count = self._count
+        size = self.capacity if size is None else min(size, self.capacity)
+        _, rows = self.read_since(max(0, count - size))
+        if seconds is not None and len(rows):
+            rows = rows[rows[:, 0] >= rows[-1, 0] - seconds]
+        return rows
+
+    def sample_rate(self, seconds=2.0):
+        """最近一段时间的实际采样频率（Hz）"""
+        rows = self.window(seconds=seconds)
+        if len(rows) < 2:
+            return 0.0
+        span = rows[-1, 0] - rows[0, 0]
+        return (len(rows) - 1) / span if span > 0 else 0.0
+
+    def _copy_range(self, start, end):
+        # 花式索引会复制数据，环形回绕也一并处理
+        return self.buffer[np.arange(start, end) % self.capacity]
+
+
+_default_sampler = None
+_default_sampler_lock = threading.Lock()
+
+
+def get_uwb_sampler():
+    """获取进程内共享的UWB采集器（首次调用时启动）"""
+    global _default_sampler
+    with _default_sampler_lock:
+        if _default_sampler is None:
+            _default_sampler = UwbSampler()
+        _default_sampler.start()
+    return _default_sampler
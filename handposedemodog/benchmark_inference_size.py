@@ -0,0 +1,104 @@
+import argparse
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+
+from gesture_core.letterbox import Letterbox
+from gesture_core.recognizer import DEFAULT_MODEL_PATH
+
+"""
+识别输入尺寸基准测试
+
+从视频文件、摄像头或RTSP地址采集一段帧，对每个识别输入尺寸（letterbox边长）
+用 IMAGE 模式同步识别同一组帧，输出每帧识别耗时（平均/p50/p95）和检出手的比例，
+用于选择 GradioGestureRecognizer 的 inference_size。
+
+用法:
+python benchmark_inference_size.py --source 0
+python benchmark_inference_size.py --source rtsp://... --frames 200 --sizes 0 480 320 256
+（尺寸 0 表示用原帧识别）
+"""
+
+
+def collect_frames(source, count):
+    """采集 count 帧（镜像翻转的RGB）"""
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    if not cap.isOpened():
+        raise RuntimeError(f"无法打开视频源 {source}")
+
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame = cv2.flip(frame, 1)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def benchmark_size(recognizer, frames, size, warmup=5):
+    """返回 (每帧耗时数组(ms), 检出手的帧比例)"""
+    letterbox = Letterbox(size) if size else None
+    latencies = []
+    detected = 0
+
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        inference_frame = letterbox.apply(frame) if letterbox else frame
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=inference_frame)
+        result = recognizer.recognize(mp_image)
+        elapsed = (time.perf_counter() - start) * 1000
+        if i < warmup:
+            continue
+        latencies.append(elapsed)
+        if result.hand_landmarks:
+            detected += 1
+
+    measured = max(1, len(frames) - warmup)
+    return np.array(latencies), detected / measured
+
+
+def main():
+    parser = argparse.ArgumentParser(description="手势识别输入尺寸基准测试")
+    parser.add_argument("--source", default="0", help="视频文件、摄像头编号或RTSP地址")
+    parser.add_argument("--frames", type=int, default=150, help="采集的帧数")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 640, 480, 320, 256, 192],
+                        help="识别输入边长，0 表示原帧")
+    parser.add_argument("--num-hands", type=int, default=1)
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    args = parser.parse_args()
+
+    frames = collect_frames(args.source, args.frames)
+    if not frames:
+        print("没有采集到帧")
+        return
+    height, width = frames[0].shape[:2]
+    print(f"采集 {len(frames)} 帧，原始尺寸 {width}x{height}")
+
+    options = vision.GestureRecognizerOptions(
+        base_options=python.BaseOptions(model_asset_path=args.model),
+        running_mode=vision.RunningMode.IMAGE,
+        num_hands=args.num_hands
+    )
+
+    print(f"{'输入尺寸':>10} {'平均(ms)':>10} {'p50(ms)':>10} {'p95(ms)':>10} {'检出率':>8}")
+    for size in args.sizes:
+        # 每个尺寸用新的识别器，避免跟踪状态影响结果
+        with vision.GestureRecognizer.create_from_options(options) as recognizer:
+            latencies, detection_rate = benchmark_size(recognizer, frames, size)
+        label = f"{width}x{height}" if not size else f"{size}x{size}"
+        if len(latencies) == 0:
+            print(f"{label:>10} 帧数不足")
+            continue
+        print(f"{label:>10} {latencies.mean():>10.1f} {np.percentile(latencies, 50):>10.1f} "
+              f"{np.percentile(latencies, 95):>10.1f} {detection_rate:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
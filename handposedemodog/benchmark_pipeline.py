@@ -0,0 +1,223 @@
+import argparse
+import itertools
+import json
+import platform
+import resource
+import sys
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from gesture_core import (
+    FfmpegSource, FirstHandSelector, GradioGestureRecognizer, LargestHandSelector, MotionGate, VideoFileSource
+)
+from gesture_core.recognizer import DEFAULT_MODEL_PATH
+from sdk_stub import StubSdkServer
+
+"""
+手势识别全流程离线基准测试
+
+不需要摄像头、RTSP服务和机器狗：录制的视频文件（或合成帧）经帧来源、抓帧线程、
+识别（VIDEO 或 LIVE_STREAM 模式）、控制手选择、滤波、绘制和动作映射，速度指令发到本机的 sdk 服务桩
+（sdk_stub.StubSdkServer，监听 localhost:18080 代替真实 sdk 服务）。
+
+对来源 × 识别模式 × frame_skip_interval × 识别输入尺寸的每种组合运行一次，结果写入JSON文件：
+处理帧率、丢帧、CPU占用、各阶段延迟（p50/p95/p99）、识别提交统计和 move 请求数，用于比较参数和 mediapipe 版本的回归。
+
+用法:
+python benchmark_pipeline.py --video hall.mp4 --sources opencv ffmpeg --modes video live_stream
+python benchmark_pipeline.py --synthetic 1280x720 --frames 600 --frame-skip 1 2 --output result.json
+"""
+
+
+class SyntheticSource:
+    """合成帧来源（移动的色块），不依赖视频文件；接口与 gesture_core.sources 中的来源一致"""
+
+    name = "合成帧"
+
+    def __init__(self, width=640, height=480, frames=300, fps=None, variants=16):
+        self.width = width
+        self.height = height
+        self.frames = frames
+        self.frame_interval = 1.0 / fps if fps else 0.0  # 0 表示尽快产生
+        self.variants = variants
+        self.frames_read = 0
+        self._images = None
+        self._start_time = None
+
+    def describe(self):
+        return f"{self.name} {self.width}x{self.height} x{self.frames}"
+
+    def open(self):
+        self.frames_read = 0
+        self._start_time = None
+        gradient = np.linspace(0, 255, self.width, dtype=np.uint8)
+        self._images = []
+        for i in range(self.variants):
+            image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            image[:] = gradient[np.newaxis, :, np.newaxis]
+            x = (i * self.width // self.variants) % max(1, self.width - 100)
+            cv2.rectangle(image, (x, self.height // 3), (x + 100, self.height // 3 + 100), (40, 160, 220), -1)
+            self._images.append(image)
+
+    def read_raw(self):
+        if self._images is None or self.frames_read >= self.frames:
+            return False, None
+        if self.frame_interval:
+            if self._start_time is None:
+                self._start_time = time.monotonic()
+            delay = self._start_time + self.frames_read * self.frame_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        frame = self._images[self.frames_read % self.variants]
+        self.frames_read += 1
+        return True, frame
+
+    def to_rgb(self, frame):
+        frame = cv2.flip(frame, 1)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        return frame
+
+    def release(self, frame):
+        pass
+
+    def read(self):
+        ret, frame = self.read_raw()
+        return (True, self.to_rgb(frame)) if ret else (False, None)
+
+    def reconnect(self):
+        return False
+
+    def close(self):
+        self._images = None
+
+
+def make_source(kind, args):
+    if kind == "synthetic":
+        width, height = (int(v) for v in args.synthetic.lower().split("x"))
+        return SyntheticSource(width, height, args.frames, fps=30 if args.realtime else None)
+    if kind == "opencv":
+        return VideoFileSource(args.video, realtime=args.realtime)
+    if kind == "ffmpeg":
+        return FfmpegSource(url=args.video, max_reconnect_attempts=0)
+    raise ValueError(f"未知来源: {kind}")
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_case(kind, mode, frame_skip, inference_size, args, stub):
+    selector = LargestHandSelector() if args.selector == "largest" else FirstHandSelector()
+    recognizer = GradioGestureRecognizer(
+        source=make_source(kind, args),
+        selector=selector,
+        num_hands=args.num_hands,
+        frame_skip_interval=frame_skip,
+        model_path=args.model,
+        inference_size=inference_size or None,
+        video_mode=mode == "video",
+        motion_gate=MotionGate() if args.motion_gate else False,
+    )
+    if args.preview:
+        recognizer.preview.add_viewer()  # 虚拟观看者，把预览JPEG编码计入测试
+    recognizer.toggle_robot_control()
+    moves_before = stub.move_count
+
+    cpu_start, wall_start = cpu_seconds(), time.monotonic()
+    status = recognizer.start_recognition()[0]
+    if not recognizer.is_running:
+        recognizer.close()
+        return {"error": status}
+    recognizer.camera_thread.join(timeout=args.max_seconds)
+    timed_out = recognizer.camera_thread.is_alive()
+    wall = time.monotonic() - wall_start
+    time.sleep(0.2)  # 等待 LIVE_STREAM 模式最后的回调
+    cpu = cpu_seconds() - cpu_start
+
+    grabber = recognizer.grabber
+    latency = recognizer.metrics.snapshot()
+    result = {
+        "source": recognizer.source.describe(),
+        "frames_processed": recognizer.processed_frames,
+        "frames_grabbed": grabber.frame_count if grabber else 0,
+        "frames_dropped": grabber.dropped_frames if grabber else 0,
+        "results": latency.get("callback", {}).get("count", 0),
+        "wall_seconds": round(wall, 3),
+        "fps": round(recognizer.processed_frames / wall, 2) if wall > 0 else 0.0,
+        "cpu_seconds": round(cpu, 3),
+        "cpu_percent": round(100.0 * cpu / wall, 1) if wall > 0 else 0.0,
+        "move_requests": stub.move_count - moves_before,
+        "governor": recognizer.governor.stats(),
+        "motion_gate": recognizer.motion_gate.stats() if recognizer.motion_gate else None,
+        "timed_out": timed_out,
+        "latency_ms": latency,
+    }
+    recognizer.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="手势识别全流程离线基准测试")
+    parser.add_argument("--video", help="录制的视频文件（opencv / ffmpeg 来源使用）")
+    parser.add_argument("--synthetic", default="640x480", help="合成帧尺寸 宽x高（synthetic 来源使用）")
+    parser.add_argument("--frames", type=int, default=300, help="合成帧数量")
+    parser.add_argument("--sources", nargs="+", choices=["synthetic", "opencv", "ffmpeg"],
+                        help="帧来源，默认有 --video 时为 opencv，否则为 synthetic")
+    parser.add_argument("--modes", nargs="+", choices=["video", "live_stream"], default=["video", "live_stream"])
+    parser.add_argument("--frame-skip", type=int, nargs="+", default=[1, 2], help="frame_skip_interval")
+    parser.add_argument("--inference-sizes", type=int, nargs="+", default=[320], help="识别输入边长，0 表示原帧")
+    parser.add_argument("--num-hands", type=int, default=1)
+    parser.add_argument("--selector", choices=["first", "largest"], default="first")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--realtime", action="store_true",
+                        help="视频文件按原帧率读取、合成帧按30fps产生（默认尽快读取）")
+    parser.add_argument("--preview", action="store_true", help="同时编码预览JPEG")
+    parser.add_argument("--motion-gate", action="store_true", help="启用静止画面门控（默认关闭，结果与不门控可比）")
+    parser.add_argument("--max-seconds", type=float, default=120.0, help="单次运行的最长时间")
+    parser.add_argument("--sdk-latency-ms", type=float, default=0.0, help="sdk服务桩的处理延迟")
+    parser.add_argument("--output", default="benchmark_pipeline.json",
+                        help="结果JSON文件（识别流程的日志打印在标准输出，结果不混在里面）")
+    args = parser.parse_args()
+
+    sources = args.sources or (["opencv"] if args.video else ["synthetic"])
+    if any(kind != "synthetic" for kind in sources) and not args.video:
+        parser.error("opencv / ffmpeg 来源需要 --video")
+
+    stub = StubSdkServer(latency=args.sdk_latency_ms / 1000.0).start()
+    runs = []
+    try:
+        for kind, mode, frame_skip, size in itertools.product(
+                sources, args.modes, args.frame_skip, args.inference_sizes):
+            case = {"source_type": kind, "mode": mode, "frame_skip_interval": frame_skip,
+                    "inference_size": size}
+            print(f"运行: {case}", file=sys.stderr)
+            case.update(run_case(kind, mode, frame_skip, size, args, stub))
+            runs.append(case)
+            if "error" not in case:
+                print(f"  {case['fps']:.1f} FPS, CPU {case['cpu_percent']:.0f}%, "
+                      f"识别结果 {case['results']}, move请求 {case['move_requests']}", file=sys.stderr)
+    finally:
+        stub.stop()
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mediapipe": getattr(mp, "__version__", "unknown"),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+        },
+        "video": args.video,
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
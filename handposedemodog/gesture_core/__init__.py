@@ -0,0 +1,45 @@
+"""
+手势识别公共核心
+
+gradio_gesture_* 脚本只负责选择帧来源、控制手选择策略和界面参数，
+识别、动作映射、绘制和界面都在这里实现，性能优化只需要改一处。
+
+interface（gradio）和 recognizer（mediapipe）在第一次访问其中的名字时才导入，
+只用滤波、节流、门控等纯逻辑模块（以及单元测试）时不需要安装这两个包。
+"""
+
+import importlib
+
+from .decode_options import DecodeOptions, detect_hw_decoders
+from .depth import DEPTH_VIDEO_SOURCES, DepthSnapshotPoller
+from .gesture_filter import GestureFilter
+from .hand_selectors import (
+    FirstHandSelector, LargestHandSelector, NearestDepthHandSelector, calculate_hand_size, get_hand_info,
+    hand_areas, landmarks_to_array
+)
+from .inference_governor import InferenceGovernor
+from .letterbox import Letterbox
+from .metrics import LatencyMetrics
+from .motion_gate import MotionGate
+from .overlay import HandOverlay
+from .preview_stream import PreviewBroadcaster, PreviewServer
+from .sources import (
+    CameraSource, FfmpegSource, RtspSource, VideoFileSource, find_external_camera, get_rtsp_url
+)
+from .velocity_streamer import VelocityStreamer
+
+_LAZY_ATTRIBUTES = {
+    "MULTI_HAND_HELP": "interface",
+    "create_interface": "interface",
+    "launch": "interface",
+    "GradioGestureRecognizer": "recognizer",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
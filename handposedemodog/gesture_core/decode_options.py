@@ -0,0 +1,98 @@
+import functools
+import os
+import shutil
+import subprocess
+
+"""
+RTSP解码参数
+
+手势识别只需要几百像素的输入，全分辨率软件解码H.264是演示中最大的CPU开销。
+DecodeOptions 描述每个视频源的解码方式，由 RtspSource / FfmpegSource 转换为各自的参数：
+- decoder: "auto"（优先硬件）、"software"、"v4l2m2m"（V4L2 M2M，如RK/树莓派）、"vaapi"（Intel/AMD）
+- width / height: 解码后缩放到的尺寸，只给一个时按比例计算另一个
+- fps: 输出帧率上限（抽帧），None 表示不限制
+- keyframes_only: 只解码关键帧（适合低帧率、只需要大致画面的场景）
+
+硬件解码器不可用（未编译进ffmpeg，或启动后一帧都解不出来）时回退到软件解码。
+"""
+
+VAAPI_DEVICE = "/dev/dri/renderD128"
+HW_DECODERS = ("v4l2m2m", "vaapi")
+
+
+@functools.lru_cache(maxsize=1)
+def detect_hw_decoders():
+    """检测本机 ffmpeg 可用的H.264硬件解码方式，按优先级返回"""
+    ffmpeg_path = shutil.which("ffmpeg")
+    if not ffmpeg_path:
+        return ()
+
+    available = []
+    try:
+        decoders = subprocess.run([ffmpeg_path, "-hide_banner", "-decoders"],
+                                  capture_output=True, text=True, timeout=5).stdout
+        if "h264_v4l2m2m" in decoders:
+            available.append("v4l2m2m")
+        hwaccels = subprocess.run([ffmpeg_path, "-hide_banner", "-hwaccels"],
+                                  capture_output=True, text=True, timeout=5).stdout
+        if "vaapi" in hwaccels.split() and os.path.exists(VAAPI_DEVICE):
+            available.append("vaapi")
+    except Exception as e:
+        print(f"检测硬件解码器失败: {e}")
+    return tuple(available)
+
+
+class DecodeOptions:
+    """视频源解码参数"""
+
+    def __init__(self, decoder="auto", width=None, height=None, fps=None, keyframes_only=False):
+        if decoder not in ("auto", "software") + HW_DECODERS:
+            raise ValueError(f"未知的解码器: {decoder}")
+        self.decoder = decoder
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.keyframes_only = keyframes_only
+
+    def __repr__(self):
+        return (f"DecodeOptions(decoder={self.decoder!r}, width={self.width}, height={self.height}, "
+                f"fps={self.fps}, keyframes_only={self.keyframes_only})")
+
+    def resolve_decoder(self):
+        """实际使用的解码器：auto 取第一个可用的硬件解码器，指定的硬件不可用时回退到 software"""
+        available = detect_hw_decoders()
+        if self.decoder == "auto":
+            return available[0] if available else "software"
+        if self.decoder in HW_DECODERS and self.decoder not in available:
+            print(f"硬件解码器 {self.decoder} 不可用，使用软件解码")
+            return "software"
+        return self.decoder
+
+    def output_size(self, source_width, source_height):
+        """缩放后的尺寸（偶数），未设置缩放时返回原尺寸"""
+        width, height = self.width, self.height
+        if width is None and height is None:
+            return source_width, source_height
+        if width is None:
+            width = source_width * height / source_height
+        elif height is None:
+            height = source_height * width / source_width
+        return int(round(width / 2)) * 2, int(round(height / 2)) * 2
+
+    def frame_step(self, source_fps):
+        """按帧率上限抽帧时每隔几帧取一帧"""
+        if not self.fps or not source_fps or source_fps <= self.fps:
+            return 1
+        return max(1, int(round(source_fps / self.fps)))
+
+    def ffmpeg_input_options(self, decoder):
+        """ffmpeg 子进程的输入参数"""
+        options = {}
+        if decoder == "v4l2m2m":
+            options["vcodec"] = "h264_v4l2m2m"
+        elif decoder == "vaapi":
+            options["hwaccel"] = "vaapi"
+            options["hwaccel_device"] = VAAPI_DEVICE
+        if self.keyframes_only:
+            options["skip_frame"] = "nokey"
+        return options
@@ -0,0 +1,109 @@
+import base64
+import threading
+import time
+import warnings
+
+import numpy as np
+
+from robot_sdk import get_robot_client
+
+"""
+外接深度相机（realsense / orbbec）的深度图
+
+sdk 服务的 /signalservice/video/color_depth_snapshot 返回与彩色图对齐的深度图（uint16，毫米）。
+接口单次可能耗时较长，DepthSnapshotPoller 在后台线程按固定间隔抓取，识别回调只读取最近一张，
+不会被 HTTP 请求阻塞。sample_depth 在一组归一化坐标周围的小块内取有效深度的中位数（向量化）。
+"""
+
+# 这些视频源自带深度，可以用深度选择最近的手
+DEPTH_VIDEO_SOURCES = ("realsense", "orbbec")
+
+
+def decode_depth(data):
+    """color_depth_snapshot 返回的 data -> shape=(H, W) 的 uint16 深度图（毫米）"""
+    depth = np.frombuffer(base64.b64decode(data["depth_data"]), dtype=np.uint16)
+    return depth.reshape(int(data["depth_height"]), int(data["depth_width"]))
+
+
+def sample_depth(depth, points, radius=3):
+    """
+    在归一化坐标周围 (2*radius+1)^2 的小块内取深度中位数
+
+    参数:
+    depth: shape=(H, W) 深度图，0 表示无效
+    points: shape=(..., 2) 归一化坐标
+
+    返回:
+    shape=points.shape[:-1] 的深度（毫米，float），小块内没有有效深度时为 NaN
+    """
+    height, width = depth.shape
+    offsets = np.arange(-radius, radius + 1)
+    x = np.rint(points[..., 0] * (width - 1)).astype(np.int32)[..., np.newaxis, np.newaxis] + offsets
+    y = np.rint(points[..., 1] * (height - 1)).astype(np.int32)[..., np.newaxis, np.newaxis] + offsets[:, np.newaxis]
+    patch = depth[np.clip(y, 0, height - 1), np.clip(x, 0, width - 1)].astype(np.float32)
+    patch = patch.reshape(points.shape[:-1] + (len(offsets) ** 2,))
+    patch[patch == 0] = np.nan
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # 全部无效的小块返回 NaN
+        return np.nanmedian(patch, axis=-1)
+
+
+class DepthSnapshotPoller:
+    """
+    后台轮询深度图
+
+    参数:
+    interval: 抓取间隔（秒）
+    max_age: 超过该时间的深度图视为过期（秒）
+    """
+
+    def __init__(self, interval=0.2, max_age=1.0, client=None):
+        self.interval = interval
+        self.max_age = max_age
+        self.client = client
+        self.snapshot_count = 0
+        self.error_count = 0
+
+        self._depth = None
+        self._depth_time = 0.0
+        self._running = False
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True, name="depth_poller")
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def _run(self):
+        client = self.client or get_robot_client()
+        while self._running:
+            start = time.monotonic()
+            try:
+                depth = decode_depth(client.color_depth_snapshot()["data"])
+                self._depth, self._depth_time = depth, time.monotonic()
+                self.snapshot_count += 1
+            except Exception as e:
+                self.error_count += 1
+                if self.error_count % 50 == 1:
+                    print(f"获取深度图失败: {e}")
+            delay = self.interval - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+    def latest(self):
+        """返回最近一张未过期的深度图，没有时返回 None（首次调用时启动轮询线程）"""
+        if not self._running:
+            self.start()
+        if self._depth is None or time.monotonic() - self._depth_time > self.max_age:
+            return None
+        return self._depth
@@ -0,0 +1,97 @@
+import threading
+import time
+
+"""
+最新帧抓取线程
+
+独立线程持续从帧来源读取，只在单槽邮箱里保留最新的一帧；
+处理线程每次取走最新帧，处理跟不上解码时旧帧直接被覆盖（计入丢帧数），
+不会在缓冲区里堆积，画面延迟不随处理耗时累积。
+被覆盖的帧通过 source.release() 归还，来源可以复用其缓冲区。
+
+抓取线程只做读取/解码，镜像和颜色转换在处理线程中对被取走的帧进行，
+被覆盖的帧不浪费转换的CPU。
+"""
+
+
+class LatestFrameGrabber:
+    """单槽邮箱抓帧线程"""
+
+    def __init__(self, source):
+        self.source = source
+        self.frame_count = 0  # 读取到的帧数
+        self.dropped_frames = 0  # 未被取走就被新帧覆盖的帧数
+        self.ended = False  # 来源读取失败且重连失败
+
+        self._frame = None
+        self._frame_time = 0.0
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self.ended = False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="frame_grabber")
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        self.discard()
+
+    def _run(self):
+        while self._running:
+            try:
+                ret, frame = self.source.read_raw()
+            except Exception as e:
+                print(f"读取视频流出错: {e}")
+                ret, frame = False, None
+
+            if not ret:
+                if not self._running:
+                    break
+                print(f"{self.source.name}读取失败，尝试重连...")
+                if self.source.reconnect():
+                    continue
+                break
+
+            with self._condition:
+                if self._frame is not None:
+                    self.dropped_frames += 1
+                    self.source.release(self._frame)  # 被覆盖的帧缓冲区归还来源
+                self._frame = frame
+                self._frame_time = time.monotonic()
+                self.frame_count += 1
+                self._condition.notify()
+
+        with self._condition:
+            self.ended = True
+            self._condition.notify_all()
+
+    def discard(self):
+        """丢弃邮箱中未取走的帧"""
+        with self._condition:
+            if self._frame is not None:
+                self.source.release(self._frame)
+                self._frame = None
+
+    def take(self, timeout=1.0):
+        """
+        取走最新帧，没有新帧时最多等待 timeout 秒
+
+        返回:
+        (帧, 抓取时刻)，超时或来源已结束时返回 (None, None)
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._frame is not None or self.ended or not self._running, timeout)
+            frame, frame_time = self._frame, self._frame_time
+            self._frame = None
+        if frame is None:
+            return None, None
+        return frame, frame_time
@@ -0,0 +1,116 @@
+from collections import Counter, deque
+
+import numpy as np
+
+"""
+手势时间滤波
+
+单帧识别结果会闪烁（手势类别、手性、置信度在相邻帧间跳变），直接映射为动作会发出大量多余的移动指令。
+GestureFilter 按手跟踪（相邻帧手腕位置最近的手视为同一只手），每只手保留最近 window 帧的投票：
+- 投票值为 (手势名, 手性)，置信度不够时投 None（无手势）
+- 置信度滞回：切换到新手势需要 enter_confidence，保持当前手势只需 exit_confidence
+- 窗口内同一投票达到 min_votes 票才成为稳定手势
+- 稳定手势至少保持 hold_time 秒才允许再变化
+"""
+
+
+class _HandTrack:
+    def __init__(self, wrist, window, now):
+        self.wrist = wrist
+        self.votes = deque(maxlen=window)
+        self.stable = None  # 稳定手势 (手势名, 手性) 或 None
+        self.stable_since = float("-inf")  # 新出现的手不受保持时间限制
+        self.last_seen = now
+
+
+class GestureFilter:
+    """
+    按手的 N-of-M 投票 + 置信度滞回 + 保持时间
+
+    参数:
+    window: 投票窗口帧数（M）
+    min_votes: 成为稳定手势所需票数（N）
+    enter_confidence: 切换到新手势所需的最小置信度
+    exit_confidence: 保持当前稳定手势所需的最小置信度
+    hold_time: 稳定手势变化后至少保持的时间（秒）
+    match_distance: 相邻帧手腕距离（归一化坐标）小于该值视为同一只手
+    track_timeout: 手消失超过该时间（秒）后丢弃其跟踪状态
+    """
+
+    def __init__(self, window=5, min_votes=3, enter_confidence=0.6, exit_confidence=0.4,
+                 hold_time=0.3, match_distance=0.15, track_timeout=0.5):
+        if not 0 < min_votes <= window:
+            raise ValueError("需要 0 < min_votes <= window")
+        self.window = window
+        self.min_votes = min_votes
+        self.enter_confidence = enter_confidence
+        self.exit_confidence = exit_confidence
+        self.hold_time = hold_time
+        self.match_distance = match_distance
+        self.track_timeout = track_timeout
+        self.tracks = []
+        self.changes = 0  # 稳定手势变化次数
+
+    def reset(self):
+        self.tracks = []
+
+    def _match_tracks(self, wrists, now):
+        """按手腕位置把本帧的手对应到已有跟踪，返回每只手的跟踪对象"""
+        self._expire(now)
+        matched = [None] * len(wrists)
+        if self.tracks and len(wrists):
+            previous = np.array([track.wrist for track in self.tracks])
+            distances = np.linalg.norm(wrists[:, np.newaxis] - previous[np.newaxis], axis=2)
+            # 贪心匹配：距离从小到大，每个跟踪最多匹配一只手
+            used = set()
+            for flat_idx in np.argsort(distances, axis=None):
+                hand_idx, track_idx = np.unravel_index(flat_idx, distances.shape)
+                if distances[hand_idx, track_idx] > self.match_distance:
+                    break
+                if matched[hand_idx] is not None or track_idx in used:
+                    continue
+                matched[hand_idx] = self.tracks[track_idx]
+                used.add(track_idx)
+
+        for hand_idx, track in enumerate(matched):
+            if track is None:
+                track = _HandTrack(wrists[hand_idx], self.window, now)
+                self.tracks.append(track)
+                matched[hand_idx] = track
+            track.wrist = wrists[hand_idx]
+            track.last_seen = now
+        return matched
+
+    def _vote(self, track, gesture, confidence):
+        if gesture is None:
+            return None
+        threshold = self.exit_confidence if gesture == track.stable else self.enter_confidence
+        return gesture if confidence >= threshold else None
+
+    def update(self, landmarks, gestures, now):
+        """
+        输入一帧结果，返回每只手的稳定手势列表
+
+        参数:
+        landmarks: shape=(N, 21, 2) 关键点数组（用手腕位置跟踪）
+        gestures: 长度 N，每只手的 ((手势名, 手性) 或 None, 置信度)
+        """
+        if len(landmarks) == 0:
+            self._expire(now)
+            return []
+        tracks = self._match_tracks(landmarks[:, 0], now)
+
+        stable = []
+        for track, (gesture, confidence) in zip(tracks, gestures):
+            track.votes.append(self._vote(track, gesture, confidence))
+            winner, votes = Counter(track.votes).most_common(1)[0]
+            if (votes >= self.min_votes and winner != track.stable
+                    and now - track.stable_since >= self.hold_time):
+                track.stable = winner
+                track.stable_since = now
+                self.changes += 1
+            stable.append(track.stable)
+        return stable
+
+    def _expire(self, now):
+        self.tracks = [track for track in self.tracks if now - track.last_seen <= self.track_timeout]
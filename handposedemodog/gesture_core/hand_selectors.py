@@ -0,0 +1,156 @@
+import warnings
+
+import numpy as np
+
+from .depth import DepthSnapshotPoller, sample_depth
+
+"""
+控制手选择策略
+
+MediaPipe 一帧可能识别出多只手，选择器决定用哪一只手控制机器狗：
+- FirstHandSelector: 第一只手（num_hands=1 时的原有行为）
+- LargestHandSelector: 关键点边界框面积最大的手（最靠近摄像头）
+- NearestDepthHandSelector: 深度最近的手（需要 realsense / orbbec 对齐深度图），没有深度时退回最大的手
+
+select(result, landmarks) 返回被选中手的索引，没有手时返回 None；
+landmarks 为 landmarks_to_array 转换后的 (N, 21, 2) 数组，每个结果只转换一次。
+"""
+
+
+# 取深度的关键点：手腕和四个掌指关节（手掌部分，不受手指弯曲影响）
+PALM_LANDMARKS = [0, 5, 9, 13, 17]
+
+
+def landmarks_to_array(result):
+    """识别结果中的关键点 -> shape=(N, 21, 2) 的归一化坐标数组"""
+    if not result.hand_landmarks:
+        return np.empty((0, 21, 2), dtype=np.float32)
+    return np.array([[(landmark.x, landmark.y) for landmark in hand_landmarks]
+                     for hand_landmarks in result.hand_landmarks], dtype=np.float32)
+
+
+def hand_areas(landmarks):
+    """每只手关键点边界框的面积（归一化坐标），shape=(N,)"""
+    if len(landmarks) == 0:
+        return np.empty(0, dtype=np.float32)
+    extent = landmarks.max(axis=1) - landmarks.min(axis=1)
+    return extent[:, 0] * extent[:, 1]
+
+
+def calculate_hand_size(hand_landmarks):
+    """计算单只手的大小（基于关键点的边界框面积，归一化坐标），参数为 (21, 2) 数组"""
+    if len(hand_landmarks) == 0:
+        return 0
+    return float(hand_areas(np.asarray(hand_landmarks)[np.newaxis])[0])
+
+
+def get_hand_info(result, hand_idx):
+    """
+    读取指定手的手势和手性
+
+    返回:
+    (手势名, 置信度, 手性标签, 手性置信度)，缺失的项为 None / 0.0
+    """
+    gesture_name = None
+    confidence = 0.0
+    hand_label = None
+    hand_score = 0.0
+
+    if hand_idx is None:
+        return gesture_name, confidence, hand_label, hand_score
+
+    if result.gestures and len(result.gestures) > hand_idx and result.gestures[hand_idx]:
+        gesture_name = result.gestures[hand_idx][0].category_name
+        confidence = result.gestures[hand_idx][0].score
+
+    if result.handedness and len(result.handedness) > hand_idx and result.handedness[hand_idx]:
+        hand_label = result.handedness[hand_idx][0].category_name
+        # 翻转手性标签（因为图像是翻转的）
+        if hand_label == "Left":
+            hand_label = "Right"  # 翻转后的左手实际是右手
+        elif hand_label == "Right":
+            hand_label = "Left"   # 翻转后的右手实际是左手
+        hand_score = result.handedness[hand_idx][0].score
+
+    return gesture_name, confidence, hand_label, hand_score
+
+
+class FirstHandSelector:
+    """使用识别结果中的第一只手"""
+
+    name = "first"
+
+    def select(self, result, landmarks):
+        if len(landmarks) == 0:
+            return None
+        return 0
+
+
+class LargestHandSelector:
+    """使用最大的手（最靠近摄像头的手）"""
+
+    name = "largest"
+
+    def select(self, result, landmarks):
+        if len(landmarks) == 0:
+            return None
+        return int(np.argmax(hand_areas(landmarks)))
+
+
+class NearestDepthHandSelector:
+    """
+    使用深度最近的手
+
+    在手腕和掌指关节周围的小块内取深度中位数，再取这几个点的中位数作为手的距离，
+    选距离在 [min_range, max_range] 内最近的手。边界框面积会把远处的大手选在近处的小手前面，
+    深度不会。没有可用深度（深度图未就绪/过期、全部超出范围）时使用 fallback。
+
+    参数:
+    depth_provider: 提供 latest() -> 深度图 (H, W) uint16 毫米 或 None，默认 DepthSnapshotPoller
+    min_range / max_range: 有效距离范围（毫米）
+    patch_radius: 每个关键点取深度的小块半径（像素）
+    mirrored: 显示帧是否已水平镜像（深度图未镜像）
+    fallback: 没有深度时的选择器，默认 LargestHandSelector
+    """
+
+    name = "depth"
+
+    def __init__(self, depth_provider=None, min_range=300, max_range=3000, patch_radius=3,
+                 mirrored=True, fallback=None):
+        self.depth_provider = depth_provider or DepthSnapshotPoller()
+        self.min_range = min_range
+        self.max_range = max_range
+        self.patch_radius = patch_radius
+        self.mirrored = mirrored
+        self.fallback = fallback or LargestHandSelector()
+        self.last_distances = None  # 最近一次每只手的距离（毫米），便于调试
+
+    def hand_distances(self, landmarks, depth):
+        """每只手的距离（毫米），shape=(N,)，没有有效深度的手为 NaN"""
+        points = landmarks[:, PALM_LANDMARKS]
+        if self.mirrored:
+            points = points.copy()
+            points[..., 0] = 1.0 - points[..., 0]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return np.nanmedian(sample_depth(depth, points, self.patch_radius), axis=1)
+
+    def close(self):
+        """停止识别时调用：停止深度图轮询（下次 select 时重新启动）"""
+        stop = getattr(self.depth_provider, "stop", None)
+        if stop is not None:
+            stop()
+
+    def select(self, result, landmarks):
+        if len(landmarks) == 0:
+            return None
+        depth = self.depth_provider.latest()
+        if depth is None:
+            return self.fallback.select(result, landmarks)
+
+        distances = self.hand_distances(landmarks, depth)
+        self.last_distances = distances
+        in_range = (distances >= self.min_range) & (distances <= self.max_range)
+        if not in_range.any():
+            return self.fallback.select(result, landmarks)
+        return int(np.argmin(np.where(in_range, distances, np.inf)))
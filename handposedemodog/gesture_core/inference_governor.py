@@ -0,0 +1,122 @@
+import threading
+
+"""
+识别提交节流
+
+LIVE_STREAM 模式下 recognize_async 不等上一帧识别完成就提交下一帧，CPU 紧张时 MediaPipe 内部排队或静默丢帧，
+识别延迟不可控。InferenceGovernor 在提交前做两个判断：
+- 单飞：上一次提交还没有回调（且未超时）时不提交，识别中的帧最多一个
+- 自适应间隔：按识别延迟（提交 → 回调）的滑动平均调整每几帧提交一次，
+  超过 latency_budget 时加大间隔，低于 latency_budget × relax_ratio 时减小，范围 [min_interval, max_interval]
+min_interval == max_interval 时间隔固定，只保留单飞（离线基准测试用，结果与给定 frame_skip_interval 可比）。
+时间统一使用 time.monotonic()。
+"""
+
+
+class InferenceGovernor:
+    """
+    单飞 + 自适应跳帧
+
+    参数:
+    min_interval: 最小提交间隔（帧），即原 frame_skip_interval
+    max_interval: 最大提交间隔（帧）
+    latency_budget: 识别延迟目标（秒）
+    relax_ratio: 平均延迟低于 latency_budget × relax_ratio 时才减小间隔（滞回，避免来回跳）
+    smoothing: 延迟滑动平均系数，越大越跟随最新一次
+    adjust_every: 每完成几次识别最多调整一次间隔
+    inflight_timeout: 提交后超过该时间（秒）仍无回调视为丢失，允许再次提交
+    """
+
+    def __init__(self, min_interval=1, max_interval=6, latency_budget=0.1, relax_ratio=0.6,
+                 smoothing=0.2, adjust_every=5, inflight_timeout=1.0):
+        if not 1 <= min_interval <= max_interval:
+            raise ValueError("需要 1 <= min_interval <= max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.latency_budget = latency_budget
+        self.relax_ratio = relax_ratio
+        self.smoothing = smoothing
+        self.adjust_every = adjust_every
+        self.inflight_timeout = inflight_timeout
+
+        self.interval = min_interval  # 当前提交间隔（帧）
+        self.latency = None  # 识别延迟滑动平均（秒）
+        self.submitted = 0
+        self.completed = 0
+        self.busy_skips = 0  # 因上一帧仍在识别而跳过的帧数
+        self.timeouts = 0  # 超时未回调的提交数
+
+        self._counter = 0  # 距上次提交经过的帧数
+        self._pending = None  # 识别中的 (标识, 提交时刻)
+        self._since_adjust = 0
+        self._lock = threading.Lock()
+
+    @property
+    def adaptive(self):
+        return self.max_interval > self.min_interval
+
+    def reset(self):
+        with self._lock:
+            self.interval = self.min_interval
+            self.latency = None
+            self._counter = 0
+            self._pending = None
+            self._since_adjust = 0
+
+    def ready(self, now):
+        """新帧到来时调用，返回这一帧是否提交识别"""
+        with self._lock:
+            self._counter += 1
+            if self._counter < self.interval:
+                return False
+            if self._pending is not None:
+                if now - self._pending[1] < self.inflight_timeout:
+                    self.busy_skips += 1
+                    return False
+                self.timeouts += 1
+                self._pending = None
+            self._counter = 0
+            return True
+
+    def submitted_frame(self, token, now):
+        """记录一次提交（在 recognize_async 之前调用，回调可能先于其返回）"""
+        with self._lock:
+            self._pending = (token, now)
+            self.submitted += 1
+
+    def completed_frame(self, token, submit_time, now):
+        """识别回调时调用，token 为提交时的标识，submit_time 为提交时刻（未知时为 None）"""
+        with self._lock:
+            if self._pending is not None and self._pending[0] == token:
+                self._pending = None
+            self.completed += 1
+            if submit_time is None:
+                return
+            latency = now - submit_time
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+            self._since_adjust += 1
+            if self.adaptive and self._since_adjust >= self.adjust_every:
+                self._adjust()
+
+    def _adjust(self):
+        """按平均延迟调整间隔（调用方持有锁）"""
+        self._since_adjust = 0
+        if self.latency > self.latency_budget and self.interval < self.max_interval:
+            self.interval += 1
+            print(f"识别延迟 {self.latency * 1000:.0f}ms 超过目标，提交间隔调整为每 {self.interval} 帧")
+        elif self.latency < self.latency_budget * self.relax_ratio and self.interval > self.min_interval:
+            self.interval -= 1
+            print(f"识别延迟 {self.latency * 1000:.0f}ms，提交间隔调整为每 {self.interval} 帧")
+
+    def stats(self):
+        return {
+            "interval": self.interval,
+            "latency_ms": round(self.latency * 1000.0, 1) if self.latency is not None else None,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "busy_skips": self.busy_skips,
+            "timeouts": self.timeouts,
+        }
@@ -0,0 +1,194 @@
+import gradio as gr
+
+from .preview_stream import PreviewServer
+
+"""
+手势识别 Gradio 界面（各脚本共用）
+
+视频画面由 PreviewServer 的 MJPEG 流提供，页面用 <img> 嵌入；
+Gradio 定时器只刷新识别结果文本和延迟面板。
+"""
+
+PREVIEW_IMAGE_ID = "gesture-preview"
+
+GESTURE_HELP = """
+**支持的手势控制**:
+- 👆 Pointing_Up → 前进
+- 👇 Thumb_Down → 后退
+- ✋ Open_Palm (左手) → 左移
+- ✋ Open_Palm (右手) → 右移
+- 👊 Closed_Fist (左手) → 左转
+- 👊 Closed_Fist (右手) → 右转
+- ✌️ Victory → 停止
+"""
+
+MULTI_HAND_HELP = """
+**多手识别功能**:
+- 🖐️ 可同时识别最多5只手
+- 🎯 自动选择最大的手（最靠近摄像头）作为控制手
+- 🔴 主控手用红色高亮显示，其他手用绿色显示
+"""
+
+
+def create_interface(gesture_recognizer, heading="🤖 手势识别 + 机器狗控制系统", description="",
+                     preview_port=7871):
+    """
+    创建Gradio界面
+
+    参数:
+    gesture_recognizer: GradioGestureRecognizer 实例
+    heading: 页面标题
+    description: 标题下方的说明（Markdown），显示在手势说明之前
+    preview_port: MJPEG 预览流端口（与页面同一主机）
+    """
+
+    def start_recognition():
+        return gesture_recognizer.start_recognition()
+
+    def stop_recognition():
+        return gesture_recognizer.stop_recognition()
+
+    def toggle_robot_control():
+        enabled = gesture_recognizer.toggle_robot_control()
+        status = "机器狗控制已启用" if enabled else "机器狗控制已禁用"
+        return status, gesture_recognizer.current_robot_action
+
+    def update_display():
+        return gesture_recognizer.get_status_info()
+
+    def update_metrics():
+        return gesture_recognizer.metrics.format_markdown()
+
+    # 预览流地址按浏览器访问页面时用的主机名拼出，局域网其他设备打开页面也能看到画面
+    connect_preview = f"""() => {{
+        const img = document.getElementById("{PREVIEW_IMAGE_ID}");
+        if (img) img.src = `http://${{window.location.hostname}}:{preview_port}/stream.mjpg`;
+    }}"""
+
+    with gr.Blocks(title="手势识别", theme=gr.themes.Soft()) as interface:
+        gr.Markdown(f"# {heading}\n\n{description}\n{GESTURE_HELP}")
+
+        with gr.Row():
+            # 左侧：视频显示
+            with gr.Column(scale=2):
+                gr.Markdown("### 📹 摄像头视频流")
+                gr.HTML(
+                    f'<img id="{PREVIEW_IMAGE_ID}" alt="视频流" '
+                    'style="width: 100%; max-height: 600px; object-fit: contain; background: #000;">'
+                )
+
+            # 右侧：识别结果和控制
+            with gr.Column(scale=1):
+                with gr.Group():
+                    gr.Markdown("### 🎯 识别结果")
+
+                    gesture_output = gr.Textbox(
+                        label="检测到的手势",
+                        value="无手势",
+                        interactive=False,
+                        lines=2
+                    )
+
+                    handedness_output = gr.Textbox(
+                        label="左手/右手",
+                        value="未检测到手",
+                        interactive=False,
+                        lines=2
+                    )
+
+                    robot_action_output = gr.Textbox(
+                        label="🐕 机器狗动作",
+                        value="停止",
+                        interactive=False,
+                        lines=2
+                    )
+
+                with gr.Group():
+                    gr.Markdown("### 🎮 控制面板")
+
+                    start_btn = gr.Button(
+                        "▶️ 开始识别",
+                        variant="primary",
+                        size="lg"
+                    )
+
+                    stop_btn = gr.Button(
+                        "⏹️ 停止识别",
+                        variant="secondary",
+                        size="lg"
+                    )
+
+                    robot_control_btn = gr.Button(
+                        "🐕 启用/禁用机器狗控制",
+                        variant="secondary",
+                        size="lg"
+                    )
+
+                    status_output = gr.Textbox(
+                        label="系统状态",
+                        value="就绪",
+                        interactive=False,
+                        lines=2
+                    )
+
+                    robot_status_output = gr.Textbox(
+                        label="🐕 机器狗状态",
+                        value="机器狗控制已禁用",
+                        interactive=False,
+                        lines=2
+                    )
+
+        with gr.Accordion("⏱️ 延迟统计（最近500个样本）", open=False):
+            metrics_output = gr.Markdown("暂无数据")
+
+        # 按钮事件绑定
+        start_btn.click(
+            fn=start_recognition,
+            outputs=[status_output, gesture_output, handedness_output]
+        )
+
+        stop_btn.click(
+            fn=stop_recognition,
+            outputs=[status_output, gesture_output, handedness_output]
+        )
+
+        robot_control_btn.click(
+            fn=toggle_robot_control,
+            outputs=[robot_status_output, robot_action_output]
+        )
+
+        interface.load(fn=None, js=connect_preview)
+
+        # 画面走预览流，定时器只刷新文本
+        timer = gr.Timer(0.2)
+        timer.tick(
+            fn=update_display,
+            outputs=[gesture_output, handedness_output, robot_action_output]
+        )
+        metrics_timer = gr.Timer(1.0)
+        metrics_timer.tick(fn=update_metrics, outputs=metrics_output)
+
+    return interface
+
+
+def launch(gesture_recognizer, server_name="127.0.0.1", server_port=7870, preview_port=None,
+           **interface_options):
+    """创建界面并启动Gradio应用和预览流服务（默认端口 server_port + 1），退出时释放识别器资源"""
+    preview_port = preview_port or server_port + 1
+    preview_server = PreviewServer(gesture_recognizer.preview, server_name, preview_port,
+                                   metrics=gesture_recognizer.metrics)
+    preview_server.start()
+    interface = create_interface(gesture_recognizer, preview_port=preview_port, **interface_options)
+
+    try:
+        interface.launch(
+            server_name=server_name,
+            server_port=server_port,
+            debug=False
+        )
+    except KeyboardInterrupt:
+        print("\n正在关闭应用...")
+    finally:
+        preview_server.stop()
+        gesture_recognizer.close()
+        print("应用已关闭")
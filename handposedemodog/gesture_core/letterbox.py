@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+
+"""
+识别用小图（letterbox）
+
+显示用原分辨率帧，识别用按比例缩小并补黑边的小图，识别耗时只和模型输入尺寸有关，
+不随摄像头分辨率增长。识别结果的归一化坐标是相对小图的，用 to_display 映射回原帧。
+"""
+
+
+class Letterbox:
+    """把任意尺寸的帧按比例缩放到固定尺寸画布中（居中，补黑边）"""
+
+    def __init__(self, size):
+        if isinstance(size, int):
+            size = (size, size)
+        self.width, self.height = size
+        self.canvas = np.zeros((self.height, self.width, 3), dtype=np.uint8)  # 复用的识别输入缓冲区
+        self.source_shape = None
+        self.scale = 1.0
+        self.offset_x = 0
+        self.offset_y = 0
+        self._roi = None
+
+    def _configure(self, source_shape):
+        source_height, source_width = source_shape[:2]
+        self.scale = min(self.width / source_width, self.height / source_height)
+        scaled_width = max(1, int(round(source_width * self.scale)))
+        scaled_height = max(1, int(round(source_height * self.scale)))
+        self.offset_x = (self.width - scaled_width) // 2
+        self.offset_y = (self.height - scaled_height) // 2
+        self._roi = self.canvas[self.offset_y:self.offset_y + scaled_height,
+                                self.offset_x:self.offset_x + scaled_width]
+        self.canvas[:] = 0
+        self.source_shape = source_shape
+
+    def apply(self, frame):
+        """把帧缩放进画布，返回画布（下次调用会被覆盖）"""
+        if frame.shape != self.source_shape:
+            self._configure(frame.shape)
+        # 直接缩放到画布的有效区域，不分配中间图像
+        cv2.resize(frame, (self._roi.shape[1], self._roi.shape[0]), dst=self._roi,
+                   interpolation=cv2.INTER_AREA)
+        return self.canvas
+
+    def to_display(self, x, y):
+        """小图中的归一化坐标 -> 原帧中的归一化坐标（支持NumPy数组）"""
+        source_height, source_width = self.source_shape[:2]
+        display_x = (x * self.width - self.offset_x) / (self.scale * source_width)
+        display_y = (y * self.height - self.offset_y) / (self.scale * source_height)
+        return display_x, display_y
+
+    def remap_points(self, points):
+        """把 shape=(..., 2) 的归一化坐标数组原地映射回原帧"""
+        points[..., 0], points[..., 1] = self.to_display(points[..., 0], points[..., 1])
+        return points
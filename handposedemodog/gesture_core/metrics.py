@@ -0,0 +1,88 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+"""
+手势 → 运动链路的延迟统计
+
+各阶段把耗时（毫秒）记录到滚动窗口里，按需计算 p50/p95/p99，
+通过预览服务的 /metrics（JSON）和 Gradio 界面的延迟面板查看，用于判断瓶颈在解码、识别还是 sdk。
+时间统一使用 time.monotonic()。
+"""
+
+# 阶段名 -> 说明（按链路顺序，也是面板中的显示顺序）
+STAGES = {
+    "queue": "抓帧→取走（邮箱等待）",
+    "convert": "镜像/颜色转换",
+    "gate": "静止检测",
+    "submit": "识别输入准备+提交",
+    "inference": "提交→识别回调",
+    "callback": "回调处理（选手/滤波/映射）",
+    "frame": "单帧处理总耗时",
+    "encode": "预览JPEG编码",
+    "gesture_to_command": "抓帧→更新目标速度",
+    "move_http": "move 接口往返",
+    "capture_to_move": "抓帧→move 请求完成",
+}
+
+
+class LatencyHistogram:
+    """最近 window 个样本的滚动统计"""
+
+    def __init__(self, window=500):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value_ms):
+        self.samples.append(value_ms)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples:
+            return None
+        values = np.fromiter(self.samples, dtype=np.float64, count=len(self.samples))
+        p50, p95, p99 = np.percentile(values, (50, 95, 99))
+        return {"count": self.count, "p50": round(float(p50), 2), "p95": round(float(p95), 2),
+                "p99": round(float(p99), 2), "max": round(float(values.max()), 2)}
+
+
+class LatencyMetrics:
+    """按阶段记录延迟，多线程安全"""
+
+    def __init__(self, window=500):
+        self.window = window
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        """记录一次耗时（秒）"""
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram(self.window)
+            histogram.add(seconds * 1000.0)
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    def snapshot(self):
+        """{阶段: {count, p50, p95, p99, max}}（毫秒），没有样本的阶段不出现"""
+        with self._lock:
+            histograms = dict(self.histograms)
+            summaries = {stage: histogram.summary() for stage, histogram in histograms.items()}
+        order = list(STAGES) + sorted(set(summaries) - set(STAGES))
+        return {stage: summaries[stage] for stage in order if summaries.get(stage)}
+
+    def format_markdown(self):
+        """延迟面板用的 Markdown 表格"""
+        snapshot = self.snapshot()
+        if not snapshot:
+            return "暂无数据"
+        lines = ["| 阶段 | 样本 | p50 (ms) | p95 (ms) | p99 (ms) | max (ms) |",
+                 "| --- | ---: | ---: | ---: | ---: | ---: |"]
+        for stage, summary in snapshot.items():
+            lines.append(f"| {STAGES.get(stage, stage)} | {summary['count']} | {summary['p50']:.1f} | "
+                         f"{summary['p95']:.1f} | {summary['p99']:.1f} | {summary['max']:.1f} |")
+        return "\n".join(lines)
@@ -0,0 +1,100 @@
+import cv2
+import numpy as np
+
+"""
+静止画面识别门控
+
+展厅里摄像头大部分时间看到的是空场或静止画面，仍然每帧提交手势识别会白白占用CPU（与导航共用一块板子）。
+MotionGate 在提交识别前把帧缩到很小的灰度图，与滑动平均背景比较：
+- 变化像素比例超过 min_changed_ratio 视为有运动，之后 motion_hold 秒内都放行
+- 最近一次识别结果里有手时始终放行（手静止不动也要持续识别手势）
+- 其余情况跳过识别，但每隔 force_interval 秒强制识别一次，防止漏掉背景模型没察觉的手
+时间统一使用 time.monotonic()。
+"""
+
+
+class MotionGate:
+    """
+    帧差运动检测门控
+
+    参数:
+    width: 检测用小图宽度（像素），高度按比例
+    pixel_threshold: 灰度差超过该值的像素记为变化
+    min_changed_ratio: 变化像素比例超过该值视为有运动
+    background_rate: 背景滑动平均系数，越大越快吸收缓慢变化（光照）
+    motion_hold: 检测到运动后持续放行的时间（秒）
+    force_interval: 静止时强制识别的间隔（秒）
+    """
+
+    def __init__(self, width=64, pixel_threshold=18, min_changed_ratio=0.01, background_rate=0.05,
+                 motion_hold=0.5, force_interval=1.0):
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_ratio = min_changed_ratio
+        self.background_rate = background_rate
+        self.motion_hold = motion_hold
+        self.force_interval = force_interval
+
+        self.changed_ratio = 0.0  # 最近一次检测的变化像素比例
+        self.passed = 0  # 放行次数（有手或有运动）
+        self.forced = 0  # 静止时强制识别次数
+        self.suppressed = 0  # 跳过识别的次数
+
+        self._background = None  # float32 背景
+        self._small = None  # 复用的缩小缓冲区
+        self._gray = None
+        self._last_motion = float("-inf")
+        self._last_pass = float("-inf")
+
+    def reset(self):
+        self._background = None
+        self._last_motion = float("-inf")
+        self._last_pass = float("-inf")
+
+    def _detect(self, rgb_frame):
+        """更新背景并返回是否有运动"""
+        height, width = rgb_frame.shape[:2]
+        size = (self.width, max(1, int(round(height * self.width / width))))
+        if self._small is None or self._small.shape[1::-1] != size:
+            self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._gray = np.empty((size[1], size[0]), dtype=np.uint8)
+            self._background = None
+        cv2.resize(rgb_frame, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_RGB2GRAY, dst=self._gray)
+
+        if self._background is None:
+            self._background = self._gray.astype(np.float32)
+            return True
+        diff = np.abs(self._gray.astype(np.float32) - self._background)
+        self.changed_ratio = float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+        cv2.accumulateWeighted(self._gray, self._background, self.background_rate)
+        return self.changed_ratio > self.min_changed_ratio
+
+    def should_recognize(self, rgb_frame, now, hand_present):
+        """
+        这一帧是否提交识别
+
+        参数:
+        rgb_frame: 显示帧（RGB）
+        now: time.monotonic()
+        hand_present: 最近一次识别结果里是否有手
+        """
+        if self._detect(rgb_frame):
+            self._last_motion = now
+        if hand_present or now - self._last_motion <= self.motion_hold:
+            self.passed += 1
+        elif now - self._last_pass >= self.force_interval:
+            self.forced += 1
+        else:
+            self.suppressed += 1
+            return False
+        self._last_pass = now
+        return True
+
+    def stats(self):
+        return {
+            "passed": self.passed,
+            "forced": self.forced,
+            "suppressed": self.suppressed,
+            "changed_ratio": round(self.changed_ratio, 4),
+        }
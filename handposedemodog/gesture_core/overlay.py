@@ -0,0 +1,119 @@
+import cv2
+import numpy as np
+
+"""
+手部关键点叠加层
+
+关键点和骨架画在复用的叠加层缓冲区里，只有识别结果更新（时间戳变化）时才重画；
+每帧只把叠加层中有内容的区域拷贝到显示帧上，不再每帧复制整帧、逐条画线。
+"""
+
+# 手部骨架按手指拆成折线，一次 cv2.polylines 画完一只手（共21条连接线）
+HAND_POLYLINES = [
+    [0, 1, 2, 3, 4],  # 拇指
+    [0, 5, 6, 7, 8],  # 食指
+    [5, 9, 10, 11, 12],  # 中指
+    [9, 13, 14, 15, 16],  # 无名指
+    [13, 17, 18, 19, 20],  # 小指
+    [0, 17],  # 手掌
+]
+
+MAIN_HAND_LABEL = "Main Hand"
+
+
+class HandOverlay:
+    """
+    关键点叠加层
+
+    参数:
+    highlight_main_hand: 控制手用红色加粗并标注 "Main Hand"，其他手用绿色；
+                         为 False 时所有手绿色关键点、红色连线（单手识别的样式）
+    """
+
+    def __init__(self, highlight_main_hand=False):
+        self.highlight_main_hand = highlight_main_hand
+        self.image = None  # 叠加层 (H, W, 3)
+        self.mask = None  # 叠加层中有内容的像素 (H, W, 1)
+        self.roi = None  # 有内容的区域 (x0, y0, x1, y1)，None 表示为空
+        self.timestamp = None  # 当前叠加层对应的识别结果时间戳
+        self.redraw_count = 0
+
+    def reset(self):
+        self.timestamp = None
+        self.roi = None
+        if self.image is not None:
+            self.image[:] = 0
+            self.mask[:] = False
+
+    def update(self, timestamp, landmarks, main_hand_idx, frame_shape):
+        """
+        识别结果变化时重画叠加层
+
+        参数:
+        landmarks: shape=(N, 21, 2) 归一化坐标
+        """
+        height, width = frame_shape[:2]
+        if self.image is None or self.image.shape[:2] != (height, width):
+            self.image = np.zeros((height, width, 3), dtype=np.uint8)
+            self.mask = np.zeros((height, width, 1), dtype=bool)
+            self.timestamp = None
+            self.roi = None
+        elif timestamp == self.timestamp:
+            return
+
+        # 清掉上一次画的区域
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            self.image[y0:y1, x0:x1] = 0
+            self.mask[y0:y1, x0:x1] = False
+        self.timestamp = timestamp
+        self.roi = None
+        if landmarks is None or len(landmarks) == 0:
+            return
+
+        points = np.empty(landmarks.shape, dtype=np.int32)
+        np.multiply(landmarks, (width, height), out=points, casting="unsafe")
+        for hand_idx, hand_points in enumerate(points):
+            self._draw_hand(hand_points, self.highlight_main_hand and hand_idx == main_hand_idx)
+
+        # 有内容的区域：全部关键点的外接框，外扩线宽/点半径和标注文字
+        margin = 8
+        x0 = max(0, int(points[..., 0].min()) - margin - 30)
+        y0 = max(0, int(points[..., 1].min()) - margin - 40)
+        x1 = min(width, int(points[..., 0].max()) + margin + 80)
+        y1 = min(height, int(points[..., 1].max()) + margin)
+        if x0 >= x1 or y0 >= y1:
+            return
+        self.roi = (x0, y0, x1, y1)
+        self.mask[y0:y1, x0:x1, 0] = self.image[y0:y1, x0:x1].any(axis=2)
+        self.redraw_count += 1
+
+    def _draw_hand(self, hand_points, is_main_hand):
+        if is_main_hand:
+            point_color, line_color = (255, 0, 0), (255, 0, 0)
+            point_radius, line_thickness = 5, 3
+        elif self.highlight_main_hand:
+            point_color, line_color = (0, 255, 0), (0, 255, 0)
+            point_radius, line_thickness = 3, 2
+        else:
+            point_color, line_color = (0, 255, 0), (255, 0, 0)
+            point_radius, line_thickness = 3, 2
+
+        cv2.polylines(self.image, [hand_points[chain] for chain in HAND_POLYLINES], False,
+                      line_color, line_thickness)
+        for x, y in hand_points:
+            cv2.circle(self.image, (int(x), int(y)), point_radius, point_color, -1)
+
+        if is_main_hand:
+            # 在手腕位置添加"主控手"标识
+            wrist_x, wrist_y = hand_points[0]
+            cv2.putText(self.image, MAIN_HAND_LABEL, (int(wrist_x) - 30, int(wrist_y) - 20),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
+
+    def compose(self, frame):
+        """把叠加层原地画到帧上（只处理有内容的区域）"""
+        if self.roi is None or self.image is None or frame.shape != self.image.shape:
+            return frame
+        x0, y0, x1, y1 = self.roi
+        np.copyto(frame[y0:y1, x0:x1], self.image[y0:y1, x0:x1], where=self.mask[y0:y1, x0:x1])
+        return frame
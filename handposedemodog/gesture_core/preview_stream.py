@@ -0,0 +1,194 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+
+"""
+MJPEG 预览流
+
+处理线程每帧调用 PreviewBroadcaster.publish()，有观看者时把叠加好关键点的帧编码一次 JPEG，
+同一份字节分发给所有观看者；PreviewServer 在独立端口提供 multipart/x-mixed-replace 流，
+Gradio 页面用 <img> 直接嵌入，画面不再经过 Gradio 的 JSON/base64 通道，也不按浏览器标签页重复编码。
+观看者跟不上时只拿最新一帧，不会排队。同一服务还在 /metrics 提供延迟统计（JSON）。
+"""
+
+BOUNDARY = "frame"
+
+
+class PreviewBroadcaster:
+    """
+    预览帧编码与分发
+
+    参数:
+    quality: JPEG 质量（1-100）
+    max_width: 预览最大宽度，超过时按比例缩小后再编码；None 表示原尺寸
+    max_fps: 编码帧率上限；None 表示每个处理帧都编码
+    """
+
+    def __init__(self, quality=80, max_width=None, max_fps=None):
+        self.quality = quality
+        self.max_width = max_width
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+
+        self.jpeg = None  # 最新一帧编码结果（bytes）
+        self.sequence = 0  # 每编码一帧加一，观看者据此判断是否有新帧
+        self.viewers = 0
+        self.encoded_frames = 0
+        self._last_encode_time = 0.0
+        self._bgr = None  # 复用的缩放/颜色转换缓冲区
+        self._condition = threading.Condition()
+
+    def _prepare(self, rgb_frame):
+        """缩放并转为 BGR，结果写入复用的缓冲区"""
+        height, width = rgb_frame.shape[:2]
+        if self.max_width and width > self.max_width:
+            size = (self.max_width, max(1, int(round(height * self.max_width / width))))
+        else:
+            size = (width, height)
+        if self._bgr is None or self._bgr.shape[1::-1] != size:
+            self._bgr = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        if size == (width, height):
+            cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR, dst=self._bgr)
+        else:
+            cv2.resize(rgb_frame, size, dst=self._bgr, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(self._bgr, cv2.COLOR_RGB2BGR, dst=self._bgr)
+        return self._bgr
+
+    def publish(self, rgb_frame, force=False):
+        """编码一帧并通知所有观看者；没有观看者或超过帧率上限时直接跳过"""
+        if rgb_frame is None or (not force and self.viewers == 0):
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_encode_time < self.min_interval:
+            return False
+
+        ok, encoded = cv2.imencode(".jpg", self._prepare(rgb_frame), self.encode_params)
+        if not ok:
+            return False
+        self._last_encode_time = now
+        with self._condition:
+            self.jpeg = encoded.tobytes()
+            self.sequence += 1
+            self.encoded_frames += 1
+            self._condition.notify_all()
+        return True
+
+    def publish_blank(self, shape=(360, 480, 3)):
+        """停止识别后推送一帧黑色画面"""
+        if self._bgr is not None:
+            shape = self._bgr.shape
+        self.publish(np.zeros(shape, dtype=np.uint8), force=True)
+
+    def wait_frame(self, last_sequence, timeout=1.0):
+        """等待比 last_sequence 新的一帧，返回 (jpeg, sequence)；超时返回 (None, last_sequence)"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.sequence != last_sequence, timeout=timeout)
+            if self.sequence == last_sequence:
+                return None, last_sequence
+            return self.jpeg, self.sequence
+
+    def add_viewer(self):
+        with self._condition:
+            self.viewers += 1
+
+    def remove_viewer(self):
+        with self._condition:
+            self.viewers -= 1
+
+
+class _PreviewHandler(BaseHTTPRequestHandler):
+    broadcaster = None
+    metrics = None
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/stream.mjpg":
+            self._stream()
+        elif path == "/snapshot.jpg":
+            self._snapshot()
+        elif path == "/metrics" and self.metrics is not None:
+            self._metrics()
+        else:
+            self.send_error(404)
+
+    def _send_headers(self, content_type, length=None):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Cache-Control", "no-cache, no-store")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if length is not None:
+            self.send_header("Content-Length", str(length))
+        self.end_headers()
+
+    def _snapshot(self):
+        jpeg = self.broadcaster.jpeg
+        if jpeg is None:
+            self.send_error(503, "no frame yet")
+            return
+        self._send_headers("image/jpeg", len(jpeg))
+        self.wfile.write(jpeg)
+
+    def _metrics(self):
+        body = json.dumps({
+            "latency_ms": self.metrics.snapshot(),
+            "preview": {"viewers": self.broadcaster.viewers, "encoded_frames": self.broadcaster.encoded_frames},
+        }, ensure_ascii=False).encode()
+        self._send_headers("application/json; charset=utf-8", len(body))
+        self.wfile.write(body)
+
+    def _stream(self):
+        self._send_headers(f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.broadcaster.add_viewer()
+        sequence = 0
+        try:
+            while not self.server.stopping:
+                jpeg, sequence = self.broadcaster.wait_frame(sequence, timeout=1.0)
+                if jpeg is None:
+                    continue
+                self.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode()
+                )
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 浏览器关闭了页面
+        finally:
+            self.broadcaster.remove_viewer()
+
+    def log_message(self, format, *args):
+        pass  # 不逐条打印请求
+
+
+class PreviewServer:
+    """在后台线程提供 /stream.mjpg（MJPEG 流）、/snapshot.jpg（最新一帧）和 /metrics（延迟统计）"""
+
+    def __init__(self, broadcaster, host="127.0.0.1", port=7871, metrics=None):
+        self.broadcaster = broadcaster
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        attributes = {"broadcaster": self.broadcaster, "metrics": self.metrics}
+        handler = type("PreviewHandler", (_PreviewHandler,), attributes)
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self._server.stopping = False
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="preview_server")
+        self._thread.start()
+        print(f"预览流: http://{self.host}:{self.port}/stream.mjpg")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.stopping = True
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
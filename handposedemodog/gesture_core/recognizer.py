@@ -0,0 +1,397 @@
+import threading
+import time
+
+import mediapipe as mp
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+
+from .frame_grabber import LatestFrameGrabber
+from .gesture_filter import GestureFilter
+from .hand_selectors import FirstHandSelector, get_hand_info, landmarks_to_array
+from .inference_governor import InferenceGovernor
+from .letterbox import Letterbox
+from .metrics import LatencyMetrics
+from .motion_gate import MotionGate
+from .overlay import HandOverlay
+from .preview_stream import PreviewBroadcaster
+from .velocity_streamer import ZERO_TWIST, VelocityStreamer
+
+"""
+手势识别 + 机器狗控制流程
+
+帧来源（sources）和控制手选择（hand_selectors）可替换，其余流程只有这一份：
+抓帧线程只保留最新帧 → 处理线程取走最新帧 → 上一帧识别完成、到达（自适应的）提交间隔且画面有运动或有手时
+提交 MediaPipe 异步识别 → 回调中选择控制手，按手做时间滤波，稳定手势映射为目标速度 → 速度指令线程按固定频率下发；
+每帧叠加最近一次识别结果，有预览观看者时编码为 JPEG 推送到 MJPEG 预览流。
+"""
+
+DEFAULT_MODEL_PATH = '/home/myb/handposedemodog/gesture_recognizer.task'
+
+# 手势到动作和目标速度 (vx, vy, vyaw) 的映射（图像已镜像，左右移动/转向与手性相反）
+# 速度与 move.py 中对应的 move_forward / strafe_right / turn_right 等函数一致
+ACTION_MAP = {
+    ("Pointing_Up", None): ("前进", (0.2, 0.0, 0.0)),
+    ("Thumb_Down", None): ("后退", (-0.2, 0.0, 0.0)),
+    ("Open_Palm", "Left"): ("左移", (0.0, -0.2, 0.0)),
+    ("Open_Palm", "Right"): ("右移", (0.0, 0.2, 0.0)),
+    ("Closed_Fist", "Left"): ("左转", (0.0, 0.0, -0.5)),
+    ("Closed_Fist", "Right"): ("右转", (0.0, 0.0, 0.5)),
+    ("Victory", None): ("停止", ZERO_TWIST),
+}
+
+
+class GradioGestureRecognizer:
+    """
+    手势识别器
+
+    参数:
+    source: 帧来源（CameraSource / RtspSource / FfmpegSource）
+    selector: 控制手选择器，默认第一只手；有 close() 时在停止识别时调用
+    num_hands: MediaPipe 最多识别的手数
+    frame_skip_interval: 每几帧提交一次识别（自适应跳帧时为最小间隔）
+    highlight_main_hand: 是否用红色突出显示控制手（多手识别时默认开启）
+    inference_size: 识别输入尺寸（边长或 (宽, 高)），帧按比例缩放并补黑边；None 表示用原帧识别
+    preview: 预览流编码器（PreviewBroadcaster），默认质量80、原尺寸
+    gesture_filter: 手势时间滤波（GestureFilter），默认 5 帧中 3 票、保持 0.3 秒
+    velocity_streamer: 速度指令线程（VelocityStreamer），默认 10Hz、看门狗 0.5 秒
+    video_mode: True 时用 VIDEO 模式同步识别（每个提交的帧都有结果，用于离线回放/基准测试），
+                默认 LIVE_STREAM 异步识别
+    governor: 识别提交节流（InferenceGovernor），默认上一帧识别完成才提交、
+              识别延迟超过 100ms 时最多放宽到每 max(6, frame_skip_interval) 帧一次；VIDEO 模式默认间隔固定
+    motion_gate: 静止画面门控（MotionGate），无运动且上次结果没有手时跳过识别；
+                 默认 LIVE_STREAM 模式启用、VIDEO 模式不启用，传 False 关闭
+    """
+
+    def __init__(self, source, selector=None, num_hands=1, frame_skip_interval=2,
+                 highlight_main_hand=None, model_path=DEFAULT_MODEL_PATH, inference_size=320,
+                 preview=None, gesture_filter=None, velocity_streamer=None, video_mode=False, governor=None,
+                 motion_gate=None):
+        self.source = source
+        self.selector = selector or FirstHandSelector()
+        self.model_path = model_path
+        highlight_main_hand = num_hands > 1 if highlight_main_hand is None else highlight_main_hand
+        self.overlay = HandOverlay(highlight_main_hand)
+        self.letterbox = Letterbox(inference_size) if inference_size else None
+        self.preview = preview or PreviewBroadcaster()
+        self.gesture_filter = gesture_filter or GestureFilter()
+
+        # 初始化变量
+        self.latest_result = None
+        self.latest_hands = None  # 最近一次结果 (时间戳, 关键点数组(N, 21, 2), 控制手索引)
+        self.latest_timestamp = 0
+        self.last_submit_timestamp = 0  # 最近一次提交识别的时间戳（ms），识别要求严格递增
+        self.processed_frames = 0
+        self.is_running = False
+        self.recognizer = None
+        self.camera_thread = None
+        self.grabber = None  # 最新帧抓取线程（识别运行时创建）
+        self.current_frame = None
+        self.current_gesture = "无手势"
+        self.current_handedness = "未检测到手"
+
+        # 性能优化相关：上一帧识别完成才提交下一帧，提交间隔按识别延迟自适应
+        self.frame_skip_interval = frame_skip_interval
+        if governor is None:
+            max_interval = frame_skip_interval if video_mode else max(6, frame_skip_interval)
+            governor = InferenceGovernor(min_interval=frame_skip_interval, max_interval=max_interval)
+        self.governor = governor
+        if motion_gate is None:
+            motion_gate = None if video_mode else MotionGate()
+        self.motion_gate = motion_gate or None
+
+        # 机器狗控制相关
+        self.robot_control_enabled = False
+        self.current_robot_action = "停止"
+        self.last_gesture_time = 0
+        self.last_action_name = None  # 记录上一个动作，只在动作变化时打印
+
+        # 速度指令由单独线程按固定频率下发，识别回调只更新目标速度
+        self.velocity_streamer = velocity_streamer or VelocityStreamer()
+
+        # 各阶段延迟统计，帧的抓取时刻随识别时间戳传到回调中
+        self.metrics = LatencyMetrics()
+        if self.velocity_streamer.metrics is None:
+            self.velocity_streamer.metrics = self.metrics
+        self._inflight = {}  # 识别时间戳(ms) -> (抓取时刻, 提交时刻)
+        self._inflight_lock = threading.Lock()
+
+        # 创建手势识别器选项
+        base_options = python.BaseOptions(model_asset_path=self.model_path)
+        self.video_mode = video_mode
+        if video_mode:
+            self.options = vision.GestureRecognizerOptions(
+                base_options=base_options,
+                running_mode=vision.RunningMode.VIDEO,
+                num_hands=num_hands
+            )
+        else:
+            self.options = vision.GestureRecognizerOptions(
+                base_options=base_options,
+                running_mode=vision.RunningMode.LIVE_STREAM,
+                result_callback=self.process_result,
+                num_hands=num_hands
+            )
+
+    def process_result(self, result, output_image, timestamp_ms):
+        """处理手势识别结果的回调函数"""
+        callback_start = time.monotonic()
+        with self._inflight_lock:
+            frame_time, submit_time = self._inflight.pop(timestamp_ms, (None, None))
+        if submit_time is not None:
+            self.metrics.record("inference", callback_start - submit_time)
+        self.governor.completed_frame(timestamp_ms, submit_time, callback_start)
+
+        # 关键点只在这里转换一次，选择控制手和绘制都使用数组
+        landmarks = landmarks_to_array(result)
+        if self.letterbox:
+            # 关键点从识别小图映射回显示帧
+            self.letterbox.remap_points(landmarks)
+        hand_idx = self.selector.select(result, landmarks)
+        self.latest_result = result
+        self.latest_hands = (timestamp_ms, landmarks, hand_idx)
+        self.latest_timestamp = timestamp_ms
+
+        gesture_name, confidence, hand_label, hand_score = get_hand_info(result, hand_idx)
+
+        # 更新手势信息
+        if gesture_name and confidence > 0:
+            self.current_gesture = f"{gesture_name} ({confidence:.2f})"
+        else:
+            self.current_gesture = "无手势"
+
+        # 更新手性信息
+        if hand_label:
+            self.current_handedness = f"{hand_label} ({hand_score:.2f})"
+        else:
+            self.current_handedness = "未检测到手"
+
+        # 每只手投票滤波，机器狗只跟随控制手的稳定手势
+        votes = []
+        for idx in range(len(landmarks)):
+            name, score, label, _ = get_hand_info(result, idx)
+            votes.append(((name, label) if name else None, score))
+        stable = self.gesture_filter.update(landmarks, votes, time.time())
+        stable_gesture = stable[hand_idx] if hand_idx is not None else None
+
+        # 机器狗控制逻辑（只使用控制手）
+        if stable_gesture:
+            robot_action = self.map_gesture_to_robot_action(*stable_gesture)
+            if robot_action:
+                self.execute_robot_action(*robot_action, frame_time=frame_time)
+
+        self.metrics.record("callback", time.monotonic() - callback_start)
+
+    def map_gesture_to_robot_action(self, gesture_name, hand_label):
+        """
+        将手势映射到机器狗动作
+
+        映射规则：
+        👆 Pointing_Up（单手向上指）    → 前进
+        👇 Thumb_Down（拇指向下）      → 后退
+        ✋ Open_Palm（左手张开）       → 左移
+        ✋ Open_Palm（右手张开）       → 右移
+        👊 Closed_Fist（左手握拳）     → 左转
+        👊 Closed_Fist（右手握拳）     → 右转
+        🛑 Victory（V手势）           → 停止
+
+        置信度和稳定性已由 GestureFilter 判断，这里只做映射
+        """
+        if not self.robot_control_enabled:
+            return None
+
+        for (gesture, hand), (action_name, twist) in ACTION_MAP.items():
+            if gesture_name == gesture and (hand is None or hand_label == hand):
+                return action_name, twist
+
+        return None
+
+    def execute_robot_action(self, action_name, twist, frame_time=None):
+        """更新目标速度（稳定手势持续期间每个识别结果都会刷新，手势消失后由看门狗停止）"""
+        self.velocity_streamer.set_target(*twist, source_time=frame_time)
+        if frame_time is not None:
+            self.metrics.record("gesture_to_command", time.monotonic() - frame_time)
+        current_time = time.time()
+        if action_name != self.last_action_name:
+            print(f"机器狗动作: {action_name} (距上次变化 {current_time - self.last_gesture_time:.3f}s)")
+            self.last_gesture_time = current_time
+        self.current_robot_action = action_name
+        self.last_action_name = action_name
+        return f"执行: {action_name}"
+
+    def toggle_robot_control(self):
+        """切换机器狗控制状态"""
+        self.robot_control_enabled = not self.robot_control_enabled
+        if self.robot_control_enabled:
+            self.velocity_streamer.start()
+        else:
+            # 停用控制时停止发送线程，并下发零速
+            self.velocity_streamer.stop()
+            self.current_robot_action = "停止"
+            self.last_action_name = None
+        return self.robot_control_enabled
+
+    def process_frame(self, rgb_frame, frame_time=None):
+        """处理一帧：由 governor 决定是否提交识别，并叠加最近一次识别结果（frame_time 为抓取时刻，用于延迟统计）"""
+        # 帧跳过优化：上一帧还在识别、未到提交间隔或画面静止时只叠加旧结果
+        now = time.monotonic()
+        if self.recognizer and self.governor.ready(now) and self._gate_open(rgb_frame, now):
+            submit_start = time.monotonic()
+            # 识别用缩小后的副本，显示和绘制仍用原帧
+            inference_frame = self.letterbox.apply(rgb_frame) if self.letterbox else rgb_frame
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=inference_frame)
+            timestamp_ms = max(int(time.time() * 1000), self.last_submit_timestamp + 1)
+            self.last_submit_timestamp = timestamp_ms
+            with self._inflight_lock:
+                self._inflight[timestamp_ms] = (frame_time, submit_start)
+                # 识别超时未回调的记录不会被取走，只保留最近的记录
+                while len(self._inflight) > 32:
+                    self._inflight.pop(next(iter(self._inflight)))
+            self.governor.submitted_frame(timestamp_ms, submit_start)
+            if self.video_mode:
+                # 同步识别：submit 只计输入准备，识别耗时计入 inference
+                self.metrics.record("submit", time.monotonic() - submit_start)
+                result = self.recognizer.recognize_for_video(mp_image, timestamp_ms)
+                self.process_result(result, mp_image, timestamp_ms)
+            else:
+                self.recognizer.recognize_async(mp_image, timestamp_ms)
+                self.metrics.record("submit", time.monotonic() - submit_start)
+
+        # 叠加手部关键点：识别结果没有更新时不重画叠加层，只把已画好的区域拷到当前帧
+        latest_hands = self.latest_hands
+        if latest_hands is not None:
+            timestamp_ms, landmarks, hand_idx = latest_hands
+            self.overlay.update(timestamp_ms, landmarks, hand_idx, rgb_frame.shape)
+            self.overlay.compose(rgb_frame)
+        self.current_frame = rgb_frame
+
+    def _gate_open(self, rgb_frame, now):
+        """静止画面门控：没有门控时始终提交"""
+        if self.motion_gate is None:
+            return True
+        latest_hands = self.latest_hands
+        hand_present = latest_hands is not None and len(latest_hands[1]) > 0
+        open_ = self.motion_gate.should_recognize(rgb_frame, now, hand_present)
+        self.metrics.record("gate", time.monotonic() - now)
+        return open_
+
+    def camera_loop(self):
+        """处理循环：抓帧线程只保留最新帧，这里每次取走最新的一帧处理"""
+        self.grabber = LatestFrameGrabber(self.source)
+        self.grabber.start()
+        processed_count = 0
+        last_fps_time = time.time()
+        previous_frame = None  # 上一帧在新帧显示后才归还，界面线程可能仍在读取
+
+        try:
+            while self.is_running:
+                raw_frame, frame_time = self.grabber.take(timeout=1.0)
+                if raw_frame is None:
+                    if self.grabber.ended:
+                        break  # 来源读取失败且重连失败
+                    continue
+
+                processed_count += 1
+                self.processed_frames += 1
+                frame_start = time.monotonic()
+                self.metrics.record("queue", frame_start - frame_time)
+                rgb_frame = self.source.to_rgb(raw_frame)
+                self.metrics.record("convert", time.monotonic() - frame_start)
+                self.process_frame(rgb_frame, frame_time)
+                # 在归还缓冲区之前编码，帧在处理线程里始终有效
+                encode_start = time.monotonic()
+                if self.preview.publish(self.current_frame):
+                    self.metrics.record("encode", time.monotonic() - encode_start)
+                self.source.release(previous_frame)
+                previous_frame = raw_frame
+                self.metrics.record("frame", time.monotonic() - frame_start)
+
+                # 动态FPS监控
+                if processed_count % 30 == 0:
+                    current_time = time.time()
+                    fps = 30 / (current_time - last_fps_time)
+                    print(f"{self.source.name}FPS: {fps:.1f}, 丢弃帧: {self.grabber.dropped_frames}, "
+                          f"识别间隔: {self.governor.interval}, 识别中跳过: {self.governor.busy_skips}"
+                          + (f", 静止跳过: {self.motion_gate.suppressed}" if self.motion_gate else ""))
+                    last_fps_time = current_time
+        finally:
+            self.grabber.stop()
+            self.source.release(previous_frame)
+
+    def start_recognition(self):
+        """开始手势识别"""
+        if self.is_running:
+            return "手势识别已在运行中", self.current_gesture, self.current_handedness
+
+        try:
+            self.source.open()
+        except Exception as e:
+            self.source.close()
+            return f"错误: {str(e)}", "无手势", "未检测到手"
+
+        # 创建手势识别器
+        try:
+            self.recognizer = vision.GestureRecognizer.create_from_options(self.options)
+            self.is_running = True
+
+            # 启动摄像头线程
+            self.camera_thread = threading.Thread(target=self.camera_loop)
+            self.camera_thread.daemon = True
+            self.camera_thread.start()
+
+            return f"手势识别已启动 ({self.source.describe()})", self.current_gesture, self.current_handedness
+
+        except Exception as e:
+            self.cleanup()
+            return f"启动失败: {str(e)}", "无手势", "未检测到手"
+
+    def stop_recognition(self):
+        """停止手势识别"""
+        if not self.is_running:
+            return "手势识别未在运行", "无手势", "未检测到手"
+
+        self.cleanup()
+        return "手势识别已停止", "无手势", "未检测到手"
+
+    def cleanup(self):
+        """清理资源（可再次启动）"""
+        self.is_running = False
+
+        if self.camera_thread and self.camera_thread.is_alive():
+            self.camera_thread.join(timeout=3.0)
+
+        self.source.close()
+
+        if self.recognizer:
+            self.recognizer.close()
+            self.recognizer = None
+
+        self.current_frame = None
+        self.latest_result = None
+        self.latest_hands = None
+        self.overlay.reset()
+        self.gesture_filter.reset()
+        close_selector = getattr(self.selector, "close", None)
+        if close_selector is not None:
+            close_selector()  # 选择器的后台资源（如深度图轮询）随识别停止
+        with self._inflight_lock:
+            self._inflight.clear()
+        self.governor.reset()
+        if self.motion_gate:
+            self.motion_gate.reset()
+        self.preview.publish_blank()
+        self.current_gesture = "无手势"
+        self.current_handedness = "未检测到手"
+
+    def close(self):
+        """应用退出时释放全部资源"""
+        self.cleanup()
+        if self.velocity_streamer.is_running:
+            print("正在停止机器狗速度指令...")
+            self.velocity_streamer.stop()
+
+    def get_status_info(self):
+        """获取状态信息"""
+        robot_action = self.current_robot_action
+        if self.velocity_streamer.target == ZERO_TWIST:
+            robot_action = "停止"  # 包括手势消失后看门狗归零
+        return self.current_gesture, self.current_handedness, robot_action
@@ -0,0 +1,473 @@
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from robot_sdk import get_robot_client
+from .decode_options import DecodeOptions
+
+"""
+视频帧来源
+
+三种来源统一成同一个接口，识别流程不关心帧从哪里来：
+- CameraSource: 本机 V4L2 摄像头（OpenCV）
+- RtspSource: 机器狗RTSP视频流（OpenCV FFMPEG后端）
+- FfmpegSource: 机器狗RTSP视频流（ffmpeg子进程 + 管道），也可以读取视频文件
+- VideoFileSource: 录制的视频文件（离线回放、基准测试）
+
+接口:
+open()       打开来源，失败时抛出 RuntimeError（信息用于界面显示）
+read_raw()   返回 (ok, raw)，raw 为来源的原始帧（抓帧线程调用）
+to_rgb(raw)  原始帧 -> 镜像翻转的 RGB 图像（处理线程对取走的帧调用）
+release(raw) 原始帧不再使用，缓冲区可以复用
+read()       read_raw() + to_rgb()，返回 (ok, frame)
+reconnect()  读取失败后尝试重连，返回是否成功
+close()      释放资源
+"""
+
+# OpenCV FFMPEG 后端在创建 VideoCapture 时读取的打开选项（进程级环境变量）
+CAPTURE_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+_capture_options_lock = threading.Lock()
+
+# VIDEO_SOURCE 环境变量 -> video/open 返回的地址字段
+RTSP_URL_KEYS = {
+    "unitree": "unitree_rtsp_url",
+    "realsense": "realsense_rtsp_url",
+    "orbbec": "orbbec_rtsp_url",
+    "lite3": "lite3_rtsp_url",
+}
+
+
+def get_rtsp_url(video_source=None):
+    """通过sdk服务获取RTSP地址，video_source 默认取 VIDEO_SOURCE 环境变量（未设置时为 lite3）"""
+    video_source = video_source or os.environ.get("VIDEO_SOURCE")
+    key = RTSP_URL_KEYS.get(video_source, RTSP_URL_KEYS["lite3"])
+    rtsp_data = get_robot_client().video_open()
+    return rtsp_data["data"][key]
+
+
+def find_external_camera():
+    """查找外接摄像头（优先非0号摄像头，通常0是内置摄像头）"""
+    available_cameras = []
+
+    # 检测前10个可能的摄像头索引
+    for i in range(10):
+        cap = cv2.VideoCapture(i)
+        if cap.isOpened():
+            ret, frame = cap.read()
+            if ret:
+                available_cameras.append(i)
+            cap.release()
+
+    if available_cameras:
+        for cam_id in available_cameras:
+            if cam_id != 0:
+                return cam_id
+        return available_cameras[0]
+    return None
+
+
+class OpenCvSource:
+    """基于 cv2.VideoCapture 的来源"""
+
+    name = "视频源"
+
+    def __init__(self, fps=20, fourcc=None, timeouts=True, max_reconnect_attempts=3, decode=None):
+        self.fps = fps
+        self.fourcc = fourcc  # 例如 "H264"，None 表示不设置
+        self.timeouts = timeouts  # 是否设置打开/读取超时（RTSP需要，避免阻塞）
+        self.max_reconnect_attempts = max_reconnect_attempts  # 0 表示不重连
+        self.decode = decode or DecodeOptions(decoder="software")
+        self.reconnect_attempts = 0
+        self.target = None
+        self.cap = None
+        self.output_size = None  # 缩放后的 (宽, 高)，None 表示不缩放
+        self.frame_step = 1  # 抽帧间隔
+        self.capture_options = []  # OPENCV_FFMPEG_CAPTURE_OPTIONS 的 key;value 项
+
+    def describe(self):
+        return f"{self.name} {self.target}"
+
+    def _resolve_target(self):
+        raise NotImplementedError
+
+    def open(self):
+        self.target = self._resolve_target()
+        self.cap = self._open_capture(self.target, self.fps)
+        if self.cap is None:
+            raise RuntimeError(f"无法打开{self.describe()}")
+
+    def _open_params(self):
+        """VideoCapture 打开参数：按解码选项请求硬件加速"""
+        decoder = self.decode.decoder
+        if decoder == "v4l2m2m":
+            # OpenCV 的FFMPEG后端通过 video_codec 选项指定解码器
+            self.capture_options.append("video_codec;h264_v4l2m2m")
+            return []
+        acceleration = {"auto": "VIDEO_ACCELERATION_ANY", "vaapi": "VIDEO_ACCELERATION_VAAPI"}.get(decoder)
+        if acceleration and hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+            # OpenCV 在硬件不可用时自动回退到软件解码
+            return [cv2.CAP_PROP_HW_ACCELERATION, getattr(cv2, acceleration)]
+        return []
+
+    def _create_capture(self, target, params):
+        """
+        创建 VideoCapture，FFMPEG后端失败时尝试默认后端
+
+        打开选项只在创建期间写入环境变量，创建后恢复原值，
+        不会带到之后打开的其他来源（如基准测试中的 VideoFileSource）
+        """
+        with _capture_options_lock:
+            previous = os.environ.get(CAPTURE_OPTIONS_ENV)
+            if self.capture_options:
+                os.environ[CAPTURE_OPTIONS_ENV] = "|".join(dict.fromkeys(self.capture_options))
+            try:
+                # 使用FFMPEG后端优化延迟
+                if params:
+                    cap = cv2.VideoCapture(target, cv2.CAP_FFMPEG, params)
+                else:
+                    cap = cv2.VideoCapture(target, cv2.CAP_FFMPEG)
+                if not cap.isOpened():
+                    print("FFMPEG后端失败，尝试默认后端...")
+                    cap = cv2.VideoCapture(target)
+            finally:
+                if previous is None:
+                    os.environ.pop(CAPTURE_OPTIONS_ENV, None)
+                else:
+                    os.environ[CAPTURE_OPTIONS_ENV] = previous
+        return cap
+
+    def _open_capture(self, target, fps):
+        params = self._open_params()
+        if self.decode.keyframes_only:
+            print("OpenCV后端不支持只解码关键帧，忽略 keyframes_only")
+
+        cap = self._create_capture(target, params)
+        if not cap.isOpened():
+            return None
+
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # 最小缓冲区，减少延迟
+        cap.set(cv2.CAP_PROP_FPS, fps)
+        if self.timeouts:
+            cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 3000)  # 连接超时3秒
+            cap.set(cv2.CAP_PROP_READ_TIMEOUT_MSEC, 1000)  # 读取超时1秒
+        if self.fourcc:
+            try:
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+            except Exception:
+                print(f"无法设置{self.fourcc}编解码器，使用默认设置")
+
+        source_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        source_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        size = self.decode.output_size(source_width, source_height) if source_width and source_height else None
+        self.output_size = size if size and size != (source_width, source_height) else None
+        self.frame_step = self.decode.frame_step(cap.get(cv2.CAP_PROP_FPS))
+        return cap
+
+    def read_raw(self):
+        """读取一帧解码后的原始图像（BGR，未翻转）"""
+        if self.cap is None:
+            return False, None
+        # 抽帧：跳过的帧只 grab，不做颜色转换和拷贝
+        for _ in range(self.frame_step - 1):
+            if not self.cap.grab():
+                return False, None
+        return self.cap.read()
+
+    def to_rgb(self, frame):
+        """原始图像 -> 缩放、镜像翻转的RGB；颜色转换原地进行，不再分配一帧"""
+        if self.output_size:
+            frame = cv2.resize(frame, self.output_size, interpolation=cv2.INTER_AREA)
+        frame = cv2.flip(frame, 1)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        return frame
+
+    def release(self, frame):
+        """帧处理完毕（OpenCV每帧单独分配，无需归还）"""
+
+    def read(self):
+        ret, frame = self.read_raw()
+        if not ret:
+            return False, None
+        return True, self.to_rgb(frame)
+
+    def reconnect(self):
+        if self.reconnect_attempts >= self.max_reconnect_attempts:
+            print(f"{self.name}重连失败，已达到最大尝试次数 {self.max_reconnect_attempts}")
+            return False
+
+        self.reconnect_attempts += 1
+        print(f"尝试重连{self.name}... (第{self.reconnect_attempts}次)")
+        self.close()
+        time.sleep(1)  # 等待1秒再重连
+
+        try:
+            self.target = self._resolve_target()
+            self.cap = self._open_capture(self.target, self.fps)
+        except Exception as e:
+            print(f"{self.name}重连异常: {str(e)}")
+            self.cap = None
+        if self.cap is None:
+            print(f"{self.name}重连失败")
+            return False
+
+        print(f"{self.name}重连成功")
+        self.reconnect_attempts = 0
+        return True
+
+    def close(self):
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+
+class CameraSource(OpenCvSource):
+    """本机摄像头，camera_id 为 None 时自动查找外接摄像头"""
+
+    name = "摄像头"
+
+    def __init__(self, camera_id=None, fps=20, fourcc=None, timeouts=False, max_reconnect_attempts=0):
+        super().__init__(fps=fps, fourcc=fourcc, timeouts=timeouts,
+                         max_reconnect_attempts=max_reconnect_attempts)
+        self.camera_id = camera_id
+
+    def _resolve_target(self):
+        camera_id = self.camera_id if self.camera_id is not None else find_external_camera()
+        if camera_id is None:
+            raise RuntimeError("未检测到可用摄像头")
+        return camera_id
+
+
+class RtspSource(OpenCvSource):
+    """机器狗RTSP视频流，url 为 None 时在打开时通过 video/open 获取"""
+
+    name = "RTSP流"
+
+    def __init__(self, url=None, fps=20, fourcc="H264", tcp=False, max_reconnect_attempts=3, decode=None):
+        super().__init__(fps=fps, fourcc=fourcc, timeouts=True,
+                         max_reconnect_attempts=max_reconnect_attempts, decode=decode)
+        self.url = url
+        self.tcp = tcp
+
+    def _resolve_target(self):
+        self.capture_options = ["rtsp_transport;tcp"] if self.tcp else []
+        if self.url is None:
+            self.url = get_rtsp_url()
+        return self.url
+
+
+class VideoFileSource(OpenCvSource):
+    """录制的视频文件，读到结尾即结束；realtime=True 时按文件帧率读取，模拟实时来源"""
+
+    name = "视频文件"
+
+    def __init__(self, path, realtime=False, decode=None):
+        super().__init__(timeouts=False, max_reconnect_attempts=0, decode=decode)
+        self.path = path
+        self.realtime = realtime
+        self.frame_interval = 0.0
+        self._next_frame_time = None
+
+    def _resolve_target(self):
+        if not os.path.exists(self.path):
+            raise RuntimeError(f"视频文件不存在: {self.path}")
+        return self.path
+
+    def open(self):
+        super().open()
+        file_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_interval = self.frame_step / file_fps if self.realtime and file_fps > 0 else 0.0
+        self._next_frame_time = None
+
+    def read_raw(self):
+        if self.frame_interval:
+            now = time.monotonic()
+            if self._next_frame_time is None:
+                self._next_frame_time = now
+            elif self._next_frame_time > now:
+                time.sleep(self._next_frame_time - now)
+            self._next_frame_time += self.frame_interval
+        return super().read_raw()
+
+
+class FrameBufferPool:
+    """
+    预分配的帧缓冲区池
+
+    使用方 acquire() 取一块空闲缓冲区写入，用完后 release() 归还；
+    归还的缓冲区排在队尾，刚归还的缓冲区最晚被复用（界面线程可能仍在读取）。
+    """
+
+    def __init__(self, shape, size=5):
+        self.shape = tuple(shape)
+        self._free = deque(np.empty(self.shape, dtype=np.uint8) for _ in range(size))
+        self._lock = threading.Lock()
+        self.allocated = size
+
+    def acquire(self):
+        with self._lock:
+            if self._free:
+                return self._free.popleft()
+            # 正常情况下不会用尽，用尽时补充一块而不是覆盖仍在使用的帧
+            self.allocated += 1
+        print(f"帧缓冲区不足，扩充到 {self.allocated} 块")
+        return np.empty(self.shape, dtype=np.uint8)
+
+    def release(self, buffer):
+        if buffer is None or buffer.shape != self.shape:
+            return
+        with self._lock:
+            self._free.append(buffer)
+
+
+def probe_video_size(url):
+    """用 ffprobe 读取视频流的宽高，失败时返回 None"""
+    import ffmpeg
+
+    options = {"rtsp_transport": "tcp"} if str(url).startswith("rtsp://") else {}  # ffprobe 不接受输入用不到的选项
+    try:
+        probe = ffmpeg.probe(url, **options)
+    except Exception as e:
+        print(f"ffprobe获取视频尺寸失败: {e}")
+        return None
+    for stream in probe.get("streams", []):
+        if stream.get("codec_type") == "video" and stream.get("width") and stream.get("height"):
+            return int(stream["width"]), int(stream["height"])
+    return None
+
+
+class FfmpegSource:
+    """
+    ffmpeg子进程拉取RTSP流，通过管道读取原始帧
+
+    ffmpeg 直接输出镜像翻转后的 rgb24，每帧 readinto() 到预分配的缓冲区，
+    Python 侧不再为每帧分配内存，也不再做翻转和颜色转换。
+    解码器、缩放、抽帧、只解码关键帧由 decode（DecodeOptions）指定，都在ffmpeg内完成。
+    """
+
+    name = "RTSP流"
+
+    def __init__(self, url=None, width=None, height=None, max_reconnect_attempts=3, pool_size=5,
+                 decode=None):
+        self.url = url
+        self.source_width = width  # 视频流尺寸，为 None 时通过 ffprobe 获取
+        self.source_height = height
+        self.width = None  # 输出尺寸（缩放后）
+        self.height = None
+        self.decode = decode or DecodeOptions(decoder="software")
+        self.decoder = None  # 实际使用的解码器
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.reconnect_attempts = 0
+        self.frames_read = 0  # 当前进程已读取的帧数
+        self.pool_size = pool_size
+        self.pool = None
+        self.process = None
+
+    def describe(self):
+        return f"{self.name} {self.url} ({self.width}x{self.height}, {self.decoder}解码)"
+
+    def open(self):
+        if self.url is None:
+            self.url = get_rtsp_url()
+        if self.source_width is None or self.source_height is None:
+            size = probe_video_size(self.url)
+            if size is None:
+                raise RuntimeError(f"无法获取视频流尺寸 {self.url}")
+            self.source_width, self.source_height = size
+        self.width, self.height = self.decode.output_size(self.source_width, self.source_height)
+        self.decoder = self.decode.resolve_decoder()
+        self.pool = FrameBufferPool((self.height, self.width, 3), self.pool_size)
+        try:
+            self.process = self._start_process()
+        except Exception as e:
+            raise RuntimeError(f"无法启动FFmpeg进程 {self.url}, 错误: {str(e)}")
+        print(f"FFmpeg进程已启动，连接到: {self.describe()}")
+
+    def _start_process(self):
+        import ffmpeg
+
+        input_options = self.decode.ffmpeg_input_options(self.decoder)
+        if str(self.url).startswith("rtsp://"):
+            input_options["rtsp_transport"] = "tcp"  # 读取视频文件时不能带RTSP选项
+        stream = ffmpeg.input(self.url, fflags="nobuffer", flags="low_delay",
+                              strict="experimental", **input_options)
+        if self.decode.fps:
+            stream = stream.filter('fps', fps=self.decode.fps)
+        if (self.width, self.height) != (self.source_width, self.source_height):
+            stream = stream.filter('scale', self.width, self.height)
+        stream = stream.hflip()
+
+        output_options = {}
+        if self.decode.keyframes_only:
+            output_options["vsync"] = "passthrough"  # 只有关键帧时不补帧
+        self.frames_read = 0
+        return (
+            stream
+            .output('pipe:', format='rawvideo', pix_fmt='rgb24', **output_options)
+            .run_async(pipe_stdout=True)
+        )
+
+    def read_raw(self):
+        """从管道读取一帧到空闲缓冲区（已是镜像翻转的RGB）"""
+        if self.process is None:
+            return False, None
+
+        frame = self.pool.acquire()
+        view = memoryview(frame).cast("B")
+        filled = 0
+        while filled < len(view):
+            n = self.process.stdout.readinto(view[filled:])
+            if not n:
+                self.pool.release(frame)
+                return False, None
+            filled += n
+        self.frames_read += 1
+        return True, frame
+
+    def to_rgb(self, frame):
+        return frame
+
+    def release(self, frame):
+        """帧处理完毕，缓冲区归还池中"""
+        if self.pool is not None:
+            self.pool.release(frame)
+
+    def read(self):
+        return self.read_raw()
+
+    def reconnect(self):
+        if self.reconnect_attempts >= self.max_reconnect_attempts:
+            print(f"RTSP重连失败，已达到最大尝试次数 {self.max_reconnect_attempts}")
+            return False
+
+        self.reconnect_attempts += 1
+        print(f"尝试重连RTSP流... (第{self.reconnect_attempts}次)")
+        if self.decoder != "software" and self.frames_read == 0:
+            # 硬件解码器一帧都没有解出来，改用软件解码
+            print(f"{self.decoder}解码失败，改用软件解码")
+            self.decoder = "software"
+        self.close()
+        time.sleep(1)  # 等待1秒再重连
+
+        try:
+            self.process = self._start_process()
+        except Exception as e:
+            print(f"RTSP流重连失败: {e}")
+            return False
+
+        print("RTSP流重连成功")
+        self.reconnect_attempts = 0
+        return True
+
+    def close(self):
+        if self.process:
+            try:
+                self.process.terminate()
+                self.process.wait(timeout=3)
+                print("FFmpeg进程已终止")
+            except Exception as e:
+                print(f"终止FFmpeg进程时出错: {e}")
+            self.process = None
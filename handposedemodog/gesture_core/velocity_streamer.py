@@ -0,0 +1,153 @@
+import threading
+import time
+import traceback
+
+from move import send_move_command
+
+"""
+速度指令流
+
+单独一个线程持有目标速度 (vx, vy, vyaw)，按固定频率向 /signalservice/robot/move 下发：
+- 合并：识别回调只更新目标，两次发送之间的多次更新只有最新的一次生效
+- 斜坡：加速受 max_accel 限制，减速默认立即生效（停止不等斜坡）
+- 看门狗：超过 watchdog_timeout 没有更新目标（手势消失）时目标归零
+- 速度为零且已发送过零速后不再发送
+SDK 请求频率只取决于 rate，与帧率和识别频率无关，停止延迟最多 watchdog_timeout + 1/rate。
+"""
+
+ZERO_TWIST = (0.0, 0.0, 0.0)
+
+
+class VelocityStreamer:
+    """
+    速度指令发送线程
+
+    参数:
+    rate: 发送频率（Hz）
+    watchdog_timeout: 目标多久没有更新就归零（秒）
+    max_accel: (vx, vy, vyaw) 每秒最大加速量；None 表示不限制
+    max_decel: 每秒最大减速量；None 表示立即减速
+    send_fn: 发送函数 send_fn(vx, vy, vyaw)，失败时抛出异常（零速发送失败会在下个周期重发），
+             默认 send_move_command
+    metrics: LatencyMetrics，记录 move 接口往返和抓帧→move 请求完成的延迟
+    """
+
+    def __init__(self, rate=10.0, watchdog_timeout=0.5, max_accel=(0.4, 0.4, 1.0), max_decel=None,
+                 send_fn=send_move_command, metrics=None):
+        self.rate = rate
+        self.watchdog_timeout = watchdog_timeout
+        self.max_accel = max_accel
+        self.max_decel = max_decel
+        self.send_fn = send_fn
+        self.metrics = metrics
+
+        self.current = ZERO_TWIST  # 最近一次发送的速度
+        self.sent_count = 0
+        self.error_count = 0
+
+        self._target = ZERO_TWIST
+        self._target_time = 0.0
+        self._source_time = None  # 最近一次目标对应帧的抓取时刻，发送后清除
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+        self._zero_sent = True
+
+    @property
+    def is_running(self):
+        return self._running
+
+    @property
+    def target(self):
+        return self._target
+
+    def set_target(self, vx, vy, vyaw, source_time=None):
+        """更新目标速度（同时刷新看门狗），source_time 为触发该目标的帧的抓取时刻（time.monotonic）"""
+        with self._lock:
+            self._target = (float(vx), float(vy), float(vyaw))
+            self._target_time = time.monotonic()
+            self._source_time = source_time
+
+    def start(self):
+        if self._running:
+            return
+        self.current = ZERO_TWIST
+        self._zero_sent = True
+        with self._lock:
+            self._target = ZERO_TWIST
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="velocity_streamer")
+        self._thread.start()
+
+    def stop(self):
+        """停止发送线程，并下发一次零速"""
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        with self._lock:
+            self._target = ZERO_TWIST
+        self.current = ZERO_TWIST
+        self._send(ZERO_TWIST)
+
+    def _run(self):
+        period = 1.0 / self.rate
+        next_time = time.monotonic()
+        while self._running:
+            try:
+                self.step(time.monotonic(), period)
+            except Exception:
+                print(traceback.format_exc())
+
+            next_time += period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_time = time.monotonic()
+
+    def step(self, now, dt):
+        """执行一个发送周期"""
+        with self._lock:
+            target, source_time = self._target, self._source_time
+            self._source_time = None
+            if target != ZERO_TWIST and now - self._target_time > self.watchdog_timeout:
+                target = self._target = ZERO_TWIST
+                print("速度指令看门狗超时，停止")
+
+        self.current = tuple(self._ramp(current, goal, axis, dt)
+                             for axis, (current, goal) in enumerate(zip(self.current, target)))
+        if self.current == ZERO_TWIST:
+            if self._zero_sent:
+                return
+            self._zero_sent = self._send(ZERO_TWIST, source_time)
+        else:
+            self._zero_sent = False
+            self._send(self.current, source_time)
+
+    def _ramp(self, current, goal, axis, dt):
+        if goal * current < 0:
+            goal = 0.0  # 反向时先减速到零，下个周期再按加速限制反向加速
+        # 同向且绝对值变大为加速，其余为减速
+        limits = self.max_accel if abs(goal) > abs(current) else self.max_decel
+        delta = goal - current
+        if limits is None or abs(delta) <= limits[axis] * dt:
+            return goal
+        max_delta = limits[axis] * dt
+        return current + (max_delta if delta > 0 else -max_delta)
+
+    def _send(self, twist, source_time=None):
+        try:
+            start = time.monotonic()
+            self.send_fn(*twist)
+            self.sent_count += 1
+            if self.metrics is not None:
+                end = time.monotonic()
+                self.metrics.record("move_http", end - start)
+                if source_time is not None:
+                    self.metrics.record("capture_to_move", end - source_time)
+            return True
+        except Exception as e:
+            self.error_count += 1
+            print(f"下发速度指令失败: {e}")
+            return False
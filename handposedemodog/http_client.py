@@ -0,0 +1,17 @@
+import os
+import sys
+
+"""
+转发到仓库根目录 robot_common.http_client（guide_dog 与 handposedemodog 共用一份实现）
+
+本目录的脚本按脚本方式导入 http_client，这里把仓库根目录加入搜索路径，
+并让 http_client 就是 robot_common.http_client 这个模块对象，连接池等模块级状态只有一份。
+"""
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from robot_common import http_client  # noqa: E402
+
+sys.modules[__name__] = http_client
@@ -0,0 +1,132 @@
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+"""
+机器狗sdk服务桩（localhost:18080 的替身）
+
+离线回放和基准测试时代替真实的 sdk 服务：move / cmd 直接返回成功并计数，
+video/open 返回配置的 RTSP 地址，可以给每个请求加固定延迟来模拟 sdk 的处理耗时。
+
+单独运行:
+python sdk_stub.py --port 18080 --latency-ms 5
+"""
+
+SUCCESS = {"code": "0", "message": "success"}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    stub = None
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method):
+        path = self.path.split("?", 1)[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.stub.latency:
+            time.sleep(self.stub.latency)
+        self.stub.record(method, path, body)
+
+        if path == "/signalservice/video/open":
+            self._reply(dict(SUCCESS, data=self.stub.rtsp_urls))
+        elif path.startswith("/signalservice/"):
+            self._reply(dict(SUCCESS, data={}))
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubSdkServer:
+    """
+    sdk服务桩
+
+    参数:
+    latency: 每个请求的固定处理延迟（秒）
+    rtsp_urls: video/open 返回的地址字段
+    """
+
+    def __init__(self, host="127.0.0.1", port=18080, latency=0.0, rtsp_urls=None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.rtsp_urls = rtsp_urls or {}
+        self.requests = Counter()  # "POST /signalservice/robot/move" -> 次数
+        self.last_move = None  # 最近一次 move 的 (vx, vy, vyaw)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def move_count(self):
+        return self.requests["POST /signalservice/robot/move"]
+
+    def record(self, method, path, body):
+        with self._lock:
+            self.requests[f"{method} {path}"] += 1
+            if path == "/signalservice/robot/move" and body:
+                try:
+                    payload = json.loads(body)
+                    self.last_move = (payload.get("vx"), payload.get("vy"), payload.get("vyaw"))
+                except ValueError:
+                    pass
+
+    def start(self):
+        handler = type("StubHandler", (_StubHandler,), {"stub": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="sdk_stub")
+        self._thread.start()
+        print(f"sdk服务桩已启动: {self.base_url}")
+        return self
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="机器狗sdk服务桩")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="每个请求的处理延迟（毫秒）")
+    args = parser.parse_args()
+
+    server = StubSdkServer(args.host, args.port, latency=args.latency_ms / 1000.0).start()
+    try:
+        while True:
+            time.sleep(5)
+            print(dict(server.requests))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
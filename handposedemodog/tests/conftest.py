@@ -0,0 +1,5 @@
+import os
+import sys
+
+# handposedemodog 下的模块按脚本方式导入（from move import ...），测试时把该目录加入搜索路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,66 @@
+import numpy as np
+
+from gesture_core.gesture_filter import GestureFilter
+
+POINT = ("Pointing_Up", "Right")
+FIST = ("Closed_Fist", "Right")
+
+
+def hands(*wrists):
+    """每只手的关键点数组，只有手腕位置有意义"""
+    landmarks = np.zeros((len(wrists), 21, 2), dtype=np.float32)
+    for index, wrist in enumerate(wrists):
+        landmarks[index, :] = wrist
+    return landmarks
+
+
+def feed(gesture_filter, votes, start=0.0, step=0.1, wrist=(0.5, 0.5)):
+    """单手连续输入，返回每帧的稳定手势"""
+    results = []
+    for index, vote in enumerate(votes):
+        stable = gesture_filter.update(hands(wrist), [vote], start + index * step)
+        results.append(stable[0])
+    return results
+
+
+def test_needs_n_of_m_votes():
+    gesture_filter = GestureFilter(window=5, min_votes=3, hold_time=0.0)
+    results = feed(gesture_filter, [(POINT, 0.9), (None, 0.0), (POINT, 0.9), (POINT, 0.9)])
+    assert results == [None, None, None, POINT]
+
+
+def test_confidence_hysteresis():
+    gesture_filter = GestureFilter(window=5, min_votes=3, enter_confidence=0.6, exit_confidence=0.4, hold_time=0.0)
+    # 0.5 不够切换到新手势
+    assert feed(gesture_filter, [(POINT, 0.5)] * 5) == [None] * 5
+    gesture_filter.reset()
+    # 进入后 0.5 足够保持
+    results = feed(gesture_filter, [(POINT, 0.9)] * 3 + [(POINT, 0.5)] * 5)
+    assert results[2:] == [POINT] * 6
+
+
+def test_hold_time_delays_change():
+    gesture_filter = GestureFilter(window=3, min_votes=2, hold_time=0.5)
+    results = feed(gesture_filter, [(POINT, 0.9)] * 2 + [(FIST, 0.9)] * 6, step=0.1)
+    assert results[1] == POINT
+    # 第 4 帧 FIST 已有 2 票，但距离 POINT 成为稳定手势只有 0.2 秒
+    assert results[3] == POINT
+    assert results[6] == FIST  # 0.5 秒后才切换
+
+
+def test_tracks_follow_wrist_when_hand_order_swaps():
+    gesture_filter = GestureFilter(window=3, min_votes=2, hold_time=0.0)
+    left, right = (0.2, 0.5), (0.8, 0.5)
+    for index in range(3):
+        gesture_filter.update(hands(left, right), [(POINT, 0.9), (FIST, 0.9)], index * 0.1)
+    # 识别结果中两只手的顺序互换，稳定手势跟着手走
+    stable = gesture_filter.update(hands(right, left), [(FIST, 0.9), (POINT, 0.9)], 0.3)
+    assert stable == [FIST, POINT]
+
+
+def test_lost_track_expires():
+    gesture_filter = GestureFilter(window=3, min_votes=2, hold_time=0.0, track_timeout=0.5)
+    feed(gesture_filter, [(POINT, 0.9)] * 3)
+    assert gesture_filter.update(hands(), [], 1.0) == []
+    assert gesture_filter.tracks == []
+    assert feed(gesture_filter, [(None, 0.0)], start=1.1) == [None]
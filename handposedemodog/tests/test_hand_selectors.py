@@ -0,0 +1,93 @@
+import warnings
+
+import numpy as np
+
+from gesture_core.depth import sample_depth
+from gesture_core.hand_selectors import NearestDepthHandSelector
+
+WIDTH, HEIGHT = 64, 48
+
+
+class FakeDepthProvider:
+    def __init__(self, depth):
+        self.depth = depth
+        self.stopped = False
+
+    def latest(self):
+        return self.depth
+
+    def stop(self):
+        self.stopped = True
+
+
+def depth_map(value=0):
+    return np.full((HEIGHT, WIDTH), value, dtype=np.uint16)
+
+
+def hand(x, y, size):
+    """以 (x, y) 为中心、边长 size 的手（归一化坐标），21个关键点均匀分布在方框内"""
+    grid = np.linspace(-size / 2, size / 2, 21, dtype=np.float32)
+    return np.stack((x + grid, y + grid[::-1]), axis=-1)
+
+
+def test_sample_depth_ignores_zero_pixels():
+    depth = depth_map()
+    depth[20:27, 30:37] = 1000
+    depth[23, 33] = 0  # 小块中的无效像素不参与中位数
+    depth[22, 32] = 5000
+    points = np.array([[33 / (WIDTH - 1), 23 / (HEIGHT - 1)]], dtype=np.float32)
+    assert sample_depth(depth, points, radius=3).tolist() == [1000.0]
+
+
+def test_sample_depth_all_invalid_patch_is_nan():
+    points = np.array([[[0.5, 0.5], [0.1, 0.1]]], dtype=np.float32)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # 全部无效不能产生 RuntimeWarning
+        result = sample_depth(depth_map(), points)
+    assert result.shape == (1, 2)
+    assert np.isnan(result).all()
+
+
+def test_sample_depth_clips_out_of_bounds_points():
+    depth = depth_map(800)
+    depth[:, :4] = 400
+    points = np.array([[-0.3, 0.5], [1.4, 1.2], [0.0, 0.0], [1.0, 1.0]], dtype=np.float32)
+    result = sample_depth(depth, points, radius=3)
+    assert result.tolist() == [400.0, 800.0, 400.0, 800.0]
+
+
+def test_nearest_hand_wins_over_larger_hand():
+    depth = depth_map(2000)
+    depth[:, :WIDTH // 2] = 600  # 深度图左半边更近（显示帧镜像后在右半边）
+    selector = NearestDepthHandSelector(depth_provider=FakeDepthProvider(depth))
+    landmarks = np.stack((hand(0.25, 0.5, 0.3), hand(0.75, 0.5, 0.1)))
+    assert selector.select(None, landmarks) == 1
+    np.testing.assert_allclose(selector.last_distances, [2000.0, 600.0])
+
+
+def test_hands_without_depth_or_out_of_range_are_skipped():
+    depth = depth_map(5000)  # 左边超出 max_range
+    depth[:, 21:43] = 0  # 中间没有深度
+    depth[:, 43:] = 1500
+    selector = NearestDepthHandSelector(depth_provider=FakeDepthProvider(depth), mirrored=False)
+    landmarks = np.stack((hand(0.15, 0.5, 0.05), hand(0.5, 0.5, 0.05), hand(0.85, 0.5, 0.05)))
+    assert selector.select(None, landmarks) == 2
+    assert selector.last_distances[0] == 5000.0
+    assert np.isnan(selector.last_distances[1])
+    assert selector.last_distances[2] == 1500.0
+
+
+def test_falls_back_to_largest_hand_without_usable_depth():
+    landmarks = np.stack((hand(0.3, 0.5, 0.1), hand(0.7, 0.5, 0.3)))
+    selector = NearestDepthHandSelector(depth_provider=FakeDepthProvider(None))
+    assert selector.select(None, landmarks) == 1
+    selector = NearestDepthHandSelector(depth_provider=FakeDepthProvider(depth_map()))
+    assert selector.select(None, landmarks) == 1
+    assert np.isnan(selector.last_distances).all()
+    assert selector.select(None, np.empty((0, 21, 2), dtype=np.float32)) is None
+
+
+def test_close_stops_depth_provider():
+    provider = FakeDepthProvider(None)
+    NearestDepthHandSelector(depth_provider=provider).close()
+    assert provider.stopped
@@ -0,0 +1,75 @@
+import pytest
+
+from gesture_core.inference_governor import InferenceGovernor
+
+
+def test_frame_interval():
+    governor = InferenceGovernor(min_interval=2, max_interval=2)
+    decisions = []
+    for frame in range(6):
+        ready = governor.ready(frame * 0.033)
+        decisions.append(ready)
+        if ready:
+            governor.submitted_frame(frame, frame * 0.033)
+            governor.completed_frame(frame, frame * 0.033, frame * 0.033 + 0.01)
+    assert decisions == [False, True, False, True, False, True]
+
+
+def test_busy_skip_until_result():
+    governor = InferenceGovernor()
+    assert governor.ready(0.0)
+    governor.submitted_frame("a", 0.0)
+    assert not governor.ready(0.03)
+    assert not governor.ready(0.06)
+    assert governor.busy_skips == 2
+    governor.completed_frame("a", 0.0, 0.08)
+    assert governor.ready(0.09)
+
+
+def test_stale_result_does_not_clear_pending():
+    governor = InferenceGovernor()
+    governor.ready(0.0)
+    governor.submitted_frame("b", 0.0)
+    governor.completed_frame("a", None, 0.01)  # 超时丢失的旧提交晚到
+    assert not governor.ready(0.03)
+
+
+def test_lost_submission_times_out():
+    governor = InferenceGovernor(inflight_timeout=0.5)
+    governor.ready(0.0)
+    governor.submitted_frame("a", 0.0)
+    assert not governor.ready(0.4)
+    assert governor.ready(0.6)
+    assert governor.timeouts == 1
+
+
+def run_frames(governor, frames, latency, start=0.0):
+    """每个提交在 latency 秒后完成，帧间隔 33ms"""
+    now = start
+    for _ in range(frames):
+        if governor.ready(now):
+            governor.submitted_frame(now, now)
+            governor.completed_frame(now, now, now + latency)
+        now += 0.033
+    return now
+
+
+def test_interval_adapts_to_latency():
+    governor = InferenceGovernor(min_interval=1, max_interval=4, latency_budget=0.1, adjust_every=2)
+    now = run_frames(governor, 60, latency=0.2)
+    assert governor.interval == 4
+    assert governor.latency == pytest.approx(0.2)
+    run_frames(governor, 400, latency=0.02, start=now)
+    assert governor.interval == 1
+
+
+def test_fixed_interval_is_not_adapted():
+    governor = InferenceGovernor(min_interval=2, max_interval=2, adjust_every=1)
+    run_frames(governor, 60, latency=0.5)
+    assert governor.interval == 2
+    assert not governor.adaptive
+
+
+def test_invalid_range():
+    with pytest.raises(ValueError):
+        InferenceGovernor(min_interval=3, max_interval=2)
@@ -0,0 +1,50 @@
+import numpy as np
+
+from gesture_core.motion_gate import MotionGate
+
+FRAME_INTERVAL = 1.0 / 30
+
+
+def static_frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (240, 320, 3), dtype=np.uint8)
+
+
+def test_static_scene_is_suppressed_with_forced_checks():
+    gate = MotionGate(motion_hold=0.2, force_interval=1.0)
+    frame = static_frame()
+    decisions = [gate.should_recognize(frame, index * FRAME_INTERVAL, False) for index in range(90)]
+    # 第一帧建立背景算运动，motion_hold 内放行；之后每秒强制一次
+    assert all(decisions[:7])
+    assert gate.forced == 2
+    assert gate.suppressed == 90 - sum(decisions)
+    assert sum(decisions[7:]) == 2
+
+
+def test_motion_opens_gate():
+    gate = MotionGate(motion_hold=0.2, force_interval=10.0)
+    frame = static_frame()
+    for index in range(30):
+        gate.should_recognize(frame, index * FRAME_INTERVAL, False)
+    assert not gate.should_recognize(frame, 30 * FRAME_INTERVAL, False)
+    moved = frame.copy()
+    moved[60:180, 80:240] = 255
+    assert gate.should_recognize(moved, 31 * FRAME_INTERVAL, False)
+    assert gate.changed_ratio > gate.min_changed_ratio
+
+
+def test_hand_present_keeps_gate_open():
+    gate = MotionGate(motion_hold=0.2, force_interval=10.0)
+    frame = static_frame()
+    decisions = [gate.should_recognize(frame, index * FRAME_INTERVAL, True) for index in range(60)]
+    assert all(decisions)
+    assert gate.suppressed == 0
+
+
+def test_reset_rebuilds_background():
+    gate = MotionGate(motion_hold=0.0, force_interval=10.0)
+    frame = static_frame()
+    for index in range(10):
+        gate.should_recognize(frame, index * FRAME_INTERVAL, False)
+    gate.reset()
+    assert gate.should_recognize(frame, 1.0, False)  # 重置后第一帧建立背景，放行
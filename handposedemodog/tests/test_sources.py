@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from gesture_core import sources
+from gesture_core.decode_options import DecodeOptions
+from gesture_core.sources import CAPTURE_OPTIONS_ENV, RtspSource
+
+
+class FakeCapture:
+    """记录创建时看到的打开选项"""
+
+    created = []
+
+    def __init__(self, target, *args):
+        FakeCapture.created.append((target, os.environ.get(CAPTURE_OPTIONS_ENV)))
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def get(self, prop):
+        return 640.0
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def captures(monkeypatch):
+    FakeCapture.created = []
+    monkeypatch.setattr(sources.cv2, "VideoCapture", FakeCapture)
+    monkeypatch.delenv(CAPTURE_OPTIONS_ENV, raising=False)
+    return FakeCapture.created
+
+
+def test_capture_options_do_not_leak_to_later_sources(captures):
+    tcp = RtspSource(url="rtsp://a", tcp=True, decode=DecodeOptions(decoder="v4l2m2m"))
+    tcp.open()
+    assert CAPTURE_OPTIONS_ENV not in os.environ
+    RtspSource(url="rtsp://b").open()
+    assert captures == [("rtsp://a", "rtsp_transport;tcp|video_codec;h264_v4l2m2m"), ("rtsp://b", None)]
+
+
+def test_existing_capture_options_are_restored(captures, monkeypatch):
+    monkeypatch.setenv(CAPTURE_OPTIONS_ENV, "stimeout;5000000")
+    RtspSource(url="rtsp://a", tcp=True).open()
+    RtspSource(url="rtsp://b").open()
+    assert captures == [("rtsp://a", "rtsp_transport;tcp"), ("rtsp://b", "stimeout;5000000")]
+    assert os.environ[CAPTURE_OPTIONS_ENV] == "stimeout;5000000"
@@ -0,0 +1,90 @@
+import pytest
+
+from gesture_core.velocity_streamer import ZERO_TWIST, VelocityStreamer
+
+
+class RecordingSend:
+    """记录发送的速度，fail_times 次之内抛出异常"""
+
+    def __init__(self, fail_times=0):
+        self.sent = []
+        self.fail_times = fail_times
+
+    def __call__(self, vx, vy, vyaw):
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise RuntimeError("move 接口返回 500")
+        self.sent.append((vx, vy, vyaw))
+
+
+def make_streamer(send, **kwargs):
+    kwargs.setdefault("max_accel", (0.4, 0.4, 1.0))
+    return VelocityStreamer(send_fn=send, **kwargs)
+
+
+def test_acceleration_is_ramped():
+    send = RecordingSend()
+    streamer = make_streamer(send)
+    streamer.set_target(0.2, 0.0, 0.0)
+    now = streamer._target_time
+    for index in range(6):
+        streamer.step(now + 0.1 * index, 0.1)
+    assert [round(twist[0], 3) for twist in send.sent] == [0.04, 0.08, 0.12, 0.16, 0.2, 0.2]
+
+
+def test_stop_is_immediate_and_zero_sent_once():
+    send = RecordingSend()
+    streamer = make_streamer(send, max_accel=None)
+    streamer.set_target(0.2, 0.0, 0.5)
+    now = streamer._target_time
+    streamer.step(now, 0.1)
+    streamer.set_target(*ZERO_TWIST)
+    for index in range(3):
+        streamer.step(now + 0.1 * (index + 1), 0.1)
+    assert send.sent == [(0.2, 0.0, 0.5), ZERO_TWIST]
+
+
+def test_watchdog_zeroes_stale_target():
+    send = RecordingSend()
+    streamer = make_streamer(send, max_accel=None, watchdog_timeout=0.5)
+    streamer.set_target(0.2, 0.0, 0.0)
+    now = streamer._target_time
+    streamer.step(now + 0.4, 0.1)
+    streamer.step(now + 0.6, 0.1)
+    assert send.sent == [(0.2, 0.0, 0.0), ZERO_TWIST]
+    assert streamer.target == ZERO_TWIST
+
+
+def test_failed_zero_is_retried():
+    send = RecordingSend()
+    streamer = make_streamer(send, max_accel=None)
+    streamer.set_target(0.2, 0.0, 0.0)
+    now = streamer._target_time
+    streamer.step(now, 0.1)
+    streamer.set_target(*ZERO_TWIST)
+    send.fail_times = 1
+    streamer.step(now + 0.1, 0.1)
+    streamer.step(now + 0.2, 0.1)
+    streamer.step(now + 0.3, 0.1)
+    assert streamer.error_count == 1
+    assert send.sent == [(0.2, 0.0, 0.0), ZERO_TWIST]
+
+
+def test_reversal_passes_through_zero():
+    send = RecordingSend()
+    streamer = make_streamer(send, max_accel=(1.0, 1.0, 1.0))
+    streamer.set_target(0.2, 0.0, 0.0)
+    now = streamer._target_time
+    streamer.step(now, 0.5)
+    streamer.set_target(-0.2, 0.0, 0.0)
+    streamer.step(now + 0.1, 0.05)
+    streamer.step(now + 0.2, 0.05)
+    assert [twist[0] for twist in send.sent] == [0.2, 0.0, pytest.approx(-0.05)]
+
+
+def test_stop_sends_zero():
+    send = RecordingSend()
+    streamer = make_streamer(send)
+    streamer.stop()
+    assert send.sent == [ZERO_TWIST]
+    assert not streamer.is_running
@@ -0,0 +1,9 @@
+"""
+guide_dog 与 handposedemodog 共用的机器狗服务客户端
+
+- http_client: 按host复用连接池的HTTP客户端
+- robot_sdk: sdk服务/导航服务的异步客户端及同步外观
+
+两个目录下的脚本按脚本方式导入（from http_client import ...），
+各自目录里的同名模块只是指向这里的转发模块。
+"""
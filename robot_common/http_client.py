@@ -0,0 +1,96 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+"""
+共享HTTP客户端层
+
+所有对本机服务（机器狗sdk服务 18080、导航服务 8001/8008）的调用都通过这里，
+每个host复用一个带连接池的 requests.Session，保持keep-alive，
+避免每次轮询/速度指令都重新做TCP握手，并统一设置超时与重试次数。
+"""
+
+# 服务地址（可通过环境变量覆盖，便于联调或接入模拟器）
+ROBOT_SDK_BASE_URL = os.environ.get("ROBOT_SDK_BASE_URL", "http://localhost:18080")
+NAVIGATION_BASE_URL = os.environ.get("NAVIGATION_BASE_URL", "http://localhost:8001")
+
+# 默认参数
+DEFAULT_CONNECT_TIMEOUT = 0.5  # 连接超时（秒），本机服务连接应当很快
+DEFAULT_READ_TIMEOUT = 3.0     # 读取超时（秒）
+DEFAULT_RETRIES = 1            # 连接失败重试次数
+DEFAULT_POOL_SIZE = 4          # 每个host的连接池大小
+
+
+class HttpClient:
+    """单个host的HTTP客户端，内部持有带连接池的Session"""
+
+    def __init__(self, base_url, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, retries=DEFAULT_RETRIES,
+                 pool_size=DEFAULT_POOL_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+
+        # 只对连接错误和幂等的GET请求重试，避免重复下发运动/导航指令
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=0,
+            allowed_methods=frozenset(["GET"]),
+            backoff_factor=0.05,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                              max_retries=retry, pool_block=False)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method, path, timeout=None, **kwargs):
+        """发送请求，path为相对base_url的路径"""
+        url = self.base_url + path
+        return self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(base_url, **options):
+    """
+    获取指定host的共享客户端（同一base_url只创建一次）
+
+    参数:
+    base_url: 服务地址，如 http://localhost:18080
+    options: 首次创建时使用的 connect_timeout / read_timeout / retries / pool_size
+    """
+    key = base_url.rstrip("/")
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = HttpClient(key, **options)
+                _clients[key] = client
+    return client
+
+
+def close_all():
+    """关闭所有连接池"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
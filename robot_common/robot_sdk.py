@@ -0,0 +1,173 @@
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+from .http_client import get_client, ROBOT_SDK_BASE_URL, NAVIGATION_BASE_URL
+
+"""
+机器狗sdk服务异步客户端
+
+覆盖 signalservice 的全部接口（move、cmd、point_cloud、height_map、snapshot、
+color_depth_snapshot、video/open、uwb）以及导航服务的 start/stop/status。
+
+底层复用 http_client 的连接池，请求在专用线程池中执行，
+因此多个请求可以用 asyncio.gather 并发发出（例如同时获取UWB和导航状态）。
+RobotClient 是同步外观，在后台事件循环上运行这些协程，供普通线程代码调用。
+"""
+
+# 机器人预设命令
+CMD_SIT_DOWN = "1"    # 蹲下
+CMD_STAND_UP = "2"    # 站起
+CMD_STOP = "3"        # 停止移动
+CMD_RECOVERY = "4"    # 回零
+
+
+class AsyncRobotClient:
+    """机器狗sdk服务 + 导航服务的asyncio客户端"""
+
+    def __init__(self, sdk_base_url=ROBOT_SDK_BASE_URL, navigation_base_url=NAVIGATION_BASE_URL,
+                 max_workers=8):
+        self.sdk = get_client(sdk_base_url)
+        self.navigation = get_client(navigation_base_url)
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="robot_sdk")
+
+    async def _request(self, client, method, path, **kwargs):
+        """在线程池中执行一次HTTP请求，返回解析后的JSON"""
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self.executor, functools.partial(client.request, method, path, **kwargs))
+        response.raise_for_status()
+        return response.json()
+
+    # ---------------- signalservice 接口 ----------------
+
+    async def move(self, vx, vy, vyaw):
+        """机器人移动控制"""
+        return await self._request(self.sdk, "POST", "/signalservice/robot/move",
+                                   json={"vx": vx, "vy": vy, "vyaw": vyaw})
+
+    async def cmd(self, cmd):
+        """执行预设命令: 1=蹲下, 2=站起, 3=停止移动, 4=回零"""
+        return await self._request(self.sdk, "POST", "/signalservice/robot/cmd",
+                                   json={"cmd": str(cmd)})
+
+    async def point_cloud(self):
+        """获取最新点云数据（云深处不支持）"""
+        return await self._request(self.sdk, "GET", "/signalservice/robot/point_cloud")
+
+    async def height_map(self):
+        """获取最新高度图数据"""
+        return await self._request(self.sdk, "GET", "/signalservice/robot/height_map")
+
+    async def snapshot(self):
+        """机器狗自带摄像头抓图（接口本身有5秒超时）"""
+        return await self._request(self.sdk, "GET", "/signalservice/robot/snapshot", timeout=(0.5, 6.0))
+
+    async def color_depth_snapshot(self):
+        """获取外接相机对齐的彩色和深度图像"""
+        return await self._request(self.sdk, "GET", "/signalservice/video/color_depth_snapshot",
+                                   timeout=(0.5, 6.0))
+
+    async def video_open(self):
+        """获取可用的RTSP视频流地址"""
+        return await self._request(self.sdk, "GET", "/signalservice/video/open")
+
+    async def uwb(self):
+        """获取UWB距离和方位角"""
+        return await self._request(self.sdk, "GET", "/signalservice/uwb")
+
+    # ---------------- 导航服务接口 ----------------
+
+    async def navigation_start(self, target_position):
+        return await self._request(self.navigation, "POST", "/api/start", json=target_position)
+
+    async def navigation_stop(self):
+        return await self._request(self.navigation, "POST", "/api/stop")
+
+    async def navigation_status(self):
+        return await self._request(self.navigation, "GET", "/api/status")
+
+    # ---------------- 并发 ----------------
+
+    async def gather(self, *coros):
+        """并发执行多个请求，单个请求的异常作为结果返回，不影响其他请求"""
+        return await asyncio.gather(*coros, return_exceptions=True)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+class RobotClient:
+    """AsyncRobotClient 的同步外观，协程在后台事件循环线程上执行"""
+
+    def __init__(self, sdk_base_url=ROBOT_SDK_BASE_URL, navigation_base_url=NAVIGATION_BASE_URL,
+                 timeout=10.0):
+        self.aio = AsyncRobotClient(sdk_base_url, navigation_base_url)
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True,
+                                        name="robot_sdk_loop")
+        self._thread.start()
+
+    def run(self, coro):
+        """在后台事件循环上执行协程并等待结果"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return future.result(timeout=self.timeout)
+
+    def gather(self, *coros):
+        """并发执行多个协程，按顺序返回结果（异常作为结果返回）"""
+        return self.run(self.aio.gather(*coros))
+
+    def move(self, vx, vy, vyaw):
+        return self.run(self.aio.move(vx, vy, vyaw))
+
+    def cmd(self, cmd):
+        return self.run(self.aio.cmd(cmd))
+
+    def point_cloud(self):
+        return self.run(self.aio.point_cloud())
+
+    def height_map(self):
+        return self.run(self.aio.height_map())
+
+    def snapshot(self):
+        return self.run(self.aio.snapshot())
+
+    def color_depth_snapshot(self):
+        return self.run(self.aio.color_depth_snapshot())
+
+    def video_open(self):
+        return self.run(self.aio.video_open())
+
+    def uwb(self):
+        return self.run(self.aio.uwb())
+
+    def navigation_start(self, target_position):
+        return self.run(self.aio.navigation_start(target_position))
+
+    def navigation_stop(self):
+        return self.run(self.aio.navigation_stop())
+
+    def navigation_status(self):
+        return self.run(self.aio.navigation_status())
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=1.0)
+        self.aio.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_robot_client():
+    """获取进程内共享的同步客户端"""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = RobotClient()
+    return _default_client